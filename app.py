@@ -1,5 +1,75 @@
 import streamlit as st
-from pages import economic_indicators, stock_market, interest_rates, currency_markets, crypto_markets
+import pandas as pd
+import profiling
+from utils import load_data, get_data_version
+import importlib
+import sys
+import time
+
+# View name -> page module, imported the first time the view is selected
+VIEWS = {
+    'Economic Indicators': 'pages.economic_indicators',
+    'Stock Market Overview': 'pages.stock_market',
+    'Interest Rates': 'pages.interest_rates',
+    'Currency Markets': 'pages.currency_markets',
+    'Crypto Markets': 'pages.crypto_markets',
+    'Cross-Asset Correlations': 'pages.cross_asset',
+    'Backtest': 'pages.backtest'
+}
+
+# Most recent alerts listed in the sidebar
+ALERTS_SHOWN = 8
+
+def load_view(module_name):
+    # import_module waits on the module's import lock, so a session never gets a
+    # page that another session is still importing; once imported it is a dict lookup
+    first_import = module_name not in sys.modules
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    if first_import:
+        profiling.record_startup(f'import {module_name}', time.perf_counter() - start)
+    return module
+
+def set_theme(theme):
+    # Runs before the rerun the click triggers, so the page is drawn once with
+    # the new theme; charts restyle their cached specs instead of rebuilding
+    st.session_state.theme = theme
+
+def show_profile(records):
+    stages = pd.DataFrame(records)
+    total = stages.loc[stages['depth'] == 0, 'ms'].sum()
+    stages['chart'] = stages['chart'].fillna('(page)')
+    stages['stage'] = ['· ' * depth + name for depth, name in zip(stages['depth'], stages['stage'])]
+    columns = [c for c in ['chart', 'stage', 'cache', 'rows', 'bytes', 'ms'] if c in stages.columns]
+    for column in ['rows', 'bytes']:
+        if column in stages.columns:
+            stages[column] = stages[column].astype('Int64')
+    with st.sidebar.expander(f"Render profile: {total:.1f} ms", expanded=True):
+        st.dataframe(stages[columns], hide_index=True, use_container_width=True)
+
+def show_alerts():
+    # Written by scripts/alerts.py after each data collection run
+    if get_data_version('alerts')[0] is None:
+        return
+    alerts = load_data(f"SELECT date, message FROM alerts ORDER BY date DESC LIMIT {ALERTS_SHOWN}",
+                       sources=['alerts'])
+    if alerts.empty:
+        return
+    with st.sidebar.expander("Alerts", expanded=True):
+        for date, message in zip(alerts.index, alerts['message']):
+            # Minute data alerts carry a time, daily ones only a date
+            when = date.strftime('%b %d, %Y' if date == date.normalize() else '%b %d, %Y %H:%M')
+            st.markdown(f"**{when}** · {message}")
+
+@st.cache_resource
+def load_base_css():
+    with open('static/css/style.css') as f:
+        return f'<style>{f.read()}</style>'
+
+@st.cache_resource
+def load_theme_css(theme):
+    with open(f'static/css/theme_{theme}.css') as f:
+        return f'<style>{f.read()}</style>'
 
 # Set page config
 st.set_page_config(
@@ -14,180 +84,8 @@ if 'current_view' not in st.session_state:
 if 'theme' not in st.session_state:
     st.session_state.theme = 'dark'
 
-# Load CSS with dynamic theme
-with open('static/css/style.css') as f:
-    css_content = f.read()
-    
-# Apply theme-specific styles
-if st.session_state.theme == 'light':
-    theme_styles = """
-        <style>
-        .stApp {background-color: #ffffff !important;}
-        section[data-testid="stSidebar"] {background-color: #f0f2f6 !important;}
-        .sidebar-title {color: #00857c !important;}
-        h1, h2, h3 {color: #00857c !important;}
-        
-        /* Navigation button styles */
-        div[class*="stButton"] button {
-            background-color: #00857c !important;
-            border: none !important;
-        }
-        div[class*="stButton"] button:hover {
-            background-color: #006b63 !important;
-            border: none !important;
-        }
-        div[class*="stButton"] button p,
-        div[class*="stButton"] button div,
-        div[class*="stButton"] button span,
-        div[class*="stButton"] button {
-            color: #ffffff !important;
-            font-weight: 500 !important;
-            text-shadow: none !important;
-        }
-        
-        /* Text colors */
-        .element-container div.stMarkdown, 
-        .element-container div.stMarkdown p, 
-        .element-container div.stMarkdown li,
-        div[data-testid="stMarkdownContainer"],
-        div[data-testid="stMarkdownContainer"] p,
-        div[class*="stMarkdown"],
-        div[class*="stMarkdown"] p,
-        div[class*="st-emotion-cache-"] p,
-        div[class*="st-emotion-cache-"] {
-            color: #0e1117 !important;
-        }
-        
-        /* Last value text fix */
-        div[class*="st-emotion-cache-"] span {
-            color: #0e1117 !important;
-        }
-        
-        /* Graph styles */
-        .js-plotly-plot .plotly .gtitle,
-        .js-plotly-plot .plotly .xtitle, 
-        .js-plotly-plot .plotly .ytitle {
-            color: #0e1117 !important;
-        }
-        .js-plotly-plot .plotly .xtick text, 
-        .js-plotly-plot .plotly .ytick text {
-            fill: #0e1117 !important;
-            color: #0e1117 !important;
-            font-weight: 600 !important;
-        }
-        .js-plotly-plot .plotly .xgrid,
-        .js-plotly-plot .plotly .ygrid {
-            stroke: rgba(14, 17, 23, 0.1) !important;
-        }
-        .js-plotly-plot .plotly .xaxis .zerolinelayer,
-        .js-plotly-plot .plotly .yaxis .zerolinelayer {
-            stroke: rgba(14, 17, 23, 0.5) !important;
-        }
-        
-        /* Other elements */
-        .logo-link {color: #00857c !important;}
-        .logo-link:hover {color: #006b63 !important;}
-        div[data-baseweb="notification"] {color: #0e1117 !important;}
-        span.st-emotion-cache-10trblm {color: #0e1117 !important;}
-        
-        /* Theme button styles */
-        button[kind="secondary"][data-testid="baseButton-secondary"] {
-            background-color: #f0f2f6 !important;
-            border: 2px solid #00857c !important;
-            color: #00857c !important;
-        }
-        button[kind="secondary"][data-testid="baseButton-secondary"]:hover {
-            background-color: #00857c !important;
-            color: #ffffff !important;
-        }
-        </style>
-    """
-else:
-    theme_styles = """
-        <style>
-        .stApp {background-color: #0e1117 !important;}
-        section[data-testid="stSidebar"] {background-color: #1a1c24 !important;}
-        .sidebar-title {color: #00FFF0 !important;}
-        h1, h2, h3 {color: #00FFF0 !important;}
-        
-        /* Navigation button styles */
-        div[class*="stButton"] button {
-            background-color: #00FFF0 !important;
-            border: none !important;
-        }
-        div[class*="stButton"] button:hover {
-            background-color: #00ccbe !important;
-            border: none !important;
-        }
-        div[class*="stButton"] button p,
-        div[class*="stButton"] button div,
-        div[class*="stButton"] button span,
-        div[class*="stButton"] button {
-            color: #0e1117 !important;
-            font-weight: 500 !important;
-            text-shadow: none !important;
-        }
-        
-        /* Text colors */
-        .element-container div.stMarkdown,
-        .element-container div.stMarkdown p,
-        .element-container div.stMarkdown li,
-        div[data-testid="stMarkdownContainer"],
-        div[data-testid="stMarkdownContainer"] p,
-        div[class*="stMarkdown"],
-        div[class*="stMarkdown"] p,
-        div[class*="st-emotion-cache-"] p,
-        div[class*="st-emotion-cache-"] {
-            color: #ffffff !important;
-        }
-        
-        /* Last value text fix */
-        div[class*="st-emotion-cache-"] span {
-            color: #ffffff !important;
-        }
-        
-        /* Graph styles */
-        .js-plotly-plot .plotly .gtitle,
-        .js-plotly-plot .plotly .xtitle, 
-        .js-plotly-plot .plotly .ytitle {
-            color: #ffffff !important;
-        }
-        .js-plotly-plot .plotly .xtick text, 
-        .js-plotly-plot .plotly .ytick text {
-            fill: #ffffff !important;
-            color: #ffffff !important;
-            font-weight: 600 !important;
-        }
-        .js-plotly-plot .plotly .xgrid,
-        .js-plotly-plot .plotly .ygrid {
-            stroke: rgba(255, 255, 255, 0.1) !important;
-        }
-        .js-plotly-plot .plotly .xaxis .zerolinelayer,
-        .js-plotly-plot .plotly .yaxis .zerolinelayer {
-            stroke: rgba(255, 255, 255, 0.5) !important;
-        }
-        
-        /* Other elements */
-        .logo-link {color: #00FFF0 !important;}
-        .logo-link:hover {color: #ffffff !important;}
-        div[data-baseweb="notification"] {color: #ffffff !important;}
-        span.st-emotion-cache-10trblm {color: #ffffff !important;}
-        
-        /* Theme button styles */
-        button[kind="secondary"][data-testid="baseButton-secondary"] {
-            background-color: #1a1c24 !important;
-            border: 2px solid #00FFF0 !important;
-            color: #00FFF0 !important;
-        }
-        button[kind="secondary"][data-testid="baseButton-secondary"]:hover {
-            background-color: #00FFF0 !important;
-            color: #0e1117 !important;
-        }
-        </style>
-    """
-
-st.markdown(f'<style>{css_content}</style>', unsafe_allow_html=True)
-st.markdown(theme_styles, unsafe_allow_html=True)
+st.markdown(load_base_css(), unsafe_allow_html=True)
+st.markdown(load_theme_css(st.session_state.theme), unsafe_allow_html=True)
 
 # Add clickable text link
 st.markdown("""
@@ -201,34 +99,43 @@ with st.sidebar:
     st.markdown('<p class="sidebar-title">Navigation</p>', unsafe_allow_html=True)
     
     # Navigation buttons
-    views = {
-        'Economic Indicators': economic_indicators,
-        'Stock Market Overview': stock_market,
-        'Interest Rates': interest_rates,
-        'Currency Markets': currency_markets,
-        'Crypto Markets': crypto_markets
-    }
-    
-    for view_name, view_module in views.items():
+    for view_name in VIEWS:
         if st.button(view_name, key=view_name, help=None, use_container_width=True):
             st.session_state.current_view = view_name
 
+try:
+    show_alerts()
+except Exception as e:
+    st.sidebar.error(f"Error loading alerts: {str(e)}")
+
 # Main content
 st.title('Economic Data Dashboard')
 
 # Display content based on selected view
 current_view = st.session_state.current_view
-if current_view in views:
-    views[current_view].show()
+if current_view in VIEWS:
+    # Opt-in stage timings for this run (fragment-only reruns are not profiled)
+    profile_run = None
+    if profiling.enabled() and st.session_state.get('profile_renders'):
+        profile_run = profiling.start_run()
+    try:
+        load_view(VIEWS[current_view]).show()
+    finally:
+        profiling.stop_run()
     
     # Theme toggle buttons at the bottom
     st.sidebar.markdown("<br>" * 5, unsafe_allow_html=True)  # Add space
     cols = st.sidebar.columns(2)
     with cols[0]:
-        if st.button("Light Theme 🌞", key="light_theme", help=None, use_container_width=True):
-            st.session_state.theme = "light"
-            st.rerun()
+        st.button("Light Theme 🌞", key="light_theme", help=None, use_container_width=True,
+                  on_click=set_theme, args=("light",))
     with cols[1]:
-        if st.button("Dark Theme 🌙", key="dark_theme", help=None, use_container_width=True):
-            st.session_state.theme = "dark"
-            st.rerun()
+        st.button("Dark Theme 🌙", key="dark_theme", help=None, use_container_width=True,
+                  on_click=set_theme, args=("dark",))
+
+    # Debug panel with the stage timings of this run
+    if profiling.enabled():
+        st.sidebar.toggle("Profile renders", key="profile_renders")
+        if profile_run:
+            profiling.record_render(current_view, profile_run)
+            show_profile(profile_run)
@@ -0,0 +1,111 @@
+import itertools
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+# The pages' rules of thumb as long-or-cash S&P 500 strategies, with the
+# parameter grid the sweep covers. Out of the market, cash earns nothing.
+STRATEGIES = {
+    'buy_and_hold': {
+        'name': 'Buy and hold',
+        'grid': {},
+    },
+    'ma_trend': {
+        'name': 'Invested while the S&P 500 is above its moving average',
+        'grid': {'ma_length': [20, 50, 100, 150, 200, 250, 300]},
+    },
+    'vix_spike': {
+        'name': 'Buy when the VIX closes above a threshold, hold for a fixed period',
+        'grid': {'threshold': [20, 25, 30, 35, 40], 'hold_days': [21, 63, 126, 252]},
+    },
+    'curve_inversion': {
+        'name': 'Out of the market while the 10Y-1Y spread is below a threshold',
+        'grid': {'threshold': [-0.005, -0.0025, 0.0, 0.0025, 0.005]},
+    },
+}
+
+# Tables the backtests read; a new version of any of them invalidates every result
+SOURCES = ['sp500', 'vixcls', 'derived_yield_spreads']
+
+def parameter_grid(strategy):
+    """Every parameter set of a strategy's grid, as dicts."""
+    grid = STRATEGIES[strategy]['grid']
+    return [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+
+def param_label(strategy, params):
+    """Short unique name of a parameter set, as shown in the Backtest view."""
+    if strategy == 'ma_trend':
+        return f"MA {params['ma_length']}"
+    if strategy == 'vix_spike':
+        return f"VIX > {params['threshold']}, hold {params['hold_days']}d"
+    if strategy == 'curve_inversion':
+        return f"Spread < {params['threshold']:.2%}"
+    return 'Buy and hold'
+
+def align_inputs(sp500, vix, spread):
+    """
+    S&P 500 closes with the VIX and 10Y-1Y spread as of each trading day, the
+    frame every strategy runs on. Gaps in VIX and spread carry the last value.
+    """
+    data = pd.DataFrame({'sp500': sp500.dropna()})
+    data['vix'] = vix.dropna().reindex(data.index, method='ffill')
+    data['spread_10y1y'] = spread.dropna().reindex(data.index, method='ffill')
+    return data
+
+def moving_average(values, length):
+    sums = np.concatenate([[0.0], np.cumsum(values)])
+    average = np.full(len(values), np.nan)
+    average[length - 1:] = (sums[length:] - sums[:-length]) / length
+    return average
+
+def trailing_any(flags, length):
+    """True where flags was set on any of the last `length` days."""
+    counts = np.concatenate([[0], np.cumsum(flags)])
+    starts = np.maximum(np.arange(1, len(flags) + 1) - length, 0)
+    return counts[1:] - counts[starts] > 0
+
+def positions(strategy, params, data):
+    """Position (1 invested, 0 cash) decided at each close from data up to that close."""
+    prices = data['sp500'].to_numpy()
+    if strategy == 'ma_trend':
+        average = moving_average(prices, params['ma_length'])
+        return np.where(np.isnan(average), 0.0, prices > average).astype('float64')
+    if strategy == 'vix_spike':
+        spikes = np.nan_to_num(data['vix'].to_numpy()) > params['threshold']
+        return trailing_any(spikes, params['hold_days']).astype('float64')
+    if strategy == 'curve_inversion':
+        spread = data['spread_10y1y'].to_numpy()
+        # Stay invested before the spread history starts
+        return np.where(spread < params['threshold'], 0.0, 1.0)
+    return np.ones(len(prices))
+
+def evaluate(prices, position):
+    """
+    Performance of holding `position` (decided at the previous close) over the
+    daily returns of prices: equity curve, drawdown and summary metrics, with
+    turnover counted as position changes per year.
+    """
+    returns = np.concatenate([[0.0], prices[1:] / prices[:-1] - 1])
+    held = np.concatenate([[0.0], position[:-1]])
+    strategy_returns = held * returns
+    equity = np.cumprod(1 + strategy_returns)
+    drawdown = equity / np.maximum.accumulate(equity) - 1
+
+    years = max(len(prices) - 1, 1) / TRADING_DAYS
+    volatility = strategy_returns.std() * np.sqrt(TRADING_DAYS)
+    metrics = {
+        'total_return': equity[-1] - 1,
+        'cagr': equity[-1] ** (1 / years) - 1,
+        'volatility': volatility,
+        'sharpe': strategy_returns.mean() * TRADING_DAYS / volatility if volatility > 0 else np.nan,
+        'max_drawdown': drawdown.min(),
+        'turnover': np.abs(np.diff(held)).sum() / years,
+        'exposure': held.mean(),
+    }
+    return metrics, equity, drawdown
+
+def run(strategy, params, data):
+    """Backtest one parameter set; returns (metrics, frame of equity and drawdown by date)."""
+    metrics, equity, drawdown = evaluate(data['sp500'].to_numpy(), positions(strategy, params, data))
+    return metrics, pd.DataFrame({'equity': equity, 'drawdown': drawdown}, index=data.index)
@@ -0,0 +1,12 @@
+"""
+Framework-agnostic access to the dashboard database, shared by the pages
+(through utils) and the notebooks. Series are lazy handles that read their
+table on first use, through a pluggable cache:
+
+    from econdata import table
+    sp500 = table('sp500')     # nothing is read yet
+    sp500['SP500'].tail()      # read now, then served from the cache
+"""
+from econdata.db import DB_PATH, SQL_BACKENDS, SQL_BACKEND, adbc_sqlite, connect, read_frame, data_version
+from econdata.cache import FrameCache, get_cache, set_cache
+from econdata.series import LazyFrame, load, table, query
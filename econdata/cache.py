@@ -0,0 +1,67 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+
+CACHE_TTL = 24*3600  # Cache for 24 hours
+CACHE_BUDGET_MB = int(os.environ.get('DASHBOARD_CACHE_MB', 256))
+
+class FrameCache:
+    """
+    In-process LRU of DataFrames, safe to share between threads. Entries expire
+    after ttl seconds and the least recently used ones are evicted once the
+    total size exceeds budget_bytes.
+    """
+    def __init__(self, budget_bytes, ttl):
+        self.budget_bytes = budget_bytes
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> (loaded_at, nbytes, df)
+        self.nbytes = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            loaded_at, nbytes, df = entry
+            if time.time() - loaded_at > self.ttl:
+                del self.entries[key]
+                self.nbytes -= nbytes
+                return None
+            self.entries.move_to_end(key)
+            return df
+
+    def put(self, key, df):
+        nbytes = int(df.memory_usage(index=True, deep=True).sum())
+        with self.lock:
+            if key in self.entries:
+                self.nbytes -= self.entries.pop(key)[1]
+            if nbytes > self.budget_bytes:
+                return
+            self.entries[key] = (time.time(), nbytes, df)
+            self.nbytes += nbytes
+            while self.nbytes > self.budget_bytes:
+                _, (_, evicted_bytes, _) = self.entries.popitem(last=False)
+                self.nbytes -= evicted_bytes
+
+_default_cache = None
+_cache_provider = None
+
+def set_cache(provider):
+    """
+    Route loads through another cache: a callable returning the cache object
+    to use (e.g. a Streamlit cache_resource function, so the cache lives as
+    long as the server process), or None for the in-process default. A cache
+    needs get(key) returning a DataFrame or None, and put(key, df).
+    """
+    global _cache_provider
+    _cache_provider = provider
+
+def get_cache():
+    global _default_cache
+    if _cache_provider is not None:
+        return _cache_provider()
+    if _default_cache is None:
+        _default_cache = FrameCache(CACHE_BUDGET_MB * 1024 * 1024, CACHE_TTL)
+    return _default_cache
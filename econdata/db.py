@@ -0,0 +1,103 @@
+import os
+import sqlite3
+import pandas as pd
+import profiling
+
+try:
+    import adbc_driver_sqlite.dbapi as adbc_sqlite
+except ImportError:  # Optional Arrow reader backend
+    adbc_sqlite = None
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The project's database, wherever the reader runs from (the app, a notebook, a script)
+DB_PATH = os.environ.get('DASHBOARD_DB_PATH', os.path.join(ROOT_DIR, 'data', 'economics_data.db'))
+
+# Reader used by read_frame: 'adbc' fetches into Arrow buffers with dates as
+# integer epochs, 'pandas' uses read_sql_query and parses date strings.
+# 'adbc' falls back to 'pandas' when the driver is not installed.
+SQL_BACKENDS = ('adbc', 'pandas')
+SQL_BACKEND = os.environ.get('DASHBOARD_SQL_BACKEND', 'adbc')
+
+def connect():
+    if not os.path.exists(DB_PATH):
+        raise FileNotFoundError(f"Database file not found at {DB_PATH}")
+    conn = sqlite3.connect(DB_PATH)
+    # Readers never write. Several dashboard workers share the database while the
+    # ingestion jobs write to it in WAL mode. mode=ro URIs cannot be used: they
+    # fail with "database is locked" when no writer holds the -shm file.
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+def epoch_date_query(query, conn, params=()):
+    """
+    Wrap query so its date column comes back as integer Unix seconds, which
+    decode into datetimes without parsing date strings.
+    """
+    columns = [col[0] for col in conn.execute(f"SELECT * FROM ({query}) LIMIT 0", params).description]
+    if 'date' not in columns:
+        raise KeyError(f"date column not found in query result. Available columns: {columns}")
+    select_list = ["CAST(strftime('%s', date) AS INTEGER) AS date"]
+    select_list += [f'"{col}"' for col in columns if col != 'date']
+    return f"SELECT {', '.join(select_list)} FROM ({query})"
+
+def read_frame(query, backend=None, params=None):
+    """
+    Run query with the given reader backend and index the result by its date
+    column. params are bound to the query's ? placeholders.
+    """
+    backend = backend or SQL_BACKEND
+    params = tuple(params or ())
+    if backend not in SQL_BACKENDS:
+        raise ValueError(f"Unknown SQL backend: {backend}. Choose from {SQL_BACKENDS}")
+
+    with profiling.stage('connection'):
+        conn = connect()
+    if backend == 'adbc' and adbc_sqlite is not None:
+        try:
+            epoch_query = epoch_date_query(query, conn, params)
+        finally:
+            conn.close()
+        with profiling.stage('sql', backend='adbc') as record:
+            with adbc_sqlite.connect(DB_PATH) as adbc_conn, adbc_conn.cursor() as cursor:
+                cursor.execute(epoch_query, params or None)
+                df = cursor.fetch_arrow_table().to_pandas()
+            record['rows'] = len(df)
+        with profiling.stage('to_datetime'):
+            df['date'] = pd.to_datetime(df['date'], unit='s')
+    else:
+        with profiling.stage('sql', backend='pandas') as record:
+            try:
+                df = pd.read_sql_query(query, conn, params=params)
+            finally:
+                conn.close()
+            record['rows'] = len(df)
+
+        if 'date' not in df.columns:
+            raise KeyError(f"date column not found in query result. Available columns: {df.columns.tolist()}")
+
+        with profiling.stage('to_datetime'):
+            df['date'] = pd.to_datetime(df['date'])
+
+    df.set_index('date', inplace=True)
+    return df
+
+def data_version(*tables):
+    """
+    Version stamps of the given tables from the data_versions table, which the
+    ingestion jobs bump whenever they rewrite or append to a table. Falls back to
+    the database modification time for databases without version metadata.
+    """
+    try:
+        conn = connect()
+        try:
+            placeholders = ', '.join('?' * len(tables))
+            rows = dict(conn.execute(
+                f"SELECT name, version FROM data_versions WHERE name IN ({placeholders})",
+                tables
+            ).fetchall())
+        finally:
+            conn.close()
+        return tuple(rows.get(table) for table in tables)
+    except sqlite3.OperationalError:
+        return (os.path.getmtime(DB_PATH),)
@@ -0,0 +1,73 @@
+import pandas as pd
+import profiling
+from econdata.db import SQL_BACKEND, read_frame, data_version
+from econdata.cache import get_cache
+
+# With copy-on-write, shallow copies handed out by the cache share column
+# buffers with the cached frame; a caller that modifies its copy gets private
+# data instead of mutating what other readers see.
+pd.set_option('mode.copy_on_write', True)
+
+def load(query, backend=None, sources=None, params=None):
+    """
+    A query result through the current cache (see set_cache), as a shallow
+    copy that shares the cached column buffers. backend picks the SQL reader
+    (see SQL_BACKENDS) and params are bound to the query's ? placeholders.
+    For tables updated more often than the cache TTL, pass them as sources to
+    reload whenever their data version moves.
+    """
+    backend = backend or SQL_BACKEND
+    params = tuple(params or ())
+    cache = get_cache()
+    key = (query, params, backend) if not sources else (query, params, backend, data_version(*sources))
+    with profiling.stage('load_data') as record:
+        df = cache.get(key)
+        record['cache'] = 'miss' if df is None else 'hit'
+        if df is None:
+            df = read_frame(query, backend, params)
+            cache.put(key, df)
+        record['rows'] = len(df)
+    return df.copy(deep=False)
+
+class LazyFrame:
+    """
+    Handle on a query result that is not read until it is first used. Column
+    lookups, attributes and methods go to the loaded DataFrame, so a handle
+    can stand in for the frame; use .frame where a real DataFrame is needed.
+    Every access goes through the cache, so a handle follows new data versions
+    of its sources.
+    """
+    def __init__(self, query, sources=None, name=None):
+        self.query = query
+        self.sources = sources
+        self.name = name or ', '.join(sources or []) or 'query'
+
+    @property
+    def frame(self):
+        return load(self.query, sources=self.sources)
+
+    def __getitem__(self, key):
+        return self.frame[key]
+
+    def __getattr__(self, attr):
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return getattr(self.frame, attr)
+
+    def __len__(self):
+        return len(self.frame)
+
+    def __repr__(self):
+        return f"<LazyFrame {self.name}>"
+
+    def _repr_html_(self):
+        return self.frame._repr_html_()
+
+def table(name, columns=None):
+    """Lazy handle on a stored table (or some of its columns), ordered by date."""
+    select = 'date, ' + ', '.join(columns) if columns else '*'
+    return LazyFrame(f"SELECT {select} FROM {name} ORDER BY date", sources=[name], name=name)
+
+def query(sql, sources=None):
+    """Lazy handle on any query with a date column; sources are the tables it reads."""
+    return LazyFrame(sql, sources=sources)
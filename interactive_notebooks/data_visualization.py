@@ -8,63 +8,59 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 import plotly.graph_objects as go
 from pathlib import Path
-from sqlalchemy import create_engine
+import sys
 import os
 
 #%%
-# Setup database connection : 
-# [Comment] Ivan: YOU CAN RUN IT INTERACTIVE FROM THIS WINDOW, or by calling "python interactive_notebooks/data_visualization.py" from the top project folder 
-def get_db_path():
-    """Get the database path whether running as script or interactively"""
-    current_file = Path(__file__).resolve() if '__file__' in globals() else Path.cwd()
-    if current_file.is_file():
-        # Running as script
-        return current_file.parent.parent / 'data' / 'economics_data.db'
-    else:
-        # Running interactively
-        return current_file.parent / 'data' / 'economics_data.db'
-
-db_path = get_db_path()
-if not db_path.exists():
+# Setup data access :
+# [Comment] Ivan: YOU CAN RUN IT INTERACTIVE FROM THIS WINDOW, or by calling "python interactive_notebooks/data_visualization.py" from the top project folder
+# The project folder holds the econdata package, shared with the dashboard pages
+PROJECT_DIR = Path(__file__).resolve().parent.parent if '__file__' in globals() else Path.cwd().parent
+sys.path.insert(0, str(PROJECT_DIR))
+from econdata import DB_PATH, table, query
+
+# Each cell below defines a chart and shows it when the notebook is run; importing
+# the module (as scripts/export_report.py does) only defines the charts
+SHOW_CHARTS = __name__ == '__main__'
+if not os.path.exists(DB_PATH):
     print("Error: Database file not found!")
-    print(f"Expected location: {db_path}")
-else:
-    # Create database connection
-    engine = create_engine(f'sqlite:///{db_path}')
-    
-    # Load all economic data from database
-    print("Loading data from database...")
-    unemployment = pd.read_sql('SELECT * FROM unrate', engine, parse_dates=['date']).set_index('date')
-    cpi_core = pd.read_sql('SELECT * FROM cpilfesl', engine, parse_dates=['date']).set_index('date')
-    cpi_all = pd.read_sql('SELECT * FROM cpiaucsl', engine, parse_dates=['date']).set_index('date')
-    ireland_cpi = pd.read_sql('SELECT * FROM ireland_cpi', engine, parse_dates=['date']).set_index('date')
-    euro_cpi = pd.read_sql('SELECT * FROM euro_cpi', engine, parse_dates=['date']).set_index('date')
-    gdpc1 = pd.read_sql('SELECT * FROM gdpc1', engine, parse_dates=['date']).set_index('date')
-    gdppot = pd.read_sql('SELECT * FROM gdppot', engine, parse_dates=['date']).set_index('date')
-    fedfunds = pd.read_sql('SELECT * FROM fedfunds', engine, parse_dates=['date']).set_index('date')
-    debt_to_gdp = pd.read_sql('SELECT * FROM gfdegdq188s', engine, parse_dates=['date']).set_index('date')
-    dgs1 = pd.read_sql('SELECT * FROM dgs1', engine, parse_dates=['date']).set_index('date')
-    dgs5 = pd.read_sql('SELECT * FROM dgs5', engine, parse_dates=['date']).set_index('date')
-    dgs10 = pd.read_sql('SELECT * FROM dgs10', engine, parse_dates=['date']).set_index('date')
-    dollar_index = pd.read_sql('SELECT * FROM dtwexbgs', engine, parse_dates=['date']).set_index('date')
-    eurusd = pd.read_sql('SELECT * FROM dexuseu', engine, parse_dates=['date']).set_index('date')
-    vix = pd.read_sql('SELECT * FROM vixcls', engine, parse_dates=['date']).set_index('date')
-    sp500 = pd.read_sql('SELECT * FROM sp500', engine, parse_dates=['date']).set_index('date')
-    # Load Personal Saving Rate data
-    psavert = pd.read_sql('''
-        SELECT 
-            date, 
-            PSAVERT/100 as saving_rate,
-            (PSAVERT / LAG(PSAVERT, 12) OVER (ORDER BY date) - 1) as saving_rate_yoy
-        FROM psavert
-    ''', engine, parse_dates=['date']).set_index('date')
-    print("Data loading completed!")
-
-    #%% [markdown]
-    # ## S&P 500 Price and Moving Averages
-
-    #%%
-    # Create S&P 500 price plot with moving averages
+    print(f"Expected location: {DB_PATH}")
+    SHOW_CHARTS = False
+
+# Lazy handles: a table is only read when a cell first uses it, then cached
+unemployment = table('unrate')
+cpi_core = table('cpilfesl')
+cpi_all = table('cpiaucsl')
+ireland_cpi = table('ireland_cpi')
+euro_cpi = table('euro_cpi')
+gdpc1 = table('gdpc1')
+gdppot = table('gdppot')
+fedfunds = table('fedfunds')
+debt_to_gdp = table('gfdegdq188s')
+dgs1 = table('dgs1')
+dgs5 = table('dgs5')
+dgs10 = table('dgs10')
+dollar_index = table('dtwexbgs')
+eurusd = table('dexuseu')
+vix = table('vixcls')
+sp500 = table('sp500')
+sp500_monthly = table('derived_sp500_monthly')
+# Personal Saving Rate data
+psavert = query('''
+    SELECT 
+        date, 
+        PSAVERT/100 as saving_rate,
+        (PSAVERT / LAG(PSAVERT, 12) OVER (ORDER BY date) - 1) as saving_rate_yoy
+    FROM psavert
+    ORDER BY date
+''', sources=['psavert'])
+
+#%% [markdown]
+# ## S&P 500 Price and Moving Averages
+
+#%%
+# Create S&P 500 price plot with moving averages
+def sp500_figure():
     fig_sp500 = go.Figure()
     fig_sp500.add_trace(go.Scatter(
         x=sp500.index,
@@ -96,16 +92,20 @@ else:
         template='plotly_white',
         hovermode='x unified'
     )
-    fig_sp500.show()
+    return fig_sp500
+
+if SHOW_CHARTS:
+    sp500_figure().show()
 
-    #%% [markdown]
-    # ## S&P 500 Yearly Returns
+#%% [markdown]
+# ## S&P 500 Yearly Returns
 
-    #%%
-    # Create S&P 500 yearly returns plot
+#%%
+# Create S&P 500 yearly returns plot (month-end YoY growth, stored in percent)
+def sp500_returns_figure():
     fig_sp500_returns = go.Figure()
     fig_sp500_returns.add_trace(
-        go.Scatter(x=sp500.index, y=sp500['sp500_returns_yearly'],
+        go.Scatter(x=sp500_monthly.index, y=sp500_monthly['yoy_growth'] / 100,
                   name='Yearly Returns', line=dict(color='blue'))
     )
 
@@ -116,13 +116,17 @@ else:
         hovermode='x unified'
     )
     fig_sp500_returns.update_yaxes(tickformat='.2%')
-    fig_sp500_returns.show()
+    return fig_sp500_returns
+
+if SHOW_CHARTS:
+    sp500_returns_figure().show()
 
-    #%% [markdown]
-    # ## Unemployment Rate Visualization
+#%% [markdown]
+# ## Unemployment Rate Visualization
 
-    #%%
-    # Create Unemployment Rate plot
+#%%
+# Create Unemployment Rate plot
+def unemployment_figure():
     fig_unemployment = go.Figure()
     fig_unemployment.add_trace(go.Scatter(
         x=unemployment.index,
@@ -148,13 +152,17 @@ else:
         template='plotly_white',
         hovermode='x unified'
     )
-    fig_unemployment.show()
+    return fig_unemployment
+
+if SHOW_CHARTS:
+    unemployment_figure().show()
 
-    #%% [markdown]
-    # ## CPI Comparison Visualization
+#%% [markdown]
+# ## CPI Comparison Visualization
 
-    #%%
-    # Create CPI Comparison plot
+#%%
+# Create CPI Comparison plot
+def cpi_figure():
     fig_cpi = go.Figure()
     fig_cpi.add_trace(go.Scatter(
         x=cpi_core.index,
@@ -175,13 +183,17 @@ else:
         hovermode='x unified'
     )
     fig_cpi.update_yaxes(tickformat='.2%')
-    fig_cpi.show()
+    return fig_cpi
+
+if SHOW_CHARTS:
+    cpi_figure().show()
 
-    #%% [markdown]
-    # ## Ireland and Euro Area CPI Comparison
+#%% [markdown]
+# ## Ireland and Euro Area CPI Comparison
 
-    #%%
-    # Create Ireland and Euro Area CPI Comparison plot
+#%%
+# Create Ireland and Euro Area CPI Comparison plot
+def euro_cpi_figure():
     fig_euro_cpi = go.Figure()
     fig_euro_cpi.add_trace(go.Scatter(
         x=ireland_cpi.index,
@@ -208,13 +220,17 @@ else:
         hovermode='x unified'
     )
     fig_euro_cpi.update_yaxes(tickformat='.2%')
-    fig_euro_cpi.show()
+    return fig_euro_cpi
+
+if SHOW_CHARTS:
+    euro_cpi_figure().show()
 
-    #%% [markdown]
-    # ## GDP Growth Comparison
+#%% [markdown]
+# ## GDP Growth Comparison
 
-    #%%
-    # Create GDP Growth Comparison plot
+#%%
+# Create GDP Growth Comparison plot
+def gdp_comparison_figure():
     fig_gdp_comparison = go.Figure()
     fig_gdp_comparison.add_trace(go.Scatter(
         x=gdppot.index,
@@ -235,41 +251,53 @@ else:
         hovermode='x unified',
         template='plotly_white'
     )
-    fig_gdp_comparison.show()
+    return fig_gdp_comparison
+
+if SHOW_CHARTS:
+    gdp_comparison_figure().show()
 
-    #%% [markdown]
-    # ## Fed Funds Rate Visualization
+#%% [markdown]
+# ## Fed Funds Rate Visualization
 
-    #%%
-    # Create Fed Funds Rate plot
-    fig_fedfunds = px.line(fedfunds, x=fedfunds.index, y='FEDFUNDS',
+#%%
+# Create Fed Funds Rate plot
+def fedfunds_figure():
+    fig_fedfunds = px.line(fedfunds.frame, x=fedfunds.index, y='FEDFUNDS',
                            title='Federal Funds Rate')
     fig_fedfunds.update_layout(
         showlegend=False,
         yaxis_title='Rate (%)',
         template='plotly_white'
     )
-    fig_fedfunds.show()
+    return fig_fedfunds
+
+if SHOW_CHARTS:
+    fedfunds_figure().show()
 
-    #%% [markdown]
-    # ## Federal Debt to GDP Visualization
+#%% [markdown]
+# ## Federal Debt to GDP Visualization
 
-    #%%
-    # Create Federal Debt to GDP plot
-    fig_debt_gdp = px.line(debt_to_gdp, x=debt_to_gdp.index, y='GFDEGDQ188S',
+#%%
+# Create Federal Debt to GDP plot
+def debt_gdp_figure():
+    fig_debt_gdp = px.line(debt_to_gdp.frame, x=debt_to_gdp.index, y='GFDEGDQ188S',
                            title='Federal Debt to GDP Ratio')
     fig_debt_gdp.update_layout(
         showlegend=False,
         yaxis_title='Ratio (%)',
         template='plotly_white'
     )
-    fig_debt_gdp.show()
+    return fig_debt_gdp
+
+if SHOW_CHARTS:
+    debt_gdp_figure().show()
 
-    #%% [markdown]
-    # ## Treasury Yields Visualization
+#%% [markdown]
+# ## Treasury Yields Visualization
 
-    #%%
-    # Create Treasury Yields plot
+#%%
+# Create Treasury Yields plot
+def treasury_figure():
     fig_treasury = go.Figure()
     fig_treasury.add_trace(go.Scatter(x=dgs1.index, y=dgs1['DGS1'], name='1-Year'))
     fig_treasury.add_trace(go.Scatter(x=dgs5.index, y=dgs5['DGS5'], name='5-Year'))
@@ -280,13 +308,17 @@ else:
         template='plotly_white',
         hovermode='x unified'
     )
-    fig_treasury.show()
+    return fig_treasury
+
+if SHOW_CHARTS:
+    treasury_figure().show()
 
-    #%% [markdown]
-    # ## Trade Weighted U.S. Dollar Index Visualization
+#%% [markdown]
+# ## Trade Weighted U.S. Dollar Index Visualization
 
-    #%%
-    # Create Trade Weighted Dollar Index plot
+#%%
+# Create Trade Weighted Dollar Index plot
+def dollar_figure():
     fig_dollar = go.Figure()
     fig_dollar.add_trace(go.Scatter(
         x=dollar_index.index,
@@ -312,13 +344,17 @@ else:
         template='plotly_white',
         hovermode='x unified'
     )
-    fig_dollar.show()
+    return fig_dollar
+
+if SHOW_CHARTS:
+    dollar_figure().show()
 
-    #%% [markdown]
-    # ## EUR/USD Exchange Rate Visualization
+#%% [markdown]
+# ## EUR/USD Exchange Rate Visualization
 
-    #%%
-    # Create EUR/USD Exchange Rate plot
+#%%
+# Create EUR/USD Exchange Rate plot
+def eurusd_figure():
     fig_eurusd = go.Figure()
     fig_eurusd.add_trace(go.Scatter(
         x=eurusd.index,
@@ -344,13 +380,17 @@ else:
         template='plotly_white',
         hovermode='x unified'
     )
-    fig_eurusd.show()
+    return fig_eurusd
+
+if SHOW_CHARTS:
+    eurusd_figure().show()
 
-    #%% [markdown]
-    # ## VIX Volatility Index Visualization
+#%% [markdown]
+# ## VIX Volatility Index Visualization
 
-    #%%
-    # Create VIX plot
+#%%
+# Create VIX plot
+def vix_figure():
     fig_vix = go.Figure()
     fig_vix.add_trace(go.Scatter(
         x=vix.index,
@@ -376,13 +416,17 @@ else:
         template='plotly_white',
         hovermode='x unified'
     )
-    fig_vix.show()
+    return fig_vix
+
+if SHOW_CHARTS:
+    vix_figure().show()
 
-    #%% [markdown]
-    # ## Personal Saving Rate Visualization
+#%% [markdown]
+# ## Personal Saving Rate Visualization
 
-    #%%
-    # Create Personal Saving Rate plot
+#%%
+# Create Personal Saving Rate plot
+def psavert_figure():
     fig_psavert = go.Figure()
     # Add saving rate as bars
     fig_psavert.add_trace(go.Bar(
@@ -416,4 +460,25 @@ else:
         hovermode='x unified',
         barmode='relative'
     )
-    fig_psavert.show()
+    return fig_psavert
+
+if SHOW_CHARTS:
+    psavert_figure().show()
+
+#%%
+# Chart builders by id, with the tables each one reads (see scripts/export_report.py)
+CHARTS = {
+    'sp500': (sp500_figure, ['sp500']),
+    'sp500_returns': (sp500_returns_figure, ['derived_sp500_monthly']),
+    'unemployment': (unemployment_figure, ['unrate']),
+    'cpi': (cpi_figure, ['cpilfesl', 'cpiaucsl']),
+    'euro_cpi': (euro_cpi_figure, ['ireland_cpi', 'euro_cpi', 'cpiaucsl']),
+    'gdp_comparison': (gdp_comparison_figure, ['gdppot', 'gdpc1']),
+    'fedfunds': (fedfunds_figure, ['fedfunds']),
+    'debt_gdp': (debt_gdp_figure, ['gfdegdq188s']),
+    'treasury': (treasury_figure, ['dgs1', 'dgs5', 'dgs10']),
+    'dollar': (dollar_figure, ['dtwexbgs']),
+    'eurusd': (eurusd_figure, ['dexuseu']),
+    'vix': (vix_figure, ['vixcls']),
+    'psavert': (psavert_figure, ['psavert']),
+}
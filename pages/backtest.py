@@ -0,0 +1,164 @@
+import streamlit as st
+import plotly.graph_objects as go
+from utils import load_data, get_data_version, get_frame_cache, get_chart_layout, line_trace, render_chart
+from backtest import STRATEGIES, SOURCES, parameter_grid, param_label, align_inputs, run
+
+# Every parameter set of every strategy by its label
+PARAMETER_SETS = {
+    param_label(strategy, params): (strategy, params)
+    for strategy in STRATEGIES for params in parameter_grid(strategy)
+}
+
+RESULT_COLUMNS = {
+    'label': 'Parameters',
+    'total_return': 'Total return',
+    'cagr': 'CAGR',
+    'volatility': 'Volatility',
+    'sharpe': 'Sharpe',
+    'max_drawdown': 'Max drawdown',
+    'turnover': 'Trades per year',
+    'exposure': 'Time invested',
+}
+
+def load_results():
+    # Written by scripts/backtest_sweep.py, one row per strategy and parameter set
+    results_query = """
+    SELECT *
+    FROM backtest_results
+    ORDER BY strategy, label
+    """
+    return load_data(results_query, sources=['backtest_results'])
+
+def backtest_inputs():
+    sp500 = load_data("SELECT date, SP500 FROM sp500 ORDER BY date", sources=['sp500'])['SP500']
+    vix = load_data("SELECT date, VIXCLS FROM vixcls ORDER BY date", sources=['vixcls'])['VIXCLS']
+    spread = load_data("SELECT date, spread_10y1y FROM derived_yield_spreads ORDER BY date", sources=['derived_yield_spreads'])['spread_10y1y']
+    return align_inputs(sp500, vix, spread)
+
+def equity_curve(label):
+    """Equity and drawdown of one parameter set, cached per data version."""
+    cache = get_frame_cache()
+    key = ('backtest', label, get_data_version(*SOURCES))
+    curve = cache.get(key)
+    if curve is None:
+        strategy, params = PARAMETER_SETS[label]
+        _, curve = run(strategy, params, backtest_inputs())
+        cache.put(key, curve)
+    return curve
+
+def sweep_figure(strategy='ma_trend'):
+    all_results = load_results()
+    results = all_results[all_results['strategy'] == strategy]
+    baseline = all_results[all_results['strategy'] == 'buy_and_hold']
+
+    fig_sweep = go.Figure()
+    fig_sweep.add_trace(go.Bar(
+        x=results['label'],
+        y=results['cagr'],
+        name='CAGR',
+        marker_color='#FFBA08',
+        hovertemplate='%{x}<br>CAGR: %{y:.1%}<extra></extra>'
+    ))
+    fig_sweep.add_trace(go.Bar(
+        x=results['label'],
+        y=results['max_drawdown'],
+        name='Max drawdown',
+        marker_color='#FF4B4B',
+        hovertemplate='%{x}<br>Max drawdown: %{y:.1%}<extra></extra>'
+    ))
+    if not baseline.empty:
+        for column, color in [('cagr', '#FFBA08'), ('max_drawdown', '#FF4B4B')]:
+            fig_sweep.add_hline(y=baseline[column].iloc[0], line=dict(color=color, width=1, dash='dash'))
+    layout = get_chart_layout('')
+    layout.update(showlegend=True, barmode='group', yaxis=dict(tickformat='.0%'))
+    fig_sweep.update_layout(layout)
+    return fig_sweep
+
+def equity_figure(label='MA 200'):
+    curves = {'Buy and hold': equity_curve('Buy and hold'), label: equity_curve(label)}
+
+    fig_equity = go.Figure()
+    for (name, curve), color in zip(curves.items(), ['#666666', '#FFBA08']):
+        fig_equity.add_trace(line_trace(
+            x=curve.index,
+            y=curve['equity'],
+            name=name,
+            line=dict(color=color, width=2),
+            hovertemplate=f'Date: %{{x}}<br>{name}: %{{y:.2f}}x<extra></extra>'
+        ))
+    layout = get_chart_layout('')
+    layout.update(showlegend=True, yaxis=dict(type='log', title='Growth of $1'))
+    fig_equity.update_layout(layout)
+    return fig_equity
+
+def drawdown_figure(label='MA 200'):
+    curves = {'Buy and hold': equity_curve('Buy and hold'), label: equity_curve(label)}
+
+    fig_drawdown = go.Figure()
+    for (name, curve), color in zip(curves.items(), ['#666666', '#FF4B4B']):
+        fig_drawdown.add_trace(line_trace(
+            x=curve.index,
+            y=curve['drawdown'],
+            name=name,
+            line=dict(color=color, width=1),
+            fill='tozeroy',
+            hovertemplate=f'Date: %{{x}}<br>{name} drawdown: %{{y:.1%}}<extra></extra>'
+        ))
+    layout = get_chart_layout('')
+    layout.update(showlegend=True, yaxis=dict(tickformat='.0%'))
+    fig_drawdown.update_layout(layout)
+    return fig_drawdown
+
+# Chart builders by id, with the tables each one reads
+CHARTS = {
+    'sweep': (sweep_figure, ['backtest_results']),
+    'equity': (equity_figure, SOURCES),
+    'drawdown': (drawdown_figure, SOURCES),
+}
+
+@st.fragment
+def backtest_section(results):
+    strategies = [strategy for strategy in STRATEGIES if strategy != 'buy_and_hold']
+    strategy = st.selectbox('Strategy', strategies, format_func=lambda s: STRATEGIES[s]['name'],
+                            key='backtest_strategy')
+
+    st.subheader('Parameter Sweep')
+    as_of = results.index.max()
+    st.caption(f'<span style="background-color: #31333F; padding: 2px 6px; border-radius: 3px;"><b>Data through: {as_of.strftime("%B %d, %Y")}</b></span> | Dashed lines: buy and hold', unsafe_allow_html=True)
+    render_chart('backtest.sweep', *CHARTS['sweep'], date_range=strategy)
+
+    table = results[results['strategy'].isin([strategy, 'buy_and_hold'])][list(RESULT_COLUMNS)]
+    table = table.rename(columns=RESULT_COLUMNS).set_index('Parameters')
+    percent = ['Total return', 'CAGR', 'Volatility', 'Max drawdown', 'Time invested']
+    st.dataframe(table.style.format({**{c: '{:.1%}' for c in percent}, 'Sharpe': '{:.2f}', 'Trades per year': '{:.1f}'}),
+                 use_container_width=True)
+
+    labels = [label for label, (s, _) in PARAMETER_SETS.items() if s == strategy]
+    best = results[results['strategy'] == strategy].sort_values('sharpe', ascending=False)['label']
+    label = st.selectbox('Parameters', labels, index=labels.index(best.iloc[0]) if len(best) else 0,
+                         key=f'backtest_params_{strategy}')
+
+    st.subheader('Equity Curve')
+    render_chart('backtest.equity', *CHARTS['equity'], date_range=label)
+
+    st.subheader('Drawdown')
+    render_chart('backtest.drawdown', *CHARTS['drawdown'], date_range=label)
+
+    st.markdown("""
+    * **How to Read**: Each strategy is either fully invested in the S&P 500 or in cash (earning nothing), switching at the daily close. Results ignore dividends, taxes and trading costs, so frequent switching looks better here than in practice.
+    * **Trend Following**: Moving-average rules mostly trade some return for smaller drawdowns by stepping aside during long declines.
+    * **Buying Fear**: VIX spikes mark sell-offs; the hold period decides whether the strategy captures the rebound that usually follows.
+    * **Curve Inversion**: Inversions often lead recessions by a year or more, so exiting on inversion can mean missing the late-cycle rally.
+    * **Caveat**: A parameter that looks best in hindsight is not a forecast. Prefer rules that work across a range of parameters.
+    """)
+
+def show():
+    st.header('Strategy Backtests')
+
+    try:
+        if get_data_version('backtest_results')[0] is None:
+            st.info('No backtest results yet. Run `python scripts/backtest_sweep.py` to compute them.')
+            return
+        backtest_section(load_results())
+    except Exception as e:
+        st.error(f"Error in Strategy Backtests: {str(e)}")
@@ -0,0 +1,203 @@
+import streamlit as st
+import plotly.graph_objects as go
+import numpy as np
+import pandas as pd
+from utils import get_data_version, get_frame_cache, get_chart_layout, line_trace, render_chart
+from resampling import SERIES, align, comoments
+
+# Market series compared on this page: name -> (label, return type). Prices use
+# percentage changes, yields (fractions) their daily change.
+ASSETS = {
+    'sp500': ('S&P 500', 'pct'),
+    'vix': ('VIX', 'pct'),
+    'dgs1': ('1Y Treasury', 'diff'),
+    'dgs10': ('10Y Treasury', 'diff'),
+    'dollar_index': ('Dollar Index', 'pct'),
+    'eurusd': ('EUR/USD', 'pct'),
+    'btc': ('BTC/USD', 'pct'),
+}
+
+# Rolling correlations and betas are measured against this series
+BENCHMARK = 'sp500'
+
+# Rolling window options, in trading days
+WINDOWS = {
+    '1M': 21,
+    '3M': 63,
+    '6M': 126,
+    '1Y': 252,
+    '3Y': 756,
+}
+
+# Fewest joint daily returns behind a full-sample correlation
+MIN_OBSERVATIONS = 20
+
+SOURCES = sorted({SERIES[name][0] for name in ASSETS})
+
+COLORS = ['#FFBA08', '#00FFF0', '#FF00FF', '#00FF00', '#FF4B4B', '#8888FF']
+
+def daily_returns(version):
+    """
+    Business-day returns of every asset, each between its own consecutive
+    observations, kept in the shared frame cache per data version.
+    """
+    cache = get_frame_cache()
+    key = ('cross_asset', 'returns', version)
+    returns = cache.get(key)
+    if returns is None:
+        panel = align(ASSETS, 'B', how='last')
+        returns = {}
+        for name, (_, kind) in ASSETS.items():
+            observed = panel[name].dropna()
+            change = observed.pct_change() if kind == 'pct' else observed.diff()
+            returns[name] = change.reindex(panel.index)
+        returns = pd.DataFrame(returns)
+        cache.put(key, returns)
+    return returns
+
+def full_correlation():
+    """
+    Full-sample correlation matrix of daily returns. It does not depend on the
+    rolling window, so it is kept in the shared frame cache per data version only.
+    """
+    version = get_data_version(*SOURCES)
+    cache = get_frame_cache()
+    key = ('cross_asset', 'full', version)
+    full = cache.get(key)
+    if full is None:
+        returns = daily_returns(version)
+        labels = [ASSETS[name][0] for name in returns.columns]
+        full_corr, _ = comoments(returns.to_numpy(), min_periods=MIN_OBSERVATIONS)
+        full = pd.DataFrame(full_corr, index=labels, columns=labels)
+        cache.put(key, full)
+    return full
+
+def cross_asset_stats(window):
+    """
+    Rolling correlations and betas for a WINDOWS key, computed together in one
+    pass and kept in the shared frame cache per window and data version.
+    Returns (latest window matrix, rolling correlation and rolling beta of each
+    asset against BENCHMARK).
+    """
+    version = get_data_version(*SOURCES)
+    cache = get_frame_cache()
+    kinds = ['latest', 'rolling_corr', 'rolling_beta']
+    stats = [cache.get(('cross_asset', kind, window, version)) for kind in kinds]
+    if all(frame is not None for frame in stats):
+        return stats
+
+    returns = daily_returns(version)
+    values = returns.to_numpy()
+    names = list(returns.columns)
+    labels = [ASSETS[name][0] for name in names]
+    length = WINDOWS[window]
+
+    corr, beta = comoments(values, length, min_periods=length // 2)
+    benchmark = names.index(BENCHMARK)
+    # Rows where at least one pair has a full enough window
+    rows = ~np.isnan(corr[:, :, benchmark]).all(axis=1)
+
+    stats = [
+        pd.DataFrame(corr[rows][-1] if rows.any() else np.full((len(names),) * 2, np.nan),
+                     index=labels, columns=labels),
+        pd.DataFrame(corr[rows, :, benchmark], index=returns.index[rows], columns=labels),
+        pd.DataFrame(beta[rows, :, benchmark], index=returns.index[rows], columns=labels),
+    ]
+    for kind, frame in zip(kinds, stats):
+        cache.put(('cross_asset', kind, window, version), frame)
+    return stats
+
+def heatmap_figure(matrix):
+    # Assets without enough history have no correlation even with themselves
+    shown = [label for label in matrix.index if pd.notna(matrix.loc[label, label])]
+    matrix = matrix.loc[shown, shown]
+
+    fig = go.Figure(go.Heatmap(
+        z=matrix.to_numpy(),
+        x=shown,
+        y=shown,
+        zmin=-1,
+        zmax=1,
+        colorscale='RdBu',
+        texttemplate='%{z:.2f}',
+        hovertemplate='%{y} / %{x}: %{z:.2f}<extra></extra>'
+    ))
+    layout = get_chart_layout('')
+    layout.update(height=450, yaxis=dict(autorange='reversed'))
+    fig.update_layout(layout)
+    return fig
+
+def correlation_figure():
+    return heatmap_figure(full_correlation())
+
+def window_correlation_figure(window='1Y'):
+    return heatmap_figure(cross_asset_stats(window)[0])
+
+def rolling_figure(frame, label, tickformat):
+    fig = go.Figure()
+    benchmark = ASSETS[BENCHMARK][0]
+    others = [column for column in frame.columns if column != benchmark and frame[column].notna().any()]
+    for column, color in zip(others, COLORS):
+        fig.add_trace(line_trace(
+            x=frame.index,
+            y=frame[column],
+            name=column,
+            line=dict(color=color, width=1),
+            hovertemplate=f'Date: %{{x}}<br>{column} {label}: %{{y:{tickformat}}}<extra></extra>'
+        ))
+    fig.add_hline(y=0, line=dict(color='#666666', width=1, dash='dash'))
+    layout = get_chart_layout('')
+    layout.update(showlegend=True)
+    fig.update_layout(layout)
+    return fig
+
+def rolling_correlation_figure(window='1Y'):
+    return rolling_figure(cross_asset_stats(window)[1], 'correlation', '.2f')
+
+def rolling_beta_figure(window='1Y'):
+    return rolling_figure(cross_asset_stats(window)[2], 'beta', '.2f')
+
+# Chart builders by id, with the tables each one reads
+CHARTS = {
+    'correlation': (correlation_figure, SOURCES),
+    'window_correlation': (window_correlation_figure, SOURCES),
+    'rolling_correlation': (rolling_correlation_figure, SOURCES),
+    'rolling_beta': (rolling_beta_figure, SOURCES),
+}
+
+@st.fragment
+def correlation_section():
+    window = st.radio('Rolling window', list(WINDOWS), index=list(WINDOWS).index('1Y'),
+                      horizontal=True, key='cross_asset_window')
+    full = full_correlation()
+    missing = [label for label in full.index if pd.isna(full.loc[label, label])]
+
+    st.subheader('Correlation of Daily Returns (Full History)')
+    if missing:
+        st.caption(f"Not enough overlapping daily history yet for: {', '.join(missing)}")
+    render_chart('cross_asset.correlation', *CHARTS['correlation'])
+
+    st.subheader(f'Correlation over the Last {window}')
+    render_chart('cross_asset.window_correlation', *CHARTS['window_correlation'], date_range=window)
+
+    benchmark = ASSETS[BENCHMARK][0]
+    st.subheader(f'Rolling {window} Correlation with the {benchmark}')
+    render_chart('cross_asset.rolling_correlation', *CHARTS['rolling_correlation'], date_range=window)
+
+    st.subheader(f'Rolling {window} Beta to the {benchmark}')
+    render_chart('cross_asset.rolling_beta', *CHARTS['rolling_beta'], date_range=window)
+
+    st.markdown("""
+    * **Correlation**: Ranges from -1 (assets move in opposite directions) to +1 (they move together). Low or negative correlations are what makes diversification work.
+    * **Beta**: How much an asset's daily return moves for a 1% move in the S&P 500; for Treasuries it is the change in yield. A beta of 0.5 means half the market's move on average.
+    * **Changing Relationships**: Correlations are not stable. They often rise across risky assets during sell-offs, exactly when diversification is needed most.
+    * **Bitcoin**: BTC history here is the last 7 days of minute data, so it joins these statistics only once enough daily returns overlap with the other markets.
+    """)
+
+def show():
+    st.header('Cross-Asset Correlations')
+
+    try:
+        correlation_section()
+    except Exception as e:
+        st.error(f"Error in Cross-Asset Correlations: {str(e)}")
@@ -1,76 +1,274 @@
 import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
-from utils import load_btc_data, get_chart_layout
+from datetime import timedelta
+from utils import (format_date, load_data, load_btc_window, load_btc_tail, downsample, get_latest, get_chart_layout,
+                   line_trace, compact_dates, render_chart, render_live_chart, BTC_BAR_SIZES)
+
+# Range selector options for the BTC charts, ending at the latest bar
+BTC_WINDOWS = {
+    '6H': timedelta(hours=6),
+    '1D': timedelta(days=1),
+    '3D': timedelta(days=3),
+    '7D': timedelta(days=7)
+}
+
+def btc_price_figure(window='7D'):
+    btc_data = load_btc_window(BTC_WINDOWS[window])
+
+    fig_btc = go.Figure()
+    fig_btc.add_trace(line_trace(
+        x=btc_data['Datetime'],
+        y=btc_data['Close'],
+        name='BTC/USD',
+        line=dict(color='#FFBA08', width=2),
+        hovertemplate='Date: %{x}<br>Price: $%{y:,.2f}<extra></extra>'
+    ))
+    fig_btc.update_layout(get_chart_layout(''))
+    return fig_btc
+
+def btc_volume_figure(window='7D'):
+    btc_data = load_btc_window(BTC_WINDOWS[window])
+
+    fig_volume = go.Figure()
+    fig_volume.add_trace(go.Bar(
+        x=compact_dates(btc_data['Datetime']),
+        y=btc_data['Volume'],
+        name='Volume',
+        marker_color='#FFBA08',
+        hovertemplate='Date: %{x}<br>Volume: %{y:,.0f}<extra></extra>'
+    ))
+    fig_volume.update_layout(get_chart_layout(''))
+    return fig_volume
+
+def btc_points(window, column):
+    """One column of the BTC bars a price or volume chart draws, by x value, for live updates."""
+    btc_data = load_btc_window(BTC_WINDOWS[window])
+    points = pd.DataFrame({column: btc_data[column].to_numpy()}, index=compact_dates(btc_data['Datetime']))
+    points.attrs = btc_data.attrs
+    return points
+
+# BTC trades around the clock; same annualization as scripts/intraday_analytics.py
+MINUTES_PER_YEAR = 365 * 24 * 60
+
+def load_intraday(window):
+    # Analytics are materialized per minute by the collector; only the last 7 days are read
+    intraday_query = """
+    SELECT *
+    FROM derived_btc_intraday
+    WHERE date >= (SELECT datetime(MAX(date), '-7 days') FROM derived_btc_intraday)
+    ORDER BY date
+    """
+    intraday = load_data(intraday_query, sources=['derived_btc_intraday'])
+    intraday = intraday[intraday.index >= intraday.index[-1] - BTC_WINDOWS[window]]
+    return downsample(intraday, BTC_BAR_SIZES, 'last')
+
+def realized_vol_figure(window='7D'):
+    intraday = load_intraday(window)
+
+    fig_vol = go.Figure()
+    for column, name, color in [('rv_1h', '1 hour', '#FF00FF'), ('rv_4h', '4 hours', '#00FFF0'),
+                                ('rv_24h', '24 hours', '#FFBA08')]:
+        fig_vol.add_trace(line_trace(
+            x=intraday.index,
+            y=intraday[column],
+            name=name,
+            line=dict(color=color, width=2 if column == 'rv_24h' else 1),
+            hovertemplate=f'Date: %{{x}}<br>{name} volatility: %{{y:.1%}}<extra></extra>'
+        ))
+    layout = get_chart_layout('')
+    layout.update(showlegend=True, yaxis=dict(tickformat='.0%'))
+    fig_vol.update_layout(layout)
+    return fig_vol
+
+def vwap_figure(window='7D'):
+    btc_data = load_btc_window(BTC_WINDOWS[window])
+    intraday = load_intraday(window)
+
+    fig_vwap = go.Figure()
+    fig_vwap.add_trace(line_trace(
+        x=btc_data['Datetime'],
+        y=btc_data['Close'],
+        name='BTC/USD',
+        line=dict(color='#FFBA08', width=2),
+        hovertemplate='Date: %{x}<br>Price: $%{y:,.2f}<extra></extra>'
+    ))
+    fig_vwap.add_trace(line_trace(
+        x=intraday.index,
+        y=intraday['vwap_24h'],
+        name='24h VWAP',
+        line=dict(color='#00FFF0', width=1),
+        hovertemplate='Date: %{x}<br>24h VWAP: $%{y:,.2f}<extra></extra>'
+    ))
+    fig_vwap.add_trace(line_trace(
+        x=intraday.index,
+        y=intraday['vwap_day'],
+        name='Daily VWAP',
+        line=dict(color='#FF00FF', width=1, dash='dash'),
+        hovertemplate='Date: %{x}<br>Daily VWAP: $%{y:,.2f}<extra></extra>'
+    ))
+    layout = get_chart_layout('')
+    layout.update(showlegend=True)
+    fig_vwap.update_layout(layout)
+    return fig_vwap
+
+def seasonality_figure():
+    hourly_query = """
+    SELECT date, bars, sum_sq_return, volume
+    FROM derived_btc_hourly
+    ORDER BY date
+    """
+    hourly = load_data(hourly_query, sources=['derived_btc_hourly'])
+    # Per-hour totals are kept by the collector; fold them into the 24 hours of the day
+    by_hour = hourly.groupby(hourly.index.hour).sum()
+    volatility = (by_hour['sum_sq_return'] / by_hour['bars'] * MINUTES_PER_YEAR) ** 0.5
+    volume = by_hour['volume'] / by_hour['bars']
+
+    fig_season = go.Figure()
+    fig_season.add_trace(go.Bar(
+        x=by_hour.index,
+        y=volatility,
+        name='Volatility',
+        marker_color='#FFBA08',
+        hovertemplate='%{x}:00 UTC<br>Volatility: %{y:.1%}<extra></extra>'
+    ))
+    fig_season.add_trace(go.Scatter(
+        x=by_hour.index,
+        y=volume,
+        name='Volume per minute',
+        yaxis='y2',
+        line=dict(color='#00FFF0', width=2),
+        hovertemplate='%{x}:00 UTC<br>Volume per minute: %{y:,.0f}<extra></extra>'
+    ))
+    layout = get_chart_layout('')
+    layout.update(
+        showlegend=True,
+        xaxis=dict(title='Hour of day (UTC)', dtick=2),
+        yaxis=dict(tickformat='.0%', title='Volatility'),
+        yaxis2=dict(title='Volume per minute', overlaying='y', side='right', showgrid=False)
+    )
+    fig_season.update_layout(layout)
+    return fig_season
+
+# Chart builders by id, with the tables each one reads
+CHARTS = {
+    'price': (btc_price_figure, ['btc_minute']),
+    'volume': (btc_volume_figure, ['btc_minute']),
+    'realized_vol': (realized_vol_figure, ['derived_btc_intraday']),
+    'vwap': (vwap_figure, ['btc_minute', 'derived_btc_intraday']),
+    'seasonality': (seasonality_figure, ['derived_btc_hourly']),
+}
+
+# Live mode refresh cadences, in seconds
+LIVE_CADENCES = [15, 30, 60, 120]
+
+def live_fragment(func):
+    """
+    func as a fragment. While live mode is on it reruns on its own at the chosen
+    cadence; a rerun reads only the bars added since the previous one. The price
+    and volume charts then send just their new points (see render_live_chart),
+    the other charts are rebuilt only when their data version has moved.
+    """
+    run_every = st.session_state.btc_live_cadence if st.session_state.get('btc_live') else None
+    return st.fragment(func, run_every=run_every)
+
+def price_section():
+    st.subheader('BTC/USD Price')
+    latest = get_latest('btc')['btc']
+    latest_price = latest.get('Close')
+    latest_date = latest['date']
+
+    caption = f'<span style="background-color: #31333F; padding: 2px 6px; border-radius: 3px;"><b>Latest data: {format_date(latest_date, "%B %d, %Y %H:%M")}</b></span>'
+    if pd.notna(latest_price):
+        caption += f' | Price: ${latest_price:,.2f}'
+    st.caption(caption, unsafe_allow_html=True)
+    window = st.radio('Range', list(BTC_WINDOWS), index=len(BTC_WINDOWS) - 1,
+                      horizontal=True, key='btc_price_window', label_visibility='collapsed')
+    if st.session_state.get('btc_live'):
+        render_live_chart('crypto_markets.price', CHARTS['price'][0], lambda window: btc_points(window, 'Close'), window)
+    else:
+        render_chart('crypto_markets.price', *CHARTS['price'], date_range=window)
+
+    # Add explanatory text
+    st.markdown("""
+    * **Alternative Asset Class**: Cryptocurrencies represent a distinct asset class that historically has shown lower correlation with traditional investments like stocks and bonds, potentially offering portfolio diversification benefits.
+    * **Real-Time Data Pipeline**: This dashboard displays up to 7 days of minute-level BTC/USD data (maximum available from yfinance) that updates with a 2-3 minute lag, providing both real-time price monitoring and short-term historical context.
+    """)
+
+def volume_section():
+    st.subheader('BTC/USD Trading Volume')
+    latest = get_latest('btc')['btc']
+    latest_volume = latest.get('Volume')
+    latest_date = latest['date']
+
+    caption = f'<span style="background-color: #31333F; padding: 2px 6px; border-radius: 3px;"><b>Latest data: {format_date(latest_date, "%B %d, %Y %H:%M")}</b></span>'
+    if pd.notna(latest_volume):
+        caption += f' | Volume: {latest_volume:,.0f}'
+    st.caption(caption, unsafe_allow_html=True)
+    window = st.radio('Range', list(BTC_WINDOWS), index=len(BTC_WINDOWS) - 1,
+                      horizontal=True, key='btc_volume_window', label_visibility='collapsed')
+    if st.session_state.get('btc_live'):
+        render_live_chart('crypto_markets.volume', CHARTS['volume'][0], lambda window: btc_points(window, 'Volume'), window)
+    else:
+        render_chart('crypto_markets.volume', *CHARTS['volume'], date_range=window)
+
+def analytics_section():
+    st.subheader('BTC/USD Realized Volatility')
+    window = st.radio('Range', list(BTC_WINDOWS), index=len(BTC_WINDOWS) - 1,
+                      horizontal=True, key='btc_analytics_window', label_visibility='collapsed')
+    render_chart('crypto_markets.realized_vol', *CHARTS['realized_vol'], date_range=window)
+
+    st.subheader('BTC/USD Volume-Weighted Average Price')
+    render_chart('crypto_markets.vwap', *CHARTS['vwap'], date_range=window)
+
+    st.subheader('BTC/USD Intraday Seasonality')
+    render_chart('crypto_markets.seasonality', *CHARTS['seasonality'])
+
+    st.markdown("""
+    * **Realized Volatility**: Annualized from minute log returns over the last 1, 4 and 24 hours. Short horizons react to bursts of activity; the 24-hour line shows the underlying regime.
+    * **VWAP**: The average price weighted by traded volume, over the last 24 hours and since midnight UTC. Prices above VWAP mean recent buyers are on average in profit.
+    * **Seasonality**: Average volatility and volume by hour of day across the stored history. Crypto trades around the clock, but activity still follows the opening hours of the major markets.
+    """)
+
+def latest_table_section():
+    st.subheader('Latest BTC/USD Data')
+    last_5_data = load_btc_tail(5)[['Datetime', 'Open', 'High', 'Low', 'Close', 'Volume']]
+    # Format the columns
+    last_5_data = pd.DataFrame({
+        'Time': last_5_data['Datetime'].dt.strftime('%Y-%m-%d %H:%M'),
+        'Open': last_5_data['Open'].map('${:,.2f}'.format),
+        'High': last_5_data['High'].map('${:,.2f}'.format),
+        'Low': last_5_data['Low'].map('${:,.2f}'.format),
+        'Close': last_5_data['Close'].map('${:,.2f}'.format),
+        'Volume': last_5_data['Volume'].map('{:,.0f}'.format)
+    })
+    st.dataframe(last_5_data, use_container_width=True)
 
 def show():
     st.header('Cryptocurrency Markets')
-        
+
     try:
-        # Load BTC data
-        btc_data = load_btc_data()
-        
-        if not btc_data.empty and btc_data['Close'].notna().any():
+        latest = get_latest('btc')['btc']
+
+        if pd.notna(latest.get('Close')):
+            # Live mode toggle; changing it reruns the page so the sections pick up the cadence
+            cols = st.columns([1, 3])
+            cols[0].toggle('Live updates', key='btc_live')
+            cols[1].select_slider('Refresh every', options=LIVE_CADENCES, value=60,
+                                  format_func=lambda seconds: f'{seconds}s', key='btc_live_cadence',
+                                  disabled=not st.session_state.get('btc_live'))
+
             # Price chart
-            st.subheader('BTC/USD Price')
-            latest_price = btc_data['Close'].iloc[0]  # First row is most recent in minute data
-            latest_date = btc_data['Datetime'].iloc[0]
-            
-            caption = f'<span style="background-color: #31333F; padding: 2px 6px; border-radius: 3px;"><b>Latest data: {latest_date.strftime("%B %d, %Y %H:%M")}</b></span>'
-            if pd.notna(latest_price):
-                caption += f' | Price: ${latest_price:,.2f}'
-            st.caption(caption, unsafe_allow_html=True)
-            
-            fig_btc = go.Figure()
-            fig_btc.add_trace(go.Scatter(
-                x=btc_data['Datetime'], 
-                y=btc_data['Close'],
-                name='BTC/USD',
-                line=dict(color='#FFBA08', width=2),
-                hovertemplate='Date: %{x}<br>Price: $%{y:,.2f}<extra></extra>'
-            ))
-            fig_btc.update_layout(get_chart_layout(''))
-            st.plotly_chart(fig_btc, use_container_width=True)
-            
-            # Add explanatory text
-            st.markdown("""
-            * **Alternative Asset Class**: Cryptocurrencies represent a distinct asset class that historically has shown lower correlation with traditional investments like stocks and bonds, potentially offering portfolio diversification benefits.
-            * **Real-Time Data Pipeline**: This dashboard displays up to 7 days of minute-level BTC/USD data (maximum available from yfinance) that updates with a 2-3 minute lag, providing both real-time price monitoring and short-term historical context.
-            """)
+            live_fragment(price_section)()
 
             # Volume chart
-            st.subheader('BTC/USD Trading Volume')
-            latest_volume = btc_data['Volume'].iloc[0]
-            
-            caption = f'<span style="background-color: #31333F; padding: 2px 6px; border-radius: 3px;"><b>Latest data: {latest_date.strftime("%B %d, %Y %H:%M")}</b></span>'
-            if pd.notna(latest_volume):
-                caption += f' | Volume: {latest_volume:,.0f}'
-            st.caption(caption, unsafe_allow_html=True)
-            
-            fig_volume = go.Figure()
-            fig_volume.add_trace(go.Bar(
-                x=btc_data['Datetime'], 
-                y=btc_data['Volume'],
-                name='Volume',
-                marker_color='#FFBA08',
-                hovertemplate='Date: %{x}<br>Volume: %{y:,.0f}<extra></extra>'
-            ))
-            fig_volume.update_layout(get_chart_layout(''))
-            st.plotly_chart(fig_volume, use_container_width=True)
-            
+            live_fragment(volume_section)()
+
+            # Realized volatility, VWAP and intraday seasonality
+            live_fragment(analytics_section)()
+
             # Last 5 values table
-            st.subheader('Latest BTC/USD Data')
-            last_5_data = btc_data.head(5)[['Datetime', 'Open', 'High', 'Low', 'Close', 'Volume']]
-            # Format the columns
-            last_5_data = pd.DataFrame({
-                'Time': last_5_data['Datetime'].dt.strftime('%Y-%m-%d %H:%M'),
-                'Open': last_5_data['Open'].map('${:,.2f}'.format),
-                'High': last_5_data['High'].map('${:,.2f}'.format),
-                'Low': last_5_data['Low'].map('${:,.2f}'.format),
-                'Close': last_5_data['Close'].map('${:,.2f}'.format),
-                'Volume': last_5_data['Volume'].map('{:,.0f}'.format)
-            })
-            st.dataframe(last_5_data, use_container_width=True)
-        
+            live_fragment(latest_table_section)()
+
     except Exception as e:
         st.error(f"Error in Crypto Markets: {str(e)}")
@@ -1,121 +1,313 @@
 import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
-from utils import load_data, get_chart_layout
+from utils import format_date, load_data, get_latest, get_chart_layout, line_trace, render_chart, forecast_traces
+
+def fedfunds_figure():
+    fedfunds_query = """
+    SELECT date, FEDFUNDS
+    FROM derived_fedfunds
+    ORDER BY date
+    """
+    fedfunds = load_data(fedfunds_query, sources=['derived_fedfunds'])
+
+    fig_fedfunds = go.Figure()
+    fig_fedfunds.add_trace(line_trace(
+        x=fedfunds.index,
+        y=fedfunds['FEDFUNDS'],
+        name='Federal Funds Rate',
+        line=dict(color='#FFBA08', width=2),
+        hovertemplate='Date: %{x}<br>Rate: %{y:.1%}<extra></extra>'
+    ))
+    for trace in forecast_traces('fedfunds', 'Rate', '#FFBA08', '.1%'):
+        fig_fedfunds.add_trace(trace)
+    layout = get_chart_layout('')
+    layout.update(yaxis=dict(tickformat='.1%'))
+    fig_fedfunds.update_layout(layout)
+    return fig_fedfunds
+
+def treasury_figure():
+    yields_1y_query = """
+    SELECT date, DGS1
+    FROM derived_dgs1
+    ORDER BY date
+    """
+    yields_5y_query = """
+    SELECT date, DGS5
+    FROM derived_dgs5
+    ORDER BY date
+    """
+    yields_10y_query = """
+    SELECT date, DGS10
+    FROM derived_dgs10
+    ORDER BY date
+    """
+    yields_1y = load_data(yields_1y_query, sources=['derived_dgs1'])
+    yields_5y = load_data(yields_5y_query, sources=['derived_dgs5'])
+    yields_10y = load_data(yields_10y_query, sources=['derived_dgs10'])
+
+    fig_treasury = go.Figure()
+    fig_treasury.add_trace(line_trace(
+        x=yields_1y.index,
+        y=yields_1y['DGS1'],
+        name='1-Year',
+        line=dict(color='#FFBA08', width=2),
+        hovertemplate='Date: %{x}<br>1Y Yield: %{y:.1%}<extra></extra>'
+    ))
+    fig_treasury.add_trace(line_trace(
+        x=yields_5y.index,
+        y=yields_5y['DGS5'],
+        name='5-Year',
+        line=dict(color='#00FFF0', width=2),
+        hovertemplate='Date: %{x}<br>5Y Yield: %{y:.1%}<extra></extra>'
+    ))
+    fig_treasury.add_trace(line_trace(
+        x=yields_10y.index,
+        y=yields_10y['DGS10'],
+        name='10-Year',
+        line=dict(color='#FF00FF', width=2),
+        hovertemplate='Date: %{x}<br>10Y Yield: %{y:.1%}<extra></extra>'
+    ))
+    for trace in forecast_traces('dgs1', '1Y Yield', '#FFBA08', '.1%'):
+        fig_treasury.add_trace(trace)
+    for trace in forecast_traces('dgs5', '5Y Yield', '#00FFF0', '.1%'):
+        fig_treasury.add_trace(trace)
+    for trace in forecast_traces('dgs10', '10Y Yield', '#FF00FF', '.1%'):
+        fig_treasury.add_trace(trace)
+    layout = get_chart_layout('')
+    layout.update(yaxis=dict(tickformat='.1%'))
+    fig_treasury.update_layout(layout)
+    return fig_treasury
+
+def spreads_figure():
+    spreads_query = """
+    SELECT date, spread_10y1y, spread_10y5y
+    FROM derived_yield_spreads
+    ORDER BY date
+    """
+    inversions_query = """
+    SELECT date, "end", trading_days
+    FROM derived_yield_inversions
+    ORDER BY date
+    """
+    spreads = load_data(spreads_query, sources=['derived_yield_spreads'])
+    inversions = load_data(inversions_query, sources=['derived_yield_inversions'])
+
+    fig_spreads = go.Figure()
+    fig_spreads.add_trace(line_trace(
+        x=spreads.index,
+        y=spreads['spread_10y1y'],
+        name='10Y - 1Y',
+        line=dict(color='#FFBA08', width=2),
+        hovertemplate='Date: %{x}<br>10Y-1Y: %{y:.2%}<extra></extra>'
+    ))
+    fig_spreads.add_trace(line_trace(
+        x=spreads.index,
+        y=spreads['spread_10y5y'],
+        name='10Y - 5Y',
+        line=dict(color='#00FFF0', width=1),
+        hovertemplate='Date: %{x}<br>10Y-5Y: %{y:.2%}<extra></extra>'
+    ))
+    fig_spreads.add_hline(y=0, line=dict(color='#666666', width=1, dash='dash'))
+    # Shade the 10Y-1Y inversion episodes
+    for start, end in zip(inversions.index, pd.to_datetime(inversions['end'])):
+        fig_spreads.add_vrect(x0=start, x1=end, fillcolor='#FF4B4B', opacity=0.2, line_width=0, layer='below')
+    layout = get_chart_layout('')
+    layout.update(yaxis=dict(tickformat='.1%'))
+    fig_spreads.update_layout(layout)
+    return fig_spreads
+
+# Past curves drawn next to the latest one
+CURVE_SNAPSHOTS = {
+    '1 month ago': pd.DateOffset(months=1),
+    '1 year ago': pd.DateOffset(years=1),
+    '5 years ago': pd.DateOffset(years=5),
+}
+
+def curve_figure():
+    curve_query = """
+    SELECT *
+    FROM derived_yield_curve
+    ORDER BY date
+    """
+    curves = load_data(curve_query, sources=['derived_yield_curve'])
+    maturities = [int(column[1:]) for column in curves.columns]
+    latest_date = curves.index[-1]
+
+    fig_curve = go.Figure()
+    colors = ['#666666', '#FF00FF', '#00FFF0']
+    for (label, offset), color in zip(reversed(CURVE_SNAPSHOTS.items()), colors):
+        # Latest quoted curve on or before the snapshot date
+        position = curves.index.searchsorted(latest_date - offset, side='right') - 1
+        if position < 0:
+            continue
+        fig_curve.add_trace(go.Scatter(
+            x=maturities,
+            y=curves.iloc[position],
+            name=f'{label} ({curves.index[position]:%b %d, %Y})',
+            line=dict(color=color, width=1, dash='dash'),
+            hovertemplate='%{x}Y: %{y:.2%}<extra></extra>'
+        ))
+    fig_curve.add_trace(go.Scatter(
+        x=maturities,
+        y=curves.iloc[-1],
+        name=f'Latest ({latest_date:%b %d, %Y})',
+        line=dict(color='#FFBA08', width=3),
+        hovertemplate='%{x}Y: %{y:.2%}<extra></extra>'
+    ))
+    layout = get_chart_layout('')
+    layout.update(
+        showlegend=True,
+        xaxis=dict(title='Maturity (years)', dtick=1),
+        yaxis=dict(tickformat='.1%')
+    )
+    fig_curve.update_layout(layout)
+    return fig_curve
+
+def curve_shape_figure():
+    shape_query = """
+    SELECT date, slope, curvature
+    FROM derived_yield_spreads
+    ORDER BY date
+    """
+    shape = load_data(shape_query, sources=['derived_yield_spreads'])
+
+    fig_shape = go.Figure()
+    fig_shape.add_trace(line_trace(
+        x=shape.index,
+        y=shape['slope'],
+        name='Slope (per year)',
+        line=dict(color='#FFBA08', width=2),
+        hovertemplate='Date: %{x}<br>Slope: %{y:.3%}<extra></extra>'
+    ))
+    fig_shape.add_trace(line_trace(
+        x=shape.index,
+        y=shape['curvature'],
+        name='Curvature (2x5Y - 1Y - 10Y)',
+        line=dict(color='#FF00FF', width=1),
+        yaxis='y2',
+        hovertemplate='Date: %{x}<br>Curvature: %{y:.2%}<extra></extra>'
+    ))
+    layout = get_chart_layout('')
+    layout.update(
+        showlegend=True,
+        yaxis=dict(tickformat='.2%', title='Slope'),
+        yaxis2=dict(tickformat='.1%', title='Curvature', overlaying='y', side='right', showgrid=False)
+    )
+    fig_shape.update_layout(layout)
+    return fig_shape
+
+# Chart builders by id, with the tables each one reads
+CHARTS = {
+    'fedfunds': (fedfunds_figure, ['derived_fedfunds', 'forecasts']),
+    'treasury': (treasury_figure, ['derived_dgs1', 'derived_dgs5', 'derived_dgs10', 'forecasts']),
+    'spreads': (spreads_figure, ['derived_yield_spreads', 'derived_yield_inversions']),
+    'curve': (curve_figure, ['derived_yield_curve']),
+    'curve_shape': (curve_shape_figure, ['derived_yield_spreads']),
+}
+
+@st.fragment
+def fedfunds_section(latest):
+    st.subheader('Federal Funds Rate')
+    latest_rate = latest['fedfunds'].get('FEDFUNDS')
+    latest_date = latest['fedfunds']['date']
+
+    caption = f'<span style="background-color: #31333F; padding: 2px 6px; border-radius: 3px;"><b>Latest data: {format_date(latest_date, "%B %Y")}</b></span>'
+    if pd.notna(latest_rate):
+        caption += f' | Rate: {latest_rate:.1%}'
+    st.caption(caption, unsafe_allow_html=True)
+    render_chart('interest_rates.fedfunds', *CHARTS['fedfunds'])
+
+    # Add Fed Funds Rate commentary
+    st.markdown("""
+    * **Policy Rate**: The Federal Funds Rate is the key interest rate that banks charge each other for overnight loans, serving as a benchmark for other interest rates in the economy.
+    * **Economic Impact**: When the Fed raises rates, it aims to control inflation by making borrowing more expensive, which can slow economic growth and spending.
+    * **Market Effect**: Rate changes affect various markets - higher rates typically strengthen the dollar and can pressure stock valuations, especially for growth companies.
+    * **Retail Investor**: When rates are rising, consider increasing allocation to financial sector stocks and short-duration bonds. During rate cuts, growth stocks and longer-duration bonds often perform better.
+    """)
+
+@st.fragment
+def treasury_section(latest):
+    st.subheader('Treasury Yields')
+    latest_date = latest['dgs10']['date']
+    latest_1y = latest['dgs1'].get('DGS1')
+    latest_5y = latest['dgs5'].get('DGS5')
+    latest_10y = latest['dgs10'].get('DGS10')
+
+    caption = f'<span style="background-color: #31333F; padding: 2px 6px; border-radius: 3px;"><b>Latest data: {format_date(latest_date, "%B %d, %Y")}</b></span>'
+    if pd.notna(latest_1y):
+        caption += f' | 1Y: {latest_1y:.1%}'
+    if pd.notna(latest_5y):
+        caption += f' | 5Y: {latest_5y:.1%}'
+    if pd.notna(latest_10y):
+        caption += f' | 10Y: {latest_10y:.1%}'
+    st.caption(caption, unsafe_allow_html=True)
+    render_chart('interest_rates.treasury', *CHARTS['treasury'])
+
+    # Add Treasury Yields commentary
+    st.markdown("""
+    * **Yield Curve**: Treasury yields show interest rates at different maturities. Normally, longer-term yields are higher than shorter-term ones, reflecting greater uncertainty over longer periods.
+    * **Economic Signal**: When short-term yields exceed long-term yields (curve inversion), it often signals economic concerns and has historically preceded recessions.
+    * **Bond Prices**: Remember that bond prices move inversely to yields - when yields rise, existing bond prices fall, and vice versa.
+    * **Retail Investor**: Consider building a "ladder" of bonds with different maturities to manage interest rate risk. During yield curve inversion, it might be prudent to increase cash reserves and focus on high-quality, shorter-duration bonds.
+    """)
+
+@st.fragment
+def yield_curve_section(latest):
+    st.subheader('Yield Curve Spreads')
+    latest_date = latest['yield_curve']['date']
+    latest_spread = latest['yield_curve'].get('spread_10y1y')
+    latest_spread_5y = latest['yield_curve'].get('spread_10y5y')
+
+    caption = f'<span style="background-color: #31333F; padding: 2px 6px; border-radius: 3px;"><b>Latest data: {format_date(latest_date, "%B %d, %Y")}</b></span>'
+    if pd.notna(latest_spread):
+        caption += f' | 10Y-1Y: {latest_spread:.2%}'
+    if pd.notna(latest_spread_5y):
+        caption += f' | 10Y-5Y: {latest_spread_5y:.2%}'
+    st.caption(caption, unsafe_allow_html=True)
+    render_chart('interest_rates.spreads', *CHARTS['spreads'])
+
+    st.markdown("""
+    * **Spreads**: The 10Y-1Y and 10Y-5Y spreads measure how much more long-term bonds yield than shorter ones. Shaded periods mark 10Y-1Y inversions, when the spread was below zero.
+    * **Recession Signal**: Long inversions have preceded most U.S. recessions; brief dips below zero are less meaningful than episodes lasting months.
+    """)
+
+    st.subheader('Yield Curve')
+    render_chart('interest_rates.curve', *CHARTS['curve'])
+    st.markdown("""
+    * **Curve Shape**: The curve is interpolated linearly between the 1, 5 and 10-year yields. Comparing it with past curves shows whether the curve has steepened, flattened or inverted.
+    """)
+
+    st.subheader('Yield Curve Slope and Curvature')
+    caption = ''
+    if pd.notna(latest['yield_curve'].get('slope')):
+        caption += f'Slope: {latest["yield_curve"]["slope"]:.3%} per year'
+    if pd.notna(latest['yield_curve'].get('curvature')):
+        caption += f' | Curvature: {latest["yield_curve"]["curvature"]:.2%}'
+    st.caption(caption)
+    render_chart('interest_rates.curve_shape', *CHARTS['curve_shape'])
+    st.markdown("""
+    * **Slope**: The least-squares slope of yield against maturity; negative means an inverted curve.
+    * **Curvature**: Twice the 5-year yield minus the 1 and 10-year yields. Positive values mean a humped curve, with the middle maturities above both ends.
+    """)
 
 def show():
     st.header('Interest Rates')
-    
+
     try:
+        latest = get_latest('fedfunds', 'dgs1', 'dgs5', 'dgs10', 'yield_curve')
+
         # Fed Funds Rate
-        fedfunds_query = """
-        SELECT date, FEDFUNDS/100 as FEDFUNDS
-        FROM fedfunds
-        ORDER BY date
-        """
-        fedfunds = load_data(fedfunds_query)
-        
-        if not fedfunds.empty and fedfunds['FEDFUNDS'].notna().any():
-            st.subheader('Federal Funds Rate')
-            latest_rate = fedfunds['FEDFUNDS'].iloc[-1]
-            latest_date = fedfunds.index[-1]
-            
-            caption = f'<span style="background-color: #31333F; padding: 2px 6px; border-radius: 3px;"><b>Latest data: {latest_date.strftime("%B %Y")}</b></span>'
-            if pd.notna(latest_rate):
-                caption += f' | Rate: {latest_rate:.1%}'
-            st.caption(caption, unsafe_allow_html=True)
-            
-            fig_fedfunds = go.Figure()
-            fig_fedfunds.add_trace(go.Scatter(
-                x=fedfunds.index, 
-                y=fedfunds['FEDFUNDS'],
-                name='Federal Funds Rate',
-                line=dict(color='#FFBA08', width=2),
-                hovertemplate='Date: %{x}<br>Rate: %{y:.1%}<extra></extra>'
-            ))
-            layout = get_chart_layout('')
-            layout.update(yaxis=dict(tickformat='.1%'))
-            fig_fedfunds.update_layout(layout)
-            st.plotly_chart(fig_fedfunds, use_container_width=True)
-
-            # Add Fed Funds Rate commentary
-            st.markdown("""
-            * **Policy Rate**: The Federal Funds Rate is the key interest rate that banks charge each other for overnight loans, serving as a benchmark for other interest rates in the economy.
-            * **Economic Impact**: When the Fed raises rates, it aims to control inflation by making borrowing more expensive, which can slow economic growth and spending.
-            * **Market Effect**: Rate changes affect various markets - higher rates typically strengthen the dollar and can pressure stock valuations, especially for growth companies.
-            * **Retail Investor**: When rates are rising, consider increasing allocation to financial sector stocks and short-duration bonds. During rate cuts, growth stocks and longer-duration bonds often perform better.
-            """)
+        if pd.notna(latest['fedfunds'].get('FEDFUNDS')):
+            fedfunds_section(latest)
 
         # Treasury Yields
-        yields_1y_query = """
-        SELECT date, DGS1/100 as DGS1
-        FROM dgs1
-        ORDER BY date
-        """
-        yields_5y_query = """
-        SELECT date, DGS5/100 as DGS5
-        FROM dgs5
-        ORDER BY date
-        """
-        yields_10y_query = """
-        SELECT date, DGS10/100 as DGS10
-        FROM dgs10
-        ORDER BY date
-        """
-        yields_1y = load_data(yields_1y_query)
-        yields_5y = load_data(yields_5y_query)
-        yields_10y = load_data(yields_10y_query)
-        
-        if not yields_10y.empty and yields_10y['DGS10'].notna().any():
-            st.subheader('Treasury Yields')
-            latest_date = yields_10y.index[-1]
-            latest_1y = yields_1y['DGS1'].iloc[-1] if not yields_1y.empty else None
-            latest_5y = yields_5y['DGS5'].iloc[-1] if not yields_5y.empty else None
-            latest_10y = yields_10y['DGS10'].iloc[-1]
-            
-            caption = f'<span style="background-color: #31333F; padding: 2px 6px; border-radius: 3px;"><b>Latest data: {latest_date.strftime("%B %d, %Y")}</b></span>'
-            if pd.notna(latest_1y):
-                caption += f' | 1Y: {latest_1y:.1%}'
-            if pd.notna(latest_5y):
-                caption += f' | 5Y: {latest_5y:.1%}'
-            if pd.notna(latest_10y):
-                caption += f' | 10Y: {latest_10y:.1%}'
-            st.caption(caption, unsafe_allow_html=True)
-            
-            fig_treasury = go.Figure()
-            fig_treasury.add_trace(go.Scatter(
-                x=yields_1y.index, 
-                y=yields_1y['DGS1'],
-                name='1-Year',
-                line=dict(color='#FFBA08', width=2),
-                hovertemplate='Date: %{x}<br>1Y Yield: %{y:.1%}<extra></extra>'
-            ))
-            fig_treasury.add_trace(go.Scatter(
-                x=yields_5y.index, 
-                y=yields_5y['DGS5'],
-                name='5-Year',
-                line=dict(color='#00FFF0', width=2),
-                hovertemplate='Date: %{x}<br>5Y Yield: %{y:.1%}<extra></extra>'
-            ))
-            fig_treasury.add_trace(go.Scatter(
-                x=yields_10y.index, 
-                y=yields_10y['DGS10'],
-                name='10-Year',
-                line=dict(color='#FF00FF', width=2),
-                hovertemplate='Date: %{x}<br>10Y Yield: %{y:.1%}<extra></extra>'
-            ))
-            layout = get_chart_layout('')
-            layout.update(yaxis=dict(tickformat='.1%'))
-            fig_treasury.update_layout(layout)
-            st.plotly_chart(fig_treasury, use_container_width=True)
-
-            # Add Treasury Yields commentary
-            st.markdown("""
-            * **Yield Curve**: Treasury yields show interest rates at different maturities. Normally, longer-term yields are higher than shorter-term ones, reflecting greater uncertainty over longer periods.
-            * **Economic Signal**: When short-term yields exceed long-term yields (curve inversion), it often signals economic concerns and has historically preceded recessions.
-            * **Bond Prices**: Remember that bond prices move inversely to yields - when yields rise, existing bond prices fall, and vice versa.
-            * **Retail Investor**: Consider building a "ladder" of bonds with different maturities to manage interest rate risk. During yield curve inversion, it might be prudent to increase cash reserves and focus on high-quality, shorter-duration bonds.
-            """)
+        if pd.notna(latest['dgs10'].get('DGS10')):
+            treasury_section(latest)
+
+        # Yield curve analytics
+        if pd.notna(latest['yield_curve'].get('spread_10y1y')):
+            yield_curve_section(latest)
 
     except Exception as e:
         st.error(f"Error in Interest Rates: {str(e)}")
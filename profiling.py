@@ -0,0 +1,97 @@
+import os
+import json
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime
+
+# Local trace log for offline analysis, one JSON record per line
+PROFILE_LOG = os.environ.get('DASHBOARD_PROFILE_LOG', 'data/profile_log.jsonl')
+
+# app.py imports this module first, so this marks the first script run of the process
+PROCESS_STARTED_AT = time.perf_counter()
+
+# Set to 1 to offer per-rerun stage timings in a sidebar debug panel
+PROFILE_PANEL = os.environ.get('DASHBOARD_PROFILE', '0') == '1'
+
+_lock = threading.Lock()
+_first_chart_recorded = False
+
+def enabled():
+    """Whether profiling is on for this process (DASHBOARD_PROFILE=1); nothing is logged otherwise."""
+    return PROFILE_PANEL
+
+def append_trace(record):
+    record = dict(record, at=datetime.now().isoformat(timespec='milliseconds'), pid=os.getpid())
+    try:
+        with _lock, open(PROFILE_LOG, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+    except OSError:
+        pass
+
+def record_startup(event, seconds):
+    if not enabled():
+        return
+    append_trace({'kind': 'startup', 'event': event, 'ms': round(seconds * 1000, 2)})
+
+def record_first_chart():
+    """Log the time from process start to the first chart sent, once per process."""
+    global _first_chart_recorded
+    if not enabled():
+        return
+    with _lock:
+        if _first_chart_recorded:
+            return
+        _first_chart_recorded = True
+    record_startup('time_to_first_chart', time.perf_counter() - PROCESS_STARTED_AT)
+
+# Stage timings of the script run being profiled, the chart they belong to and
+# how deep the current stage is nested; unset when profiling is off
+_run = contextvars.ContextVar('profile_run', default=None)
+_chart = contextvars.ContextVar('profile_chart', default=None)
+_depth = contextvars.ContextVar('profile_depth', default=0)
+
+def start_run():
+    """Collect stage timings for the current script run and return the list they go to."""
+    records = []
+    _run.set(records)
+    return records
+
+def stop_run():
+    _run.set(None)
+
+@contextmanager
+def chart(chart_id):
+    """Attribute the stages timed inside the block to chart_id."""
+    token = _chart.set(chart_id)
+    try:
+        yield
+    finally:
+        _chart.reset(token)
+
+@contextmanager
+def stage(name, **info):
+    """
+    Time a stage of the current chart. Yields the record so the caller can add
+    details such as cache='hit', rows or bytes. Stages inside other stages are
+    recorded with their nesting depth; a no-op unless the run is profiled.
+    """
+    records = _run.get()
+    if records is None:
+        yield {}
+        return
+    record = dict(chart=_chart.get(), stage=name, depth=_depth.get(), **info)
+    records.append(record)
+    token = _depth.set(record['depth'] + 1)
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record['ms'] = round((time.perf_counter() - start) * 1000, 2)
+        _depth.reset(token)
+
+def record_render(view, records):
+    """Append a profiled run to the trace log; total is the sum of top-level stages."""
+    total = sum(r['ms'] for r in records if r['depth'] == 0)
+    append_trace({'kind': 'render', 'view': view, 'ms': round(total, 2), 'stages': records})
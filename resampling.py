@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+import profiling
+from utils import load_data, get_data_version, get_frame_cache
+
+# Stored series by name: (table, column, native frequency, default aggregation).
+# Rates and CPI/GDP growth are fractions, as the pages show them.
+SERIES = {
+    'sp500': ('sp500', 'SP500', 'B', 'last'),
+    'vix': ('vixcls', 'VIXCLS', 'B', 'last'),
+    'dgs1': ('derived_dgs1', 'DGS1', 'B', 'last'),
+    'dgs5': ('derived_dgs5', 'DGS5', 'B', 'last'),
+    'dgs10': ('derived_dgs10', 'DGS10', 'B', 'last'),
+    'dollar_index': ('dtwexbgs', 'DTWEXBGS', 'B', 'last'),
+    'eurusd': ('dexuseu', 'DEXUSEU', 'B', 'last'),
+    'btc': ('btc_minute', 'Close', 'min', 'last'),
+    'fedfunds': ('derived_fedfunds', 'FEDFUNDS', 'M', 'ffill'),
+    'unrate': ('derived_unrate', 'UNRATE', 'M', 'ffill'),
+    'cpi_core': ('cpilfesl', 'cpi_core_yoy', 'M', 'ffill'),
+    'cpi_all': ('cpiaucsl', 'cpi_all_yoy', 'M', 'ffill'),
+    'ireland_cpi': ('ireland_cpi', 'cpi_ireland_yoy', 'M', 'ffill'),
+    'euro_cpi': ('euro_cpi', 'cpi_euro_yoy', 'M', 'ffill'),
+    'saving_rate': ('derived_saving_rate', 'saving_rate', 'M', 'ffill'),
+    'gdp_real': ('gdpc1', 'gdpc1_us_yoy', 'Q', 'ffill'),
+    'gdp_potential': ('gdppot', 'gdppot_us_yoy', 'Q', 'ffill'),
+    'federal_debt': ('gfdegdq188s', 'GFDEGDQ188S', 'Q', 'ffill'),
+}
+
+# Tables whose date column is not called date
+DATE_COLUMNS = {'btc_minute': 'Datetime'}
+
+# Target frequencies of an aligned panel
+FREQUENCIES = {
+    'B': 'Business day',
+    'W': 'Weekly',
+    'M': 'Monthly',
+    'Q': 'Quarterly',
+}
+
+# How observations inside a period become one value; 'ffill' is the latest
+# observation as of the end of the period, carried over periods without one
+AGGREGATIONS = ('last', 'mean', 'sum', 'ffill')
+
+def load_series(name):
+    """One stored series by SERIES name, indexed by date."""
+    table, column, _, _ = SERIES[name]
+    date_column = DATE_COLUMNS.get(table, 'date')
+    query = f"""
+    SELECT {date_column} AS date, {column}
+    FROM {table}
+    ORDER BY {date_column}
+    """
+    return load_data(query, sources=[table])[column]
+
+def period_ends(start, end, freq):
+    """Last instant of every period of freq from the one holding start to the one holding end."""
+    labels = pd.date_range(start.normalize(), end.normalize() + to_offset(freq), freq=freq)
+    labels = labels[:labels.searchsorted(end.normalize()) + 1]
+    return labels + pd.Timedelta(days=1) - pd.Timedelta(1, 'ns')
+
+def resample_series(series, ends, how='last'):
+    """
+    series on the periods ending at `ends`. Every observation falls in the first
+    period ending at or after it, so e.g. weekend BTC prices count towards
+    Monday; 'ffill' takes the latest observation at or before each period end.
+    """
+    if how not in AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation: {how}. Choose from {AGGREGATIONS}")
+    series = series.dropna()
+    dates = series.index.values
+    values = series.to_numpy(dtype='float64')
+
+    if how == 'ffill':
+        positions = np.searchsorted(dates, ends.values, side='right') - 1
+        result = np.where(positions >= 0, values[positions.clip(0)], np.nan) if len(values) else np.full(len(ends), np.nan)
+    else:
+        codes = np.searchsorted(ends.values, dates, side='left')
+        inside = codes < len(ends)
+        grouped = pd.Series(values[inside]).groupby(codes[inside]).agg(how)
+        result = grouped.reindex(np.arange(len(ends))).to_numpy()
+    return pd.Series(result, index=ends.normalize(), name=series.name)
+
+def align(names, freq='M', how=None):
+    """
+    The named series on one common frequency, as a date-indexed frame with a
+    column per series, from the earliest to the latest observation of any of
+    them. how is an aggregation for all series or a {name: aggregation} dict;
+    series not given one use their SERIES default. Panels are kept in the
+    shared frame cache until one of their tables gets a new data version.
+    """
+    if freq not in FREQUENCIES:
+        raise ValueError(f"Unknown frequency: {freq}. Choose from {list(FREQUENCIES)}")
+    names = list(names)
+    hows = how if isinstance(how, dict) else {name: how for name in names}
+    hows = {name: hows.get(name) or SERIES[name][3] for name in names}
+
+    tables = sorted({SERIES[name][0] for name in names})
+    key = ('panel', tuple(names), freq, tuple(hows.values()), get_data_version(*tables))
+    cache = get_frame_cache()
+    with profiling.stage('align', series=len(names), freq=freq) as record:
+        panel = cache.get(key)
+        record['cache'] = 'miss' if panel is None else 'hit'
+        if panel is None:
+            series = {name: load_series(name) for name in names}
+            observed = [s.index for s in series.values() if len(s)]
+            ends = period_ends(min(i[0] for i in observed), max(i[-1] for i in observed), freq)
+            panel = pd.DataFrame({name: resample_series(series[name], ends, hows[name]) for name in names})
+            panel.index.name = 'date'
+            cache.put(key, panel)
+        record['rows'] = len(panel)
+    return panel.copy(deep=False)
+
+def comoments(values, window=None, min_periods=2):
+    """
+    Pairwise correlation and beta of every column of values (a T x N array of
+    returns, NaN where missing) against every other, from running sums of the
+    jointly observed pairs. With window, corr[t, i, j] covers the `window` rows
+    ending at t, for all t in one pass over cumulative sums; without, the full
+    sample gives one N x N matrix. beta[..., i, j] is the slope of i on j.
+    Pairs with fewer than min_periods joint observations are NaN.
+    """
+    valid = ~np.isnan(values)
+    x = np.where(valid, values, 0.0)
+    both = (valid[:, :, None] & valid[:, None, :]).astype('float64')
+    xi = x[:, :, None] * both
+    xj = x[:, None, :] * both
+
+    def totals(a):
+        if window is None:
+            return a.sum(axis=0)
+        sums = np.cumsum(a, axis=0)
+        sums[window:] = sums[window:] - sums[:-window].copy()
+        return sums
+
+    n, sum_i, sum_j = totals(both), totals(xi), totals(xj)
+    cov = n * totals(xi * xj) - sum_i * sum_j
+    var_i = n * totals(xi * xi) - sum_i ** 2
+    var_j = n * totals(xj * xj) - sum_j ** 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = np.where(n >= min_periods, cov / np.sqrt(var_i * var_j), np.nan)
+        beta = np.where(n >= min_periods, cov / var_j, np.nan)
+    return corr, beta
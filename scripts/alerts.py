@@ -0,0 +1,265 @@
+import json
+import math
+import argparse
+from collections import deque
+
+import pandas as pd
+from sqlalchemy import text
+
+from derived_metrics import engine, bump_data_versions
+
+# Alert rules by id. Each rule watches stored columns of one table and fires on
+# the observation where its condition becomes true, then not again until the
+# condition has been false (a month of VIX above 30 is one alert):
+#   threshold:   column crosses above or below a level
+#   crossover:   column crosses above or below another column, e.g. a moving average
+#   rise:        column rises `rise` above its low of the previous `window` observations
+#   sign_change: column changes sign, in either direction
+#   move:        column moves by at least `move` (a fraction) within `minutes` minutes
+# Threshold, crossover and sign rules re-arm only once the value is back more
+# than `band` on the other side (for crossovers, as a fraction of the reference
+# column), so a series hovering around the line does not fire every day.
+# Messages are formatted with the observation's value, change and direction.
+RULES = {
+    'vix_above_30': dict(
+        table='vixcls', kind='threshold', column='VIXCLS', direction='above', level=30, band=5,
+        message='VIX closed above 30 at {value:.1f}'),
+    'sp500_below_ma200': dict(
+        table='sp500', kind='crossover', column='SP500', reference='sp500_ma200', direction='below', band=0.02,
+        message='S&P 500 closed below its 200-day moving average at {value:,.0f}'),
+    'sp500_above_ma200': dict(
+        table='sp500', kind='crossover', column='SP500', reference='sp500_ma200', direction='above', band=0.02,
+        message='S&P 500 closed above its 200-day moving average at {value:,.0f}'),
+    'sp500_death_cross': dict(
+        table='sp500', kind='crossover', column='sp500_ma50', reference='sp500_ma200', direction='below',
+        message='S&P 500 50-day moving average crossed below the 200-day'),
+    'sp500_golden_cross': dict(
+        table='sp500', kind='crossover', column='sp500_ma50', reference='sp500_ma200', direction='above',
+        message='S&P 500 50-day moving average crossed above the 200-day'),
+    # The Sahm rule: 3-month average unemployment 0.5 points above its low of the previous 12 months
+    'unemployment_turning_up': dict(
+        table='unrate', kind='rise', column='unrate_ma3', window=12, rise=0.5,
+        message='Unemployment turning up: 3-month average of {value:.1f}% is {change:.1f} points above its 12-month low'),
+    'yield_curve_sign': dict(
+        table='derived_yield_spreads', kind='sign_change', column='spread_10y1y', band=0.001,
+        message='10Y-1Y Treasury spread turned {direction} at {value:.2%}'),
+    'btc_move_15m': dict(
+        table='btc_minute', kind='move', column='Close', minutes=15, move=0.02,
+        message='BTC moved {change:+.1%} in 15 minutes to ${value:,.0f}'),
+    'btc_move_1h': dict(
+        table='btc_minute', kind='move', column='Close', minutes=60, move=0.03,
+        message='BTC moved {change:+.1%} in an hour to ${value:,.0f}'),
+}
+
+DATE_COLUMNS = {'btc_minute': 'Datetime'}
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+class AlertRule:
+    """
+    A rule with the state it needs to judge the next observation: whether its
+    condition held on the last one (None before the first, which never fires)
+    and, for 'rise' and 'move', the recent values it compares against.
+    """
+    def __init__(self, spec, last_date=None, active=None, recent=()):
+        self.spec = spec
+        self.last_date = last_date
+        self.active = active
+        length = spec['window'] if spec['kind'] == 'rise' else None
+        self.recent = deque(recent, maxlen=length)
+
+    @property
+    def columns(self):
+        return [self.spec['column']] + ([self.spec['reference']] if 'reference' in self.spec else [])
+
+    def condition(self, date, values):
+        """(condition, change) for one observation, or None if it cannot be judged."""
+        spec = self.spec
+        value = values[0]
+        if any(math.isnan(x) for x in values):
+            return None
+        kind = spec['kind']
+        if kind in ('threshold', 'crossover', 'sign_change'):
+            # Signed distance past the line, positive on the side the condition holds
+            if kind == 'threshold':
+                distance = value - spec['level']
+            elif kind == 'crossover':
+                distance = value / values[1] - 1
+            else:
+                distance = -value
+            if kind != 'sign_change' and spec['direction'] == 'below':
+                distance = -distance
+            if distance > 0:
+                return True, distance
+            if distance < -spec.get('band', 0):
+                return False, distance
+            # Inside the band the condition keeps its previous state
+            return (self.active, distance) if self.active is not None else None
+        if kind == 'rise':
+            low = min(self.recent) if len(self.recent) == self.recent.maxlen else None
+            self.recent.append(value)
+            if low is None:
+                return None
+            return value - low >= spec['rise'], value - low
+        # 'move': compare with the earliest observation within the last `minutes`
+        now = date.timestamp()
+        while self.recent and self.recent[0][0] < now - spec['minutes'] * 60:
+            self.recent.popleft()
+        reference = self.recent[0][1] if self.recent else None
+        self.recent.append((now, value))
+        if reference is None:
+            return None
+        change = value / reference - 1
+        return abs(change) >= spec['move'], change
+
+    def push(self, date, values):
+        """Judge one observation; returns the alert's message if the rule fires on it."""
+        self.last_date = date
+        judged = self.condition(date, values)
+        if judged is None:
+            return None
+        condition, change = bool(judged[0]), judged[1]
+        previous, self.active = self.active, condition
+        if previous is None or condition == previous:
+            return None
+        if not condition and self.spec['kind'] != 'sign_change':
+            return None
+        direction = 'negative' if values[0] < 0 else 'positive'
+        return self.spec['message'].format(value=values[0], change=change, direction=direction)
+
+    def to_dict(self):
+        return {'spec': self.spec, 'active': self.active, 'recent': list(self.recent)}
+
+    @classmethod
+    def from_dict(cls, state, last_date):
+        return cls(state['spec'], last_date, state['active'], [tuple(x) if isinstance(x, list) else x
+                                                              for x in state['recent']])
+
+def ensure_tables(conn):
+    conn.execute(text("""
+    CREATE TABLE IF NOT EXISTS alerts (
+        rule TEXT NOT NULL,
+        date TIMESTAMP NOT NULL,
+        value REAL,
+        message TEXT,
+        created_at TIMESTAMP,
+        PRIMARY KEY (rule, date)
+    )
+    """))
+    conn.execute(text("""
+    CREATE TABLE IF NOT EXISTS alert_state (
+        rule TEXT PRIMARY KEY,
+        last_date TIMESTAMP,
+        state TEXT
+    )
+    """))
+
+def load_rules(rule_ids):
+    """Persisted AlertRules; a rule without state, or whose definition changed, starts over."""
+    with engine.connect() as conn:
+        ensure_tables(conn)
+        conn.commit()
+        rows = conn.execute(text("SELECT rule, last_date, state FROM alert_state")).fetchall()
+    stored = {rule: (last_date, json.loads(state)) for rule, last_date, state in rows}
+
+    rules = {}
+    for rule_id in rule_ids:
+        spec = RULES[rule_id]
+        if rule_id in stored and stored[rule_id][1]['spec'] == spec:
+            last_date, state = stored[rule_id]
+            rules[rule_id] = AlertRule.from_dict(state, pd.Timestamp(last_date))
+        else:
+            rules[rule_id] = AlertRule(spec)
+    return rules
+
+def save_rules(rules):
+    rows = [dict(rule=rule_id, last_date=rule.last_date.strftime(TIMESTAMP_FORMAT), state=json.dumps(rule.to_dict()))
+            for rule_id, rule in rules.items() if rule.last_date is not None]
+    if not rows:
+        return
+    with engine.connect() as conn:
+        conn.execute(
+            text("INSERT OR REPLACE INTO alert_state (rule, last_date, state) VALUES (:rule, :last_date, :state)"),
+            rows
+        )
+        conn.commit()
+
+def new_rows(table, columns, since):
+    """Rows of table after `since` (all rows if None), indexed by date."""
+    date_column = DATE_COLUMNS.get(table, 'date')
+    query = f"SELECT {date_column}, {', '.join(columns)} FROM {table}"
+    params = {}
+    if since is not None:
+        query += f" WHERE {date_column} > :since"
+        params = dict(since=since.strftime(TIMESTAMP_FORMAT))
+    return pd.read_sql(text(query + f" ORDER BY {date_column}"), engine, params=params,
+                       parse_dates=[date_column]).set_index(date_column)
+
+def evaluate_alerts(tables=None):
+    '''
+    Evaluate the alert rules on the given tables (default: all) over the rows
+    added since each rule last ran, and record every firing in the alerts
+    table. Rule state is kept in alert_state, so a run reads only new rows;
+    the first run of a rule replays the table's history.
+    '''
+    rule_ids = [rule_id for rule_id, spec in RULES.items() if tables is None or spec['table'] in tables]
+    rules = load_rules(rule_ids)
+
+    firings = []
+    for table in dict.fromkeys(RULES[rule_id]['table'] for rule_id in rule_ids):
+        table_rules = {rule_id: rule for rule_id, rule in rules.items() if rule.spec['table'] == table}
+        starts = [rule.last_date for rule in table_rules.values()]
+        since = None if any(start is None for start in starts) else min(starts)
+        columns = list(dict.fromkeys(column for rule in table_rules.values() for column in rule.columns))
+        try:
+            rows = new_rows(table, columns, since)
+        except Exception as e:
+            print(f"Skipping alerts on {table}: {e}")
+            continue
+
+        for rule_id, rule in table_rules.items():
+            pending = rows if rule.last_date is None else rows[rows.index > rule.last_date]
+            values = [pending[column].to_numpy(dtype='float64') for column in rule.columns]
+            for date, *observation in zip(pending.index, *values):
+                message = rule.push(date, observation)
+                if message:
+                    firings.append(dict(rule=rule_id, date=date.strftime(TIMESTAMP_FORMAT),
+                                        value=float(observation[0]), message=message))
+        print(f"Alerts on {table}: {len(rows)} new rows checked")
+
+    if firings:
+        created_at = pd.Timestamp.now().strftime(TIMESTAMP_FORMAT)
+        with engine.connect() as conn:
+            conn.execute(
+                text("""
+                INSERT OR IGNORE INTO alerts (rule, date, value, message, created_at)
+                VALUES (:rule, :date, :value, :message, :created_at)
+                """),
+                [dict(firing, created_at=created_at) for firing in firings]
+            )
+            conn.commit()
+        bump_data_versions(['alerts'])
+    # Saved after the alerts: a failed run re-evaluates its rows, and the primary key drops repeats
+    save_rules(rules)
+    for firing in sorted(firings, key=lambda firing: firing['date'])[-10:]:
+        print(f"ALERT {firing['date'][:16]} {firing['message']}")
+    print(f"Alerts: {len(firings)} fired")
+
+def reset_alerts():
+    '''Forget all alerts and rule state, so the next run replays every table'''
+    with engine.connect() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS alerts"))
+        conn.execute(text("DROP TABLE IF EXISTS alert_state"))
+        conn.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description='Evaluate alert rules on newly ingested data')
+    parser.add_argument('--tables', nargs='+', help='Only evaluate rules on these tables (default: all)')
+    parser.add_argument('--reset', action='store_true', help='Drop all alerts and replay the full history')
+    args = parser.parse_args()
+    if args.reset:
+        reset_alerts()
+    evaluate_alerts(args.tables)
+
+if __name__ == '__main__':
+    main()
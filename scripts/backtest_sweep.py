@@ -0,0 +1,116 @@
+import os
+import sys
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+# Allow importing backtest when run as `python scripts/backtest_sweep.py`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from sqlalchemy import text
+from backtest import STRATEGIES, SOURCES, parameter_grid, param_label, align_inputs, run
+from derived_metrics import engine, read_table, bump_data_versions
+
+METRICS = ['total_return', 'cagr', 'volatility', 'sharpe', 'max_drawdown', 'turnover', 'exposure']
+
+# Inputs of the worker processes, set once per process instead of pickled per task
+_data = None
+
+def init_worker(data):
+    global _data
+    _data = data
+
+def run_task(task):
+    strategy, params = task
+    metrics, _ = run(strategy, params, _data)
+    return strategy, params, metrics
+
+def load_inputs():
+    sp500 = read_table('SELECT date, SP500 FROM sp500 ORDER BY date')['SP500']
+    vix = read_table('SELECT date, VIXCLS FROM vixcls ORDER BY date')['VIXCLS']
+    spread = read_table('SELECT date, spread_10y1y FROM derived_yield_spreads ORDER BY date')['spread_10y1y']
+    return align_inputs(sp500, vix, spread)
+
+def current_data_version():
+    with engine.connect() as conn:
+        rows = dict(conn.execute(
+            text(f"SELECT name, version FROM data_versions WHERE name IN ({', '.join(':s%d' % i for i in range(len(SOURCES)))})"),
+            {f's{i}': name for i, name in enumerate(SOURCES)}
+        ).fetchall())
+    return '|'.join(str(rows.get(name)) for name in SOURCES)
+
+def ensure_results_table(conn):
+    conn.execute(text(f"""
+    CREATE TABLE IF NOT EXISTS backtest_results (
+        date TIMESTAMP,
+        strategy TEXT NOT NULL,
+        label TEXT NOT NULL,
+        params TEXT NOT NULL,
+        data_version TEXT,
+        {', '.join(f'{metric} REAL' for metric in METRICS)},
+        PRIMARY KEY (strategy, params)
+    )
+    """))
+
+def sweep(strategies=None, workers=None, force=False):
+    '''
+    Backtest every parameter set of the given strategies (default: all) across a
+    process pool. Results are stored per parameter set with the data version
+    they were computed from, so a rerun only computes sets that are missing or
+    were computed from older data.
+    '''
+    strategies = strategies or list(STRATEGIES)
+    version = current_data_version()
+    with engine.connect() as conn:
+        ensure_results_table(conn)
+        conn.commit()
+        done = set() if force else {
+            (strategy, params) for strategy, params in conn.execute(
+                text("SELECT strategy, params FROM backtest_results WHERE data_version = :version"),
+                dict(version=version)
+            ).fetchall()
+        }
+
+    tasks = [
+        (strategy, params) for strategy in strategies for params in parameter_grid(strategy)
+        if (strategy, json.dumps(params, sort_keys=True)) not in done
+    ]
+    if not tasks:
+        print("All backtests are up to date")
+        return
+
+    data = load_inputs()
+    print(f"Running {len(tasks)} backtests over {len(data)} trading days...")
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(data,)) as pool:
+        results = list(pool.map(run_task, tasks))
+
+    as_of = data.index[-1].strftime('%Y-%m-%d %H:%M:%S.%f')
+    with engine.connect() as conn:
+        conn.execute(
+            text(f"""
+            INSERT OR REPLACE INTO backtest_results (date, strategy, label, params, data_version, {', '.join(METRICS)})
+            VALUES (:date, :strategy, :label, :params, :data_version, {', '.join(':' + metric for metric in METRICS)})
+            """),
+            [dict(date=as_of, strategy=strategy, label=param_label(strategy, params),
+                  params=json.dumps(params, sort_keys=True), data_version=version,
+                  **{metric: float(metrics[metric]) for metric in METRICS})
+             for strategy, params, metrics in results]
+        )
+        conn.commit()
+    bump_data_versions(['backtest_results'])
+
+    summary = pd.DataFrame([dict(label=param_label(s, p), **m) for s, p, m in results])
+    pd.set_option('display.float_format', lambda x: '%.3f' % x)
+    print(summary.sort_values('sharpe', ascending=False).head(10).to_string(index=False))
+
+def main():
+    parser = argparse.ArgumentParser(description='Sweep the parameter grids of the dashboard strategies')
+    parser.add_argument('--strategies', nargs='+', choices=list(STRATEGIES), help='Strategies to sweep (default: all)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: one per CPU)')
+    parser.add_argument('--force', action='store_true', help='Recompute results that are up to date')
+    args = parser.parse_args()
+    sweep(args.strategies, args.workers, args.force)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+# Allow importing econdata when run as `python scripts/benchmark_readers.py`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from econdata import read_frame, SQL_BACKENDS, adbc_sqlite
+
+# Long daily tables read by the dashboard pages
+TABLES = ['sp500', 'vixcls', 'dgs1', 'dgs5', 'dgs10', 'dtwexbgs', 'dexuseu']
+
+def measure(read, repeat):
+    '''Best wall time over repeat runs and peak traced memory of one run'''
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        read()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    read()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare SQL reader backends on the long daily tables')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per table and backend (default: 5)')
+    parser.add_argument('--tables', nargs='+', default=TABLES, help='Tables to read')
+    args = parser.parse_args()
+
+    if adbc_sqlite is None:
+        print("adbc_driver_sqlite is not installed; the adbc backend falls back to pandas")
+
+    results = []
+    for table in args.tables:
+        query = f"SELECT * FROM {table} ORDER BY date"
+        for backend in SQL_BACKENDS:
+            seconds, peak = measure(lambda: read_frame(query, backend), args.repeat)
+            results.append({'table': table, 'backend': backend, 'ms': seconds * 1000, 'peak_mb': peak / 2**20})
+
+    pd.set_option('display.float_format', lambda x: '%.2f' % x)
+    print(pd.DataFrame(results).to_string(index=False))
+    # Python-heap peak only: Arrow buffers are allocated outside tracemalloc
+    print("\npeak_mb is traced Python/NumPy memory; Arrow allocations are not included")
+
+if __name__ == '__main__':
+    main()
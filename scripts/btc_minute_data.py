@@ -5,6 +5,9 @@ import time
 import argparse
 from datetime import datetime, timedelta
 from sqlalchemy import create_engine, text
+from derived_metrics import update_latest_values, bump_data_versions, enable_wal
+from intraday_analytics import update_intraday
+from alerts import evaluate_alerts
 
 # Directory to save data
 DATA_DIR = 'data'
@@ -117,6 +120,18 @@ def get_btc_minute_data(reset=False):
             print("\nLatest data point:")
             print(new_df.tail(1)[['Open', 'High', 'Low', 'Close', 'Volume']])
             
+            # Keep the headline snapshot in sync with the newest bar
+            latest_bar = new_df.iloc[-1]
+            update_latest_values([
+                ('btc', column, new_df.index[-1], latest_bar[column])
+                for column in ['Close', 'Volume'] if pd.notna(latest_bar[column])
+            ])
+            bump_data_versions(['btc_minute'])
+
+            # Returns, realized volatility, VWAP and hourly totals for the new bars
+            update_intraday()
+            evaluate_alerts(['btc_minute'])
+            
             # Print total records in database
             with engine.connect() as conn:
                 result = conn.execute(text("SELECT COUNT(*) FROM btc_minute"))
@@ -174,6 +189,7 @@ def setup_database():
     with engine.connect() as conn:
         conn.execute(create_table_sql)
         conn.commit()
+    enable_wal()
 
 def main():
     parser = argparse.ArgumentParser(
@@ -6,4 +6,16 @@ echo "Starting daily data collection at $(date)" >> /var/log/cron.log 2>&1
 echo "Running FRED data retrieval..." >> /var/log/cron.log 2>&1
 python scripts/fred_data_retrieval.py >> /var/log/cron.log 2>&1
 
+echo "Refitting forecasts..." >> /var/log/cron.log 2>&1
+python scripts/forecasts.py >> /var/log/cron.log 2>&1
+
+echo "Running strategy backtests..." >> /var/log/cron.log 2>&1
+python scripts/backtest_sweep.py >> /var/log/cron.log 2>&1
+
+echo "Exporting static chart snapshot..." >> /var/log/cron.log 2>&1
+python scripts/export_snapshot.py >> /var/log/cron.log 2>&1
+
+echo "Exporting HTML chart report..." >> /var/log/cron.log 2>&1
+python scripts/export_report.py >> /var/log/cron.log 2>&1
+
 echo "Daily data collection completed at $(date)" >> /var/log/cron.log 2>&1
@@ -0,0 +1,200 @@
+import os
+import pandas as pd
+from sqlalchemy import create_engine, text
+from sqlalchemy.types import DateTime, Float
+from tqdm import tqdm
+from yield_curve import aligned_yields, curve_metrics, interpolated_curves, inversion_episodes
+
+# Directory to save data
+DATA_DIR = 'data'
+
+# Ensure data directory exists
+os.makedirs(DATA_DIR, exist_ok=True)
+
+# SQLite database path (DASHBOARD_DB_PATH points it elsewhere, as for the app)
+DB_PATH = os.environ.get('DASHBOARD_DB_PATH', os.path.join(DATA_DIR, 'economics_data.db'))
+
+# Create SQLAlchemy engine
+engine = create_engine(f'sqlite:///{DB_PATH}')
+
+# Series the pages show as rates: (source table, column), stored divided by 100
+SCALED_RATES = [
+    ('fedfunds', 'FEDFUNDS'),
+    ('dgs1', 'DGS1'),
+    ('dgs5', 'DGS5'),
+    ('dgs10', 'DGS10'),
+    ('unrate', 'UNRATE'),
+]
+
+# Headline values kept in latest_values: series -> (table, date column, columns)
+LATEST_SPECS = {
+    'gdp_real': ('gdpc1', 'date', ['gdpc1_us_yoy']),
+    'gdp_potential': ('gdppot', 'date', ['gdppot_us_yoy']),
+    'unrate': ('derived_unrate', 'date', ['UNRATE']),
+    'cpi_core': ('cpilfesl', 'date', ['cpi_core_yoy']),
+    'cpi_all': ('cpiaucsl', 'date', ['cpi_all_yoy']),
+    'ireland_cpi': ('ireland_cpi', 'date', ['cpi_ireland_yoy']),
+    'euro_cpi': ('euro_cpi', 'date', ['cpi_euro_yoy']),
+    'saving_rate': ('derived_saving_rate', 'date', ['saving_rate', 'saving_rate_yoy']),
+    'sp500': ('sp500', 'date', ['SP500', 'sp500_ma20', 'sp500_ma50', 'sp500_ma200']),
+    'vix': ('derived_vix', 'date', ['VIXCLS', 'vix_ma20', 'vix_ma50']),
+    'fedfunds': ('derived_fedfunds', 'date', ['FEDFUNDS']),
+    'dgs1': ('derived_dgs1', 'date', ['DGS1']),
+    'dgs5': ('derived_dgs5', 'date', ['DGS5']),
+    'dgs10': ('derived_dgs10', 'date', ['DGS10']),
+    'yield_curve': ('derived_yield_spreads', 'date', ['spread_10y1y', 'spread_10y5y', 'slope', 'curvature']),
+    'dollar_index': ('dtwexbgs', 'date', ['DTWEXBGS', 'dollar_index_ma20', 'dollar_index_ma50']),
+    'eurusd': ('dexuseu', 'date', ['DEXUSEU', 'eurusd_ma20', 'eurusd_ma50']),
+    'btc': ('btc_minute', 'Datetime', ['Close', 'Volume']),
+}
+
+def read_table(query):
+    return pd.read_sql(query, engine, parse_dates=['date']).set_index('date')
+
+def sp500_monthly():
+    '''Month-end S&P 500 level and year-over-year growth in percent'''
+    sp500 = read_table('SELECT date, SP500 FROM sp500 ORDER BY date')
+    monthly = pd.DataFrame({'SP500': sp500['SP500'].resample('M').last()})
+    monthly['yoy_growth'] = (monthly['SP500'] / monthly['SP500'].shift(12) - 1) * 100
+    return monthly
+
+def vix_moving_averages():
+    '''VIX with 20/50-day averages over trading days (missing values skipped)'''
+    # Imported here: rolling_stats itself uses this module's engine
+    from rolling_stats import apply_rolling
+    vix = read_table('SELECT date, VIXCLS FROM vixcls WHERE VIXCLS IS NOT NULL ORDER BY date')
+    return apply_rolling('derived_vix', vix, 'VIXCLS',
+                         {'vix_ma20': ('mean', 20), 'vix_ma50': ('mean', 50)}, min_periods=1)
+
+def saving_rate():
+    '''Personal saving rate as a fraction and its year-over-year change'''
+    psavert = read_table('SELECT date, PSAVERT FROM psavert ORDER BY date')
+    derived = pd.DataFrame({'saving_rate': psavert['PSAVERT'] / 100})
+    derived['saving_rate_yoy'] = psavert['PSAVERT'] / psavert['PSAVERT'].shift(12) - 1
+    return derived
+
+def scaled_rate(table, column):
+    '''Percent series converted to fractions for percentage axis formatting'''
+    df = read_table(f'SELECT date, {column} FROM {table} ORDER BY date')
+    return df / 100
+
+def treasury_yields():
+    '''1Y/5Y/10Y Treasury yields (fractions) on the days all three were quoted'''
+    return aligned_yields({
+        column: read_table(f'SELECT date, {column} FROM {table} ORDER BY date')[column] / 100
+        for table, column in [('dgs1', 'DGS1'), ('dgs5', 'DGS5'), ('dgs10', 'DGS10')]
+    })
+
+def yield_spreads():
+    '''Daily yield curve spreads, slope and curvature'''
+    return curve_metrics(treasury_yields())
+
+def yield_curve():
+    '''Daily yield curve interpolated to 1-10 year maturities'''
+    return interpolated_curves(treasury_yields())
+
+def yield_inversions():
+    '''Episodes of an inverted 10Y-1Y spread'''
+    return inversion_episodes(yield_spreads()['spread_10y1y'])
+
+def build_derived_tables():
+    '''Materialize derived series into indexed tables so pages only do range reads'''
+    derived = {
+        'derived_sp500_monthly': sp500_monthly,
+        'derived_vix': vix_moving_averages,
+        'derived_saving_rate': saving_rate,
+        'derived_yield_spreads': yield_spreads,
+        'derived_yield_curve': yield_curve,
+        'derived_yield_inversions': yield_inversions,
+    }
+    for table, column in SCALED_RATES:
+        derived[f'derived_{table}'] = lambda table=table, column=column: scaled_rate(table, column)
+
+    built = []
+    for name, build in tqdm(derived.items(), desc="Building derived tables"):
+        try:
+            df = build()
+        except Exception as e:
+            print(f"Error building {name}: {str(e)}")
+            continue
+        df.index.name = 'date'
+        dtype_dict = {col: DateTime if pd.api.types.is_datetime64_any_dtype(df[col]) else Float
+                      for col in df.columns}
+        dtype_dict['date'] = DateTime
+        # index=True also creates the ix_<name>_date index used for range reads
+        df.to_sql(name, engine, if_exists='replace', index=True, dtype=dtype_dict)
+        built.append(name)
+    bump_data_versions(built)
+
+def enable_wal():
+    '''Switch the database to WAL mode (persistent), so dashboard readers never block the ingestion writers'''
+    with engine.connect() as conn:
+        conn.execute(text("PRAGMA journal_mode=WAL"))
+
+def update_latest_values(rows):
+    '''Upsert (series, metric, date, value) rows into the latest_values snapshot'''
+    with engine.connect() as conn:
+        conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS latest_values (
+            series TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            date TIMESTAMP,
+            value REAL,
+            PRIMARY KEY (series, metric)
+        )
+        """))
+        conn.execute(
+            text("""
+            INSERT OR REPLACE INTO latest_values (series, metric, date, value)
+            VALUES (:series, :metric, :date, :value)
+            """),
+            [dict(series=series, metric=metric, date=pd.Timestamp(date).strftime('%Y-%m-%d %H:%M:%S.%f'),
+                  value=float(value)) for series, metric, date, value in rows]
+        )
+        conn.commit()
+
+def bump_data_versions(names):
+    '''Record that the given tables changed, so dashboard caches built from them expire'''
+    if not names:
+        return
+    version = pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S.%f')
+    with engine.connect() as conn:
+        conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS data_versions (
+            name TEXT PRIMARY KEY,
+            version TEXT
+        )
+        """))
+        conn.execute(
+            text("INSERT OR REPLACE INTO data_versions (name, version) VALUES (:name, :version)"),
+            [dict(name=name, version=version) for name in names]
+        )
+        conn.commit()
+
+def build_latest_values():
+    '''Refresh the latest non-null value of every headline metric'''
+    rows = []
+    with engine.connect() as conn:
+        for series, (table, date_column, columns) in LATEST_SPECS.items():
+            for column in columns:
+                try:
+                    latest = conn.execute(text(
+                        f'SELECT {date_column}, {column} FROM {table} '
+                        f'WHERE {column} IS NOT NULL ORDER BY {date_column} DESC LIMIT 1'
+                    )).fetchone()
+                except Exception as e:
+                    print(f"Error reading latest {series}.{column}: {str(e)}")
+                    continue
+                if latest is not None:
+                    rows.append((series, column, latest[0], latest[1]))
+    if rows:
+        update_latest_values(rows)
+        print(f"Updated {len(rows)} latest values")
+
+def main():
+    enable_wal()
+    build_derived_tables()
+    build_latest_values()
+
+if __name__ == '__main__':
+    main()
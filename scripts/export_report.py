@@ -0,0 +1,194 @@
+import os
+import sys
+import json
+import html
+import fcntl
+import argparse
+import importlib
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import plotly
+from plotly.offline import get_plotlyjs
+
+# Allow importing utils, pages and the notebook when run as `python scripts/export_report.py`
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from utils import get_data_version, get_theme_layout
+from export_snapshot import page_modules
+
+# One standalone HTML file per chart, all loading the plotly.min.js next to them
+REPORT_DIR = os.path.join('static', 'report')
+MANIFEST_PATH = os.path.join(REPORT_DIR, 'manifest.json')
+LOCK_PATH = os.path.join(REPORT_DIR, '.lock')
+PLOTLY_BUNDLE = 'plotly.min.js'
+
+# Exported next to the pages under this name
+NOTEBOOK_NAME = 'notebook'
+NOTEBOOK_MODULE = 'interactive_notebooks.data_visualization'
+
+# Page charts are styled for the app; the report is a white page
+REPORT_THEME = 'light'
+
+INDEX_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Economic Data Dashboard - Chart Report</title>
+<style>
+body {{ font-family: sans-serif; margin: 2rem; color: #31333f; }}
+li {{ margin: 0.3rem 0; }}
+.meta {{ color: #808495; font-size: 0.85rem; }}
+</style>
+</head>
+<body>
+<h1>Economic Data Dashboard - Chart Report</h1>
+<p class="meta">Generated {generated_at}</p>
+{sections}
+</body>
+</html>
+"""
+
+def chart_modules(views=None):
+    """The page modules with a CHARTS registry, then the notebook, by name."""
+    for name, module in page_modules(views):
+        yield name, module
+    if not views or NOTEBOOK_NAME in views:
+        yield NOTEBOOK_NAME, importlib.import_module(NOTEBOOK_MODULE)
+
+def build_chart(task):
+    '''Build one chart and write it as standalone HTML (run in a worker process)'''
+    chart_key, module_name, chart_id, themed = task
+    build, _ = importlib.import_module(module_name).CHARTS[chart_id]
+    fig = build()
+    if themed:
+        fig.update_layout(get_theme_layout(REPORT_THEME))
+    # 'directory' makes the page load plotly.min.js from its own folder
+    content = fig.to_html(include_plotlyjs='directory', full_html=True)
+    path = os.path.join(REPORT_DIR, f'{chart_key}.html')
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(path + '.tmp', path)
+    return chart_key, fig.layout.title.text or chart_id.replace('_', ' ').capitalize()
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'charts': {}}
+
+def write_bundle(manifest):
+    """Write the shared plotly.js once, and again whenever plotly is upgraded."""
+    path = os.path.join(REPORT_DIR, PLOTLY_BUNDLE)
+    if manifest.get('plotly_version') != plotly.__version__ or not os.path.exists(path):
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            f.write(get_plotlyjs())
+        os.replace(path + '.tmp', path)
+        manifest['plotly_version'] = plotly.__version__
+
+def write_index(manifest):
+    """index.html with a link to every exported chart, grouped by view."""
+    views = {}
+    for chart_key, entry in sorted(manifest['charts'].items()):
+        views.setdefault(entry['view'], []).append((chart_key, entry))
+    sections = []
+    for view, charts in views.items():
+        items = '\n'.join(
+            f'<li><a href="{chart_key}.html">{html.escape(entry["title"])}</a> '
+            f'<span class="meta">{html.escape(", ".join(entry["sources"]))}, {entry["generated_at"]}</span></li>'
+            for chart_key, entry in charts
+        )
+        sections.append(f'<h2>{view.replace("_", " ").title()}</h2>\n<ul>\n{items}\n</ul>')
+    content = INDEX_TEMPLATE.format(
+        generated_at=datetime.now().strftime('%B %d, %Y %H:%M'), sections='\n'.join(sections)
+    )
+    path = os.path.join(REPORT_DIR, 'index.html')
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(path + '.tmp', path)
+
+def export_report(views=None, force=False, workers=None):
+    '''
+    Export every chart of the pages and the notebook as standalone HTML across
+    a process pool. Charts whose source tables have the same data version as
+    in the previous manifest are kept as they are. A chart that fails to build
+    is reported and left out; the index and manifest are written for the rest.
+    Returns the keys of the failed charts.
+    '''
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    with open(LOCK_PATH, 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        manifest = load_manifest()
+        write_bundle(manifest)
+
+        tasks = []
+        versions = {}
+        for name, module in chart_modules(views):
+            # Charts removed from a registry are dropped from the report
+            for chart_key in [key for key, entry in manifest['charts'].items() if entry['view'] == name]:
+                if chart_key.split('.', 1)[1] not in module.CHARTS:
+                    del manifest['charts'][chart_key]
+                    if os.path.exists(os.path.join(REPORT_DIR, f'{chart_key}.html')):
+                        os.remove(os.path.join(REPORT_DIR, f'{chart_key}.html'))
+
+            stale = 0
+            for chart_id, (build, sources) in module.CHARTS.items():
+                chart_key = f'{name}.{chart_id}'
+                versions[chart_key] = (name, sources, [str(v) for v in get_data_version(*sources)])
+                previous = manifest['charts'].get(chart_key)
+                if (force or not previous or previous['data_version'] != versions[chart_key][2]
+                        or not os.path.exists(os.path.join(REPORT_DIR, f'{chart_key}.html'))):
+                    tasks.append((chart_key, module.__name__, chart_id, name != NOTEBOOK_NAME))
+                    stale += 1
+            print(f"{name}: {stale} of {len(module.CHARTS)} charts to rebuild")
+
+        failed = []
+        if tasks:
+            # Forked workers inherit the imported pages and notebook
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(build_chart, task): task[0] for task in tasks}
+                for future in as_completed(futures):
+                    try:
+                        chart_key, title = future.result()
+                    except Exception as e:
+                        chart_key = futures[future]
+                        print(f"Error exporting {chart_key}: {type(e).__name__}: {e}")
+                        failed.append(chart_key)
+                        # Dropped so the next run retries it and the index does not link a stale file
+                        manifest['charts'].pop(chart_key, None)
+                        if os.path.exists(os.path.join(REPORT_DIR, f'{chart_key}.html')):
+                            os.remove(os.path.join(REPORT_DIR, f'{chart_key}.html'))
+                        continue
+                    name, sources, data_version = versions[chart_key]
+                    manifest['charts'][chart_key] = {
+                        'view': name,
+                        'title': title,
+                        'sources': list(sources),
+                        'data_version': data_version,
+                        'generated_at': datetime.now().isoformat(timespec='seconds'),
+                    }
+
+        write_index(manifest)
+        manifest['generated_at'] = datetime.now().isoformat(timespec='seconds')
+        with open(MANIFEST_PATH + '.tmp', 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(MANIFEST_PATH + '.tmp', MANIFEST_PATH)
+    print(f"Rebuilt {len(tasks) - len(failed)} charts, {len(failed)} failed")
+    return failed
+
+def main():
+    parser = argparse.ArgumentParser(description='Export every chart of the dashboard and the notebook as standalone HTML')
+    parser.add_argument('--views', nargs='+', help=f'Page modules to export, or {NOTEBOOK_NAME} (default: all)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: one per CPU)')
+    parser.add_argument('--force', action='store_true', help='Rebuild charts even if their data has not changed')
+    args = parser.parse_args()
+
+    failed = export_report(args.views, args.force, args.workers)
+    print(f"Report written to {os.path.join(REPORT_DIR, 'index.html')}")
+    if failed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+import os
+import sys
+import json
+import gzip
+import fcntl
+import hashlib
+import argparse
+import importlib
+from datetime import datetime
+
+# Allow importing utils and pages when run as `python scripts/export_snapshot.py`
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from utils import get_data_version, split_figure, themed_figure_json, CHART_THEMES
+
+# Served at /app/static/snapshot/ by nginx in the Docker image, with the .gz
+# copies and ETags; plain `streamlit run` serves it too, as text/plain only
+# (see .streamlit/config.toml)
+SNAPSHOT_DIR = os.path.join('static', 'snapshot')
+MANIFEST_PATH = os.path.join(SNAPSHOT_DIR, 'manifest.json')
+LOCK_PATH = os.path.join(SNAPSHOT_DIR, '.lock')
+
+# Typed-array traces (see utils.split_figure) need plotly.js >= 2.28
+PLOTLY_JS = 'https://cdn.plot.ly/plotly-2.30.1.min.js'
+
+# Page background and text colors of the snapshot HTML per theme
+PAGE_COLORS = {
+    'dark': ('#0e1117', '#fafafa'),
+    'light': ('#ffffff', '#31333f'),
+}
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title} - Economic Data Dashboard</title>
+<script src="{plotly_js}"></script>
+<style>
+body {{ background: {background}; color: {color}; font-family: sans-serif; margin: 2rem; }}
+.chart {{ height: 450px; margin-bottom: 2rem; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<p>Snapshot generated {generated_at}</p>
+{divs}
+<script>
+const charts = {charts};
+for (const [id, url] of Object.entries(charts)) {{
+    fetch(url)
+        .then(response => response.json())
+        .then(fig => Plotly.newPlot(id, fig.data, fig.layout, {{responsive: true, displaylogo: false}}));
+}}
+</script>
+</body>
+</html>
+"""
+
+def page_modules(views=None):
+    """Page modules that declare a CHARTS registry, by module name."""
+    names = sorted(
+        name[:-3] for name in os.listdir(os.path.join(ROOT_DIR, 'pages'))
+        if name.endswith('.py') and not name.startswith('_')
+    )
+    for name in names:
+        if views and name not in views:
+            continue
+        module = importlib.import_module(f'pages.{name}')
+        if hasattr(module, 'CHARTS'):
+            yield name, module
+
+def write_artifact(relative_path, content):
+    """
+    Write content and a gzip copy next to it (for nginx gzip_static), replacing
+    any previous version atomically. Returns the manifest entry with the
+    content ETag.
+    """
+    path = os.path.join(SNAPSHOT_DIR, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = content.encode('utf-8')
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    for target, payload in [(path, data), (path + '.gz', compressed)]:
+        with open(target + '.tmp', 'wb') as f:
+            f.write(payload)
+        os.replace(target + '.tmp', target)
+    return {
+        'path': relative_path,
+        'etag': hashlib.md5(data).hexdigest(),
+        'bytes': len(data),
+        'gzip_bytes': len(compressed),
+    }
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'charts': {}, 'pages': {}}
+
+def export_chart(chart_key, build, sources, manifest, force=False):
+    """
+    Export one chart in every theme. Charts whose source tables have the same
+    data version as in the previous manifest are kept as they are.
+    Returns True if the chart was rebuilt.
+    """
+    data_version = [str(v) for v in get_data_version(*sources)]
+    previous = manifest['charts'].get(chart_key)
+    if (not force and previous and previous['data_version'] == data_version
+            and all(os.path.exists(os.path.join(SNAPSHOT_DIR, f['path'])) for f in previous['files'].values())):
+        return False
+
+    spec = split_figure(build())
+    files = {}
+    for theme in CHART_THEMES:
+        files[theme] = write_artifact(f'charts/{chart_key}.{theme}.json', themed_figure_json(spec, theme))
+    manifest['charts'][chart_key] = {
+        'sources': list(sources),
+        'data_version': data_version,
+        'files': files,
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+    }
+    return True
+
+def export_page(name, module, manifest):
+    """One HTML page per theme that loads the view's charts by versioned URL."""
+    title = name.replace('_', ' ').title()
+    generated_at = datetime.now().strftime('%B %d, %Y %H:%M')
+    pages = {}
+    for theme, (background, color) in PAGE_COLORS.items():
+        charts = {}
+        for chart_id in module.CHARTS:
+            entry = manifest['charts'][f'{name}.{chart_id}']['files'][theme]
+            # Relative to the page; the ETag query changes whenever the figure does
+            charts[f'{name}-{chart_id}'] = f"{entry['path']}?v={entry['etag']}"
+        divs = '\n'.join(f'<div class="chart" id="{div_id}"></div>' for div_id in charts)
+        html = PAGE_TEMPLATE.format(
+            title=title, plotly_js=PLOTLY_JS, background=background, color=color,
+            generated_at=generated_at, divs=divs, charts=json.dumps(charts, indent=4)
+        )
+        pages[theme] = write_artifact(f'{name}.{theme}.html', html)
+    manifest['pages'][name] = pages
+
+def export_snapshot(views=None, force=False):
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    # The minute and daily jobs may overlap; only one export updates the manifest at a time
+    with open(LOCK_PATH, 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        manifest = load_manifest()
+        for name, module in page_modules(views):
+            rebuilt = [
+                chart_id for chart_id, (build, sources) in module.CHARTS.items()
+                if export_chart(f'{name}.{chart_id}', build, sources, manifest, force)
+            ]
+            if rebuilt or name not in manifest['pages']:
+                export_page(name, module, manifest)
+            print(f"{name}: rebuilt {len(rebuilt)} of {len(module.CHARTS)} charts")
+
+        manifest['generated_at'] = datetime.now().isoformat(timespec='seconds')
+        with open(MANIFEST_PATH + '.tmp', 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(MANIFEST_PATH + '.tmp', MANIFEST_PATH)
+
+def main():
+    parser = argparse.ArgumentParser(description='Export every dashboard chart as static JSON and HTML snapshots')
+    parser.add_argument('--views', nargs='+', help='Page modules to export, e.g. crypto_markets (default: all)')
+    parser.add_argument('--force', action='store_true', help='Rebuild charts even if their data has not changed')
+    args = parser.parse_args()
+
+    export_snapshot(args.views, args.force)
+    print(f"Snapshot written to {SNAPSHOT_DIR}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from derived_metrics import engine, read_table, bump_data_versions
+
+# Forecast series by name: (table, column, frequency, model). Models:
+#   holt:  Holt's linear exponential smoothing, smoothing weights picked by one-step error
+#   ar:    autoregression on the level, fitted by least squares
+#   trend: linear trend over the fit window
+FORECAST_SPECS = {
+    'sp500': ('sp500', 'SP500', 'B', 'holt'),
+    'vix': ('vixcls', 'VIXCLS', 'B', 'ar'),
+    'dgs1': ('derived_dgs1', 'DGS1', 'B', 'holt'),
+    'dgs5': ('derived_dgs5', 'DGS5', 'B', 'holt'),
+    'dgs10': ('derived_dgs10', 'DGS10', 'B', 'holt'),
+    'dollar_index': ('dtwexbgs', 'DTWEXBGS', 'B', 'holt'),
+    'eurusd': ('dexuseu', 'DEXUSEU', 'B', 'holt'),
+    'fedfunds': ('derived_fedfunds', 'FEDFUNDS', 'M', 'holt'),
+    'unrate': ('derived_unrate', 'UNRATE', 'M', 'ar'),
+    'cpi_core': ('cpilfesl', 'cpi_core_yoy', 'M', 'ar'),
+    'cpi_all': ('cpiaucsl', 'cpi_all_yoy', 'M', 'ar'),
+    'ireland_cpi': ('ireland_cpi', 'cpi_ireland_yoy', 'M', 'ar'),
+    'euro_cpi': ('euro_cpi', 'cpi_euro_yoy', 'M', 'ar'),
+    'saving_rate': ('derived_saving_rate', 'saving_rate', 'M', 'ar'),
+    'gdp_real': ('gdpc1', 'gdpc1_us_yoy', 'Q', 'ar'),
+    'gdp_potential': ('gdppot', 'gdppot_us_yoy', 'Q', 'trend'),
+    'federal_debt': ('gfdegdq188s', 'GFDEGDQ188S', 'Q', 'trend'),
+}
+
+# Per frequency: (date offset, forecast horizon, fit window, AR lags), in periods
+FREQUENCIES = {
+    'B': ('B', 63, 5 * 252, 5),
+    'M': ('MS', 12, 20 * 12, 3),
+    'Q': ('QS', 8, 20 * 4, 2),
+}
+
+# Normal quantile of the stored 80% forecast interval
+Z_SCORE = 1.2816
+
+# Holt smoothing weights searched for the level (alpha) and trend (beta)
+HOLT_ALPHAS = np.linspace(0.05, 1.0, 20)
+HOLT_BETAS = np.array([0.0, 0.01, 0.02, 0.05, 0.1, 0.2])
+
+def holt_forecast(values, horizon):
+    '''
+    Holt's linear method with (alpha, beta) chosen from the grid by the sum of
+    squared one-step errors. All grid points are filtered at once, one vector
+    step per observation. Intervals use the ETS(A,A,N) forecast variance.
+    '''
+    alpha, beta = [grid.ravel() for grid in np.meshgrid(HOLT_ALPHAS, HOLT_BETAS)]
+    level = np.full(alpha.shape, values[0])
+    trend = np.full(alpha.shape, values[1] - values[0])
+    sse = np.zeros(alpha.shape)
+    for x in values[1:]:
+        error = x - (level + trend)
+        sse += error ** 2
+        new_level = level + trend + alpha * error
+        trend = trend + alpha * beta * error
+        level = new_level
+
+    best = np.argmin(sse)
+    a, b = alpha[best], beta[best]
+    sigma2 = sse[best] / max(len(values) - 3, 1)
+    steps = np.arange(1, horizon + 1)
+    forecast = level[best] + steps * trend[best]
+    # The ETS(A,A,N) trend weight is alpha * beta in the error-correction form used above
+    beta_ets = a * b
+    variance = sigma2 * (1 + (steps - 1) * (a ** 2 + a * beta_ets * steps + beta_ets ** 2 * steps * (2 * steps - 1) / 6))
+    return forecast, np.sqrt(variance)
+
+def ar_forecast(values, horizon, lags):
+    '''
+    AR(lags) with intercept by least squares, iterated forward. The forecast
+    standard error accumulates the squared moving-average (psi) weights.
+    '''
+    design = np.column_stack([np.ones(len(values) - lags)] +
+                             [values[lags - k:len(values) - k] for k in range(1, lags + 1)])
+    target = values[lags:]
+    coefs = np.linalg.lstsq(design, target, rcond=None)[0]
+    residuals = target - design @ coefs
+    sigma2 = residuals @ residuals / max(len(target) - lags - 1, 1)
+
+    history = list(values[-lags:])
+    forecast = []
+    for _ in range(horizon):
+        history.append(coefs[0] + np.dot(coefs[1:], history[::-1][:lags]))
+        forecast.append(history[-1])
+
+    psi = [1.0]
+    for h in range(1, horizon):
+        psi.append(sum(coefs[k] * psi[h - k] for k in range(1, min(h, lags) + 1)))
+    variance = sigma2 * np.cumsum(np.square(psi))
+    return np.array(forecast), np.sqrt(variance)
+
+def trend_forecast(values, horizon):
+    '''Least squares line over the window, with the usual prediction interval'''
+    x = np.arange(len(values), dtype='float64')
+    slope, intercept = np.polyfit(x, values, 1)
+    residuals = values - (intercept + slope * x)
+    sigma2 = residuals @ residuals / max(len(values) - 2, 1)
+    future = np.arange(len(values), len(values) + horizon, dtype='float64')
+    leverage = 1 / len(x) + (future - x.mean()) ** 2 / ((x - x.mean()) ** 2).sum()
+    return intercept + slope * future, np.sqrt(sigma2 * (1 + leverage))
+
+def fit_series(task):
+    '''Fit one series (run in a worker process); returns (name, data hash, forecast frame)'''
+    name, data_hash, series = task
+    _, _, freq, model = FORECAST_SPECS[name]
+    offset, horizon, _, lags = FREQUENCIES[freq]
+    values = series.to_numpy(dtype='float64')
+
+    if model == 'holt':
+        forecast, stderr = holt_forecast(values, horizon)
+    elif model == 'ar':
+        forecast, stderr = ar_forecast(values, horizon, lags)
+    else:
+        forecast, stderr = trend_forecast(values, horizon)
+
+    dates = pd.date_range(series.index[-1], periods=horizon + 1, freq=offset)[1:]
+    frame = pd.DataFrame({
+        'forecast': forecast,
+        'lower': forecast - Z_SCORE * stderr,
+        'upper': forecast + Z_SCORE * stderr,
+    }, index=dates)
+    return name, data_hash, frame
+
+def load_series(name):
+    '''The fit window of a series, with the hash that decides whether it needs a refit'''
+    table, column, freq, model = FORECAST_SPECS[name]
+    series = read_table(f'SELECT date, {column} FROM {table} ORDER BY date')[column].dropna()
+    series = series.iloc[-FREQUENCIES[freq][2]:]
+    digest = hashlib.sha1(repr(FORECAST_SPECS[name]).encode())
+    digest.update(series.index.asi8.tobytes())
+    digest.update(series.to_numpy(dtype='float64').tobytes())
+    return series, digest.hexdigest()
+
+def ensure_tables(conn):
+    conn.execute(text("""
+    CREATE TABLE IF NOT EXISTS forecasts (
+        series TEXT NOT NULL,
+        date TIMESTAMP NOT NULL,
+        forecast REAL,
+        lower REAL,
+        upper REAL,
+        PRIMARY KEY (series, date)
+    )
+    """))
+    conn.execute(text("""
+    CREATE TABLE IF NOT EXISTS forecast_runs (
+        series TEXT PRIMARY KEY,
+        model TEXT,
+        data_hash TEXT,
+        forecast_end TIMESTAMP,
+        fitted_at TIMESTAMP
+    )
+    """))
+
+def update_forecasts(names=None, workers=None, force=False):
+    '''
+    Refit the forecasts of the given series (default: all) whose fit window
+    or spec changed since the last run, across a process pool, and replace
+    their rows in the forecasts table.
+    '''
+    names = names or list(FORECAST_SPECS)
+    with engine.connect() as conn:
+        ensure_tables(conn)
+        conn.commit()
+        fitted = dict(conn.execute(text("SELECT series, data_hash FROM forecast_runs")).fetchall())
+
+    tasks = []
+    for name in names:
+        try:
+            series, data_hash = load_series(name)
+        except Exception as e:
+            print(f"Skipping forecast of {name}: {e}")
+            continue
+        if len(series) < 2 * FREQUENCIES[FORECAST_SPECS[name][2]][3] + 3:
+            print(f"Skipping forecast of {name}: only {len(series)} observations")
+            continue
+        if force or fitted.get(name) != data_hash:
+            tasks.append((name, data_hash, series))
+    if not tasks:
+        print("All forecasts are up to date")
+        return
+
+    print(f"Fitting {len(tasks)} of {len(names)} series...")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(fit_series, tasks))
+
+    fitted_at = pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S.%f')
+    with engine.connect() as conn:
+        for name, data_hash, frame in results:
+            conn.execute(text("DELETE FROM forecasts WHERE series = :series"), dict(series=name))
+            conn.execute(
+                text("""
+                INSERT INTO forecasts (series, date, forecast, lower, upper)
+                VALUES (:series, :date, :forecast, :lower, :upper)
+                """),
+                [dict(series=name, date=date.strftime('%Y-%m-%d %H:%M:%S.%f'), forecast=row.forecast,
+                      lower=row.lower, upper=row.upper) for date, row in frame.iterrows()]
+            )
+            conn.execute(
+                text("""
+                INSERT OR REPLACE INTO forecast_runs (series, model, data_hash, forecast_end, fitted_at)
+                VALUES (:series, :model, :data_hash, :forecast_end, :fitted_at)
+                """),
+                dict(series=name, model=FORECAST_SPECS[name][3], data_hash=data_hash,
+                     forecast_end=frame.index[-1].strftime('%Y-%m-%d %H:%M:%S.%f'), fitted_at=fitted_at)
+            )
+            print(f"{name}: {FORECAST_SPECS[name][3]} forecast to {frame.index[-1].date()}, "
+                  f"last {frame['forecast'].iloc[-1]:.4g} ({frame['lower'].iloc[-1]:.4g} to {frame['upper'].iloc[-1]:.4g})")
+        conn.commit()
+    bump_data_versions(['forecasts'])
+
+def main():
+    parser = argparse.ArgumentParser(description='Fit forecasts for every stored series whose data changed')
+    parser.add_argument('--series', nargs='+', choices=list(FORECAST_SPECS), help='Series to forecast (default: all)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: one per CPU)')
+    parser.add_argument('--force', action='store_true', help='Refit series whose data has not changed')
+    args = parser.parse_args()
+    update_forecasts(args.series, args.workers, args.force)
+
+if __name__ == '__main__':
+    main()
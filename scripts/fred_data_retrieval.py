@@ -5,6 +5,9 @@ from pandas_datareader import data as pdr
 from sqlalchemy import create_engine
 from sqlalchemy.types import DateTime, Float
 from tqdm import tqdm
+from derived_metrics import build_derived_tables, build_latest_values, bump_data_versions, enable_wal
+from rolling_stats import apply_rolling
+from alerts import evaluate_alerts
 
 # Directory to save data
 DATA_DIR = 'data'
@@ -13,7 +16,7 @@ DATA_DIR = 'data'
 os.makedirs(DATA_DIR, exist_ok=True)
 
 # SQLite database path
-DB_PATH = os.path.join(DATA_DIR, 'economics_data.db')
+DB_PATH = os.environ.get('DASHBOARD_DB_PATH', os.path.join(DATA_DIR, 'economics_data.db'))
 
 # Create SQLAlchemy engine
 engine = create_engine(f'sqlite:///{DB_PATH}')
@@ -95,34 +98,26 @@ def fetch_macro(min_date=None):
         # VIX Volatility Index
         elif metric_code == "VIXCLS":
             vix = pdr.DataReader(metric_code, "fred", start=min_date)
-            # Calculate rolling metrics for VIX
-            vix['vix_ma20'] = vix.VIXCLS.rolling(window=20).mean()
-            vix['vix_ma50'] = vix.VIXCLS.rolling(window=50).mean()
-            data['vixcls'] = vix
+            # Rolling metrics for VIX, updated incrementally (see rolling_stats.py)
+            data['vixcls'] = apply_rolling('vixcls', vix)
             
         # Trade Weighted U.S. Dollar Index
         elif metric_code == "DTWEXBGS":
             dtwexbgs = pdr.DataReader(metric_code, "fred", start=min_date)
-            # Calculate rolling averages for the dollar index
-            dtwexbgs['dollar_index_ma20'] = dtwexbgs.DTWEXBGS.rolling(window=20).mean()
-            dtwexbgs['dollar_index_ma50'] = dtwexbgs.DTWEXBGS.rolling(window=50).mean()
-            data['dtwexbgs'] = dtwexbgs
+            # Rolling averages for the dollar index
+            data['dtwexbgs'] = apply_rolling('dtwexbgs', dtwexbgs)
             
         # U.S. / Euro Exchange Rate
         elif metric_code == "DEXUSEU":
             dexuseu = pdr.DataReader(metric_code, "fred", start=min_date)
-            # Calculate rolling averages for EUR/USD
-            dexuseu['eurusd_ma20'] = dexuseu.DEXUSEU.rolling(window=20).mean()
-            dexuseu['eurusd_ma50'] = dexuseu.DEXUSEU.rolling(window=50).mean()
-            data['dexuseu'] = dexuseu
+            # Rolling averages for EUR/USD
+            data['dexuseu'] = apply_rolling('dexuseu', dexuseu)
             
         # Unemployment Rate
         elif metric_code == "UNRATE":
             unrate = pdr.DataReader(metric_code, "fred", start=min_date)
-            # Calculate rolling averages for unemployment
-            unrate['unrate_ma3'] = unrate.UNRATE.rolling(window=3).mean()
-            unrate['unrate_ma12'] = unrate.UNRATE.rolling(window=12).mean()
-            data['unrate'] = unrate
+            # Rolling averages for unemployment
+            data['unrate'] = apply_rolling('unrate', unrate)
 
         # S&P 500
         elif metric_code == "SP500":
@@ -134,10 +129,8 @@ def fetch_macro(min_date=None):
                 sp500 = pd.DataFrame()
                 sp500['SP500'] = sp500_raw[metric_code].fillna(method='ffill')
                 
-                # Calculate SMAs using standard rolling window with center=False to use prior values
-                sp500['sp500_ma20'] = sp500['SP500'].rolling(window=20, center=False).mean()
-                sp500['sp500_ma50'] = sp500['SP500'].rolling(window=50, center=False).mean()
-                sp500['sp500_ma200'] = sp500['SP500'].rolling(window=200, center=False).mean()
+                # SMAs over prior values and 20-day return volatility, updated incrementally
+                sp500 = apply_rolling('sp500', sp500)
                 
                 # Print last 10 rows to verify SMA calculations
                 print("\nSP500 Moving Averages (last 10 rows):")
@@ -151,12 +144,12 @@ def fetch_macro(min_date=None):
                     print(nan_count)
                 
                 # Verify calculations are numeric
-                if sp500.select_dtypes(include=['float64', 'int64']).shape[1] != 4:
+                if sp500.select_dtypes(include=['float64', 'int64']).shape[1] != 5:
                     print("Warning: Non-numeric values detected in SP500 data")
                     sp500 = sp500.astype('float64')
                 
                 # Store in data dictionary
-                data['sp500'] = sp500[['SP500', 'sp500_ma20', 'sp500_ma50', 'sp500_ma200']]
+                data['sp500'] = sp500[['SP500', 'sp500_ma20', 'sp500_ma50', 'sp500_ma200', 'sp500_vol20']]
             except Exception as e:
                 print(f"Error processing SP500 data: {str(e)}")
                 # Continue with other metrics
@@ -165,9 +158,8 @@ def fetch_macro(min_date=None):
         # Personal Saving Rate
         elif metric_code == "PSAVERT":
             psavert = pdr.DataReader(metric_code, "fred", start=min_date)
-            # Calculate rolling averages for saving rate
-            psavert['saving_rate_ma3'] = psavert.PSAVERT.rolling(window=3).mean()
-            psavert['saving_rate_ma12'] = psavert.PSAVERT.rolling(window=12).mean()
+            # Rolling averages for saving rate
+            psavert = apply_rolling('psavert', psavert)
             # Calculate year-over-year change
             psavert['saving_rate_yoy_change'] = psavert.PSAVERT - psavert.PSAVERT.shift(12)
             data['psavert'] = psavert
@@ -197,7 +189,8 @@ def fetch_macro(min_date=None):
                 'SP500': Float,
                 'sp500_ma20': Float,
                 'sp500_ma50': Float,
-                'sp500_ma200': Float
+                'sp500_ma200': Float,
+                'sp500_vol20': Float
             }
             df.to_sql(name, engine, if_exists='replace', index=True,
                      dtype=dtype_dict)
@@ -208,9 +201,15 @@ def fetch_macro(min_date=None):
             
             df.to_sql(name, engine, if_exists='replace', index=True,
                      dtype=dtype_dict)
+    
+    bump_data_versions(list(data.keys()))
 
 def main():
+    enable_wal()
     fetch_macro()
+    build_derived_tables()
+    build_latest_values()
+    evaluate_alerts()
 
 if __name__ == '__main__':
     main()
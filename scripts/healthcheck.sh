@@ -0,0 +1,18 @@
+#!/bin/bash
+# Container health: the public port must answer, and so must every Streamlit
+# worker behind the proxy
+WORKERS=${DASHBOARD_WORKERS:-1}
+BASE_PORT=${DASHBOARD_WORKER_BASE_PORT:-8601}
+
+curl --fail --silent --output /dev/null http://localhost:8501/_stcore/health || {
+    echo "Dashboard is not answering on port 8501"
+    exit 1
+}
+
+for i in $(seq 0 $((WORKERS - 1))); do
+    PORT=$((BASE_PORT + i))
+    curl --fail --silent --output /dev/null http://127.0.0.1:$PORT/_stcore/health || {
+        echo "Streamlit worker on port $PORT is not answering"
+        exit 1
+    }
+done
@@ -0,0 +1,155 @@
+import argparse
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.types import DateTime, Float
+from derived_metrics import engine, bump_data_versions
+
+# Realized volatility horizons: output column -> trailing window
+RV_HORIZONS = {
+    'rv_1h': pd.Timedelta(hours=1),
+    'rv_4h': pd.Timedelta(hours=4),
+    'rv_24h': pd.Timedelta(hours=24),
+}
+
+# Rolling VWAP window; vwap_day restarts at every UTC midnight
+VWAP_WINDOW = pd.Timedelta(hours=24)
+
+# BTC trades around the clock, so volatility is annualized over every minute of the year
+MINUTES_PER_YEAR = 365 * 24 * 60
+
+# Longest trailing window any output column needs
+LOOKBACK = max(max(RV_HORIZONS.values()), VWAP_WINDOW)
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+def table_exists(conn, name):
+    return conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), dict(name=name)
+    ).fetchone() is not None
+
+def windowed_sums(times, values, window):
+    """Sum of values over the trailing `window` of time ending at every row (gaps allowed)."""
+    sums = np.concatenate([[0.0], np.cumsum(values)])
+    starts = np.searchsorted(times, times - np.timedelta64(window), side='right')
+    return sums[1:] - sums[starts]
+
+def intraday_metrics(bars):
+    """
+    Per-minute analytics of btc_minute bars (ascending, indexed by Datetime):
+    log return, annualized realized volatility over each RV_HORIZONS window
+    (from the mean squared minute return, so missing minutes do not bias it),
+    and volume-weighted average price over the last 24 hours and since midnight.
+    """
+    times = bars.index.values
+    close = bars['Close'].to_numpy(dtype='float64')
+    volume = np.nan_to_num(bars['Volume'].to_numpy(dtype='float64'))
+    typical = (bars['High'].to_numpy(dtype='float64') + bars['Low'].to_numpy(dtype='float64') + close) / 3
+
+    log_return = np.concatenate([[np.nan], np.diff(np.log(close))])
+    observed = ~np.isnan(log_return)
+    squared = np.where(observed, log_return ** 2, 0.0)
+
+    metrics = {'log_return': log_return}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for column, horizon in RV_HORIZONS.items():
+            count = windowed_sums(times, observed.astype('float64'), horizon)
+            metrics[column] = np.sqrt(windowed_sums(times, squared, horizon) / count * MINUTES_PER_YEAR)
+
+        traded = np.where(np.isnan(typical), 0.0, typical * volume)
+        metrics['vwap_24h'] = windowed_sums(times, traded, VWAP_WINDOW) / windowed_sums(times, volume, VWAP_WINDOW)
+
+        # Cumulative sums restarted at the first bar of each day
+        day_start = np.searchsorted(times, bars.index.normalize().values, side='left')
+        traded_sums = np.concatenate([[0.0], np.cumsum(traded)])
+        volume_sums = np.concatenate([[0.0], np.cumsum(volume)])
+        rows = np.arange(1, len(times) + 1)
+        metrics['vwap_day'] = ((traded_sums[rows] - traded_sums[day_start])
+                               / (volume_sums[rows] - volume_sums[day_start]))
+
+    metrics = pd.DataFrame(metrics, index=bars.index)
+    metrics['Volume'] = volume
+    return metrics
+
+def hourly_totals(metrics):
+    '''Minute count, sum of squared log returns and volume per clock hour'''
+    hours = metrics.index.floor('h')
+    returns = metrics['log_return']
+    return pd.DataFrame({
+        'bars': returns.notna().groupby(hours).sum().astype('float64'),
+        'sum_sq_return': (returns ** 2).groupby(hours).sum(),
+        'volume': metrics['Volume'].groupby(hours).sum(),
+    })
+
+def update_intraday(full=False):
+    '''
+    Append analytics for the minute bars added since the last run to
+    derived_btc_intraday and add them to the per-hour totals in
+    derived_btc_hourly. Only the new bars plus the last 24 hours they need
+    as context are read; full=True rebuilds both tables from all bars.
+    '''
+    with engine.connect() as conn:
+        last = None
+        if not full and table_exists(conn, 'derived_btc_intraday'):
+            last = conn.execute(text("SELECT MAX(date) FROM derived_btc_intraday")).scalar()
+        if last is None:
+            full = True
+            query, params = "SELECT Datetime, High, Low, Close, Volume FROM btc_minute ORDER BY Datetime", {}
+        else:
+            last = pd.Timestamp(last)
+            query = "SELECT Datetime, High, Low, Close, Volume FROM btc_minute WHERE Datetime >= :start ORDER BY Datetime"
+            # One extra hour, so the first bar inside any window has its previous close
+            params = dict(start=(last - LOOKBACK - pd.Timedelta(hours=1)).strftime(TIMESTAMP_FORMAT))
+        bars = pd.read_sql(text(query), conn, params=params, parse_dates=['Datetime']).set_index('Datetime')
+
+    metrics = intraday_metrics(bars)
+    new = metrics if full else metrics[metrics.index > last]
+    if new.empty:
+        print("No new BTC bars for intraday analytics")
+        return
+
+    new_rows = new.drop(columns='Volume')
+    new_rows.index.name = 'date'
+    dtype_dict = {col: Float for col in new_rows.columns}
+    dtype_dict['date'] = DateTime
+    new_rows.to_sql('derived_btc_intraday', engine, if_exists='replace' if full else 'append',
+                    index=True, dtype=dtype_dict)
+
+    hourly = hourly_totals(new)
+    with engine.connect() as conn:
+        if full:
+            conn.execute(text("DROP TABLE IF EXISTS derived_btc_hourly"))
+        conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS derived_btc_hourly (
+            date TIMESTAMP PRIMARY KEY,
+            bars REAL,
+            sum_sq_return REAL,
+            volume REAL
+        )
+        """))
+        # The first hour may already hold bars from the previous run; add to its totals
+        conn.execute(
+            text("""
+            INSERT INTO derived_btc_hourly (date, bars, sum_sq_return, volume)
+            VALUES (:date, :bars, :sum_sq_return, :volume)
+            ON CONFLICT (date) DO UPDATE SET
+                bars = bars + excluded.bars,
+                sum_sq_return = sum_sq_return + excluded.sum_sq_return,
+                volume = volume + excluded.volume
+            """),
+            [dict(date=hour.strftime(TIMESTAMP_FORMAT), bars=row.bars, sum_sq_return=row.sum_sq_return,
+                  volume=row.volume) for hour, row in hourly.iterrows()]
+        )
+        conn.commit()
+
+    bump_data_versions(['derived_btc_intraday', 'derived_btc_hourly'])
+    print(f"Intraday analytics: {len(new)} new bars ({'full rebuild' if full else 'incremental'})")
+
+def main():
+    parser = argparse.ArgumentParser(description='Update BTC intraday analytics from new minute bars')
+    parser.add_argument('--full', action='store_true', help='Rebuild from every stored bar')
+    args = parser.parse_args()
+    update_intraday(full=args.full)
+
+if __name__ == '__main__':
+    main()
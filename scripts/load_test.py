@@ -0,0 +1,313 @@
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import subprocess
+import urllib.request
+
+import numpy as np
+import pandas as pd
+from tornado.websocket import websocket_connect
+from streamlit.proto.Alert_pb2 import Alert
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Views and sidebar buttons a simulated user clicks, as in app.py
+VIEWS = ['Economic Indicators', 'Stock Market Overview', 'Interest Rates', 'Currency Markets', 'Crypto Markets',
+         'Cross-Asset Correlations', 'Backtest']
+THEME_BUTTONS = ['light_theme', 'dark_theme']
+
+# Largest message a session accepts, as Streamlit's server.maxMessageSize default
+MAX_MESSAGE_MB = 200
+
+def random_walk(rng, index, start, volatility, missing=0.0):
+    values = start * np.exp(np.cumsum(rng.normal(0, volatility, len(index))))
+    values[rng.random(len(index)) < missing] = np.nan
+    return pd.Series(values, index=index)
+
+def build_synthetic_db(years, btc_days, seed=0):
+    """
+    Fill the database at DASHBOARD_DB_PATH with random data in the schema that
+    fred_data_retrieval.py and btc_minute_data.py write, then build everything
+    the pages and the notebook read: derived tables, latest values, intraday
+    analytics, alerts, forecasts and backtest results.
+    """
+    from sqlalchemy import text
+    from sqlalchemy.types import DateTime, Float
+    from derived_metrics import (engine, enable_wal, build_derived_tables, build_latest_values,
+                                 bump_data_versions)
+    from intraday_analytics import update_intraday
+    from alerts import evaluate_alerts
+    from forecasts import update_forecasts
+    from backtest_sweep import sweep
+
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp.now().normalize()
+    days = pd.bdate_range(end - pd.DateOffset(years=years), end)
+    months = pd.date_range(end - pd.DateOffset(years=years), end, freq='MS')
+    quarters = pd.date_range(end - pd.DateOffset(years=years), end, freq='QS')
+
+    tables = {}
+    sp500 = random_walk(rng, days, 300, 0.01)
+    tables['sp500'] = pd.DataFrame({'SP500': sp500})
+    for window in (20, 50, 200):
+        tables['sp500'][f'sp500_ma{window}'] = sp500.rolling(window).mean()
+    vix = random_walk(rng, days, 20, 0.05, missing=0.03)
+    tables['vixcls'] = pd.DataFrame({'VIXCLS': vix, 'vix_ma20': vix.rolling(20).mean(),
+                                     'vix_ma50': vix.rolling(50).mean()})
+    for table, column in [('dgs1', 'DGS1'), ('dgs5', 'DGS5'), ('dgs10', 'DGS10')]:
+        tables[table] = pd.DataFrame({column: random_walk(rng, days, 5, 0.01, missing=0.03)})
+    dollar = random_walk(rng, days, 100, 0.003)
+    tables['dtwexbgs'] = pd.DataFrame({'DTWEXBGS': dollar, 'dollar_index_ma20': dollar.rolling(20).mean(),
+                                       'dollar_index_ma50': dollar.rolling(50).mean()})
+    eurusd = random_walk(rng, days, 1.1, 0.003)
+    tables['dexuseu'] = pd.DataFrame({'DEXUSEU': eurusd, 'eurusd_ma20': eurusd.rolling(20).mean(),
+                                      'eurusd_ma50': eurusd.rolling(50).mean()})
+
+    unrate = pd.Series(5 + np.cumsum(rng.normal(0, 0.1, len(months))), index=months)
+    tables['unrate'] = pd.DataFrame({'UNRATE': unrate, 'unrate_ma3': unrate.rolling(3).mean(),
+                                     'unrate_ma12': unrate.rolling(12).mean()})
+    tables['fedfunds'] = pd.DataFrame({'FEDFUNDS': 3 + np.cumsum(rng.normal(0, 0.1, len(months)))}, index=months)
+    for table, prefix in [('cpilfesl', 'cpi_core'), ('cpiaucsl', 'cpi_all'),
+                          ('ireland_cpi', 'cpi_ireland'), ('euro_cpi', 'cpi_euro')]:
+        cpi = 100 * np.exp(np.cumsum(rng.normal(0.003, 0.002, len(months))))
+        cpi = pd.Series(cpi, index=months)
+        tables[table] = pd.DataFrame({f'{prefix}_yoy': cpi / cpi.shift(12) - 1,
+                                      f'{prefix}_mom': cpi / cpi.shift(1) - 1})
+    saving = pd.Series(8 + np.cumsum(rng.normal(0, 0.2, len(months))), index=months)
+    tables['psavert'] = pd.DataFrame({'PSAVERT': saving, 'saving_rate_ma3': saving.rolling(3).mean(),
+                                      'saving_rate_ma12': saving.rolling(12).mean(),
+                                      'saving_rate_yoy_change': saving - saving.shift(12)})
+
+    gdp = pd.Series(5000 * np.exp(np.cumsum(rng.normal(0.006, 0.005, len(quarters)))), index=quarters)
+    tables['gdpc1'] = pd.DataFrame({'gdpc1_us_yoy': gdp / gdp.shift(4) - 1,
+                                    'gdpc1_us_qoq': gdp / gdp.shift(1) - 1, 'gdpc1_us_abs': gdp})
+    tables['gdppot'] = pd.DataFrame({'gdppot_us_yoy': gdp / gdp.shift(4) - 1,
+                                     'gdppot_us_qoq': gdp / gdp.shift(1) - 1})
+    tables['gfdegdq188s'] = pd.DataFrame({'GFDEGDQ188S': 60 + np.cumsum(rng.normal(0.3, 0.5, len(quarters)))},
+                                         index=quarters)
+
+    for name, df in tables.items():
+        df.index.name = 'date'
+        dtype = {col: Float for col in df.columns}
+        dtype['date'] = DateTime
+        df.to_sql(name, engine, if_exists='replace', index=True, dtype=dtype)
+
+    now = pd.Timestamp.now().floor('min')
+    minutes = pd.date_range(now - pd.Timedelta(days=btc_days), now, freq='min')
+    close = random_walk(rng, minutes, 60000, 0.001)
+    btc = pd.DataFrame({'Open': close, 'High': close * 1.001, 'Low': close * 0.999, 'Close': close,
+                        'Volume': rng.integers(0, 10**6, len(minutes)).astype(float),
+                        'fetch_timestamp': now}, index=minutes)
+    with engine.connect() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS btc_minute"))
+        conn.execute(text("""
+        CREATE TABLE btc_minute (
+            Datetime TIMESTAMP PRIMARY KEY,
+            Open REAL, High REAL, Low REAL, Close REAL, Volume REAL,
+            fetch_timestamp TIMESTAMP
+        )
+        """))
+        conn.commit()
+    btc.to_sql('btc_minute', engine, if_exists='append', index=True, index_label='Datetime')
+
+    enable_wal()
+    bump_data_versions(list(tables) + ['btc_minute'])
+    build_derived_tables()
+    build_latest_values()
+    update_intraday(full=True)
+    evaluate_alerts()
+    update_forecasts()
+    sweep()
+
+def start_server(port):
+    """Start the dashboard with `streamlit run` on port and wait until it answers its health check."""
+    log = open(os.path.join(tempfile.gettempdir(), f'dashboard_load_{port}.log'), 'w')
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', 'app.py', '--server.headless', 'true',
+         '--server.address', '127.0.0.1', '--server.port', str(port), '--browser.gatherUsageStats', 'false'],
+        cwd=ROOT_DIR, env=os.environ.copy(), stdout=log, stderr=subprocess.STDOUT
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Streamlit exited with code {server.returncode}, see {log.name}")
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/_stcore/health', timeout=1):
+                return server
+        except OSError:
+            time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError(f"Streamlit did not start within 60 s, see {log.name}")
+
+def server_memory_mb(pid):
+    """Current and peak resident memory of a process, from /proc (Linux only)."""
+    memory = {}
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith(('VmRSS:', 'VmHWM:')):
+                name, kb = line.split()[:2]
+                memory[name[:-1]] = int(kb) / 1024
+    return memory['VmRSS'], memory['VmHWM']
+
+class Session:
+    """
+    One browser tab: a websocket to the server's /_stcore/stream endpoint that
+    sends reruns the way the frontend does and reads the app's messages back.
+    Buttons are clicked by their widget id, which ends with the button's key.
+    """
+    def __init__(self, url, timeout):
+        self.url = url.rstrip('/').replace('http', 'ws', 1) + '/_stcore/stream'
+        self.timeout = timeout
+        self.buttons = {}
+        self.errors = []
+        self.ws = None
+
+    async def connect(self):
+        self.ws = await websocket_connect(self.url, subprotocols=['streamlit'],
+                                          max_message_size=MAX_MESSAGE_MB * 1024 * 1024)
+
+    async def rerun(self, button=None):
+        """Rerun the app, clicking button (a widget key) if given, and wait for the run to finish."""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ''
+        if button is not None:
+            widget = msg.rerun_script.widget_states.widgets.add()
+            widget.id = self.buttons[button]
+            widget.trigger_value = True
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+
+        while True:
+            payload = await asyncio.wait_for(self.ws.read_message(), self.timeout)
+            if payload is None:
+                raise ConnectionError('server closed the connection')
+            fwd = ForwardMsg()
+            fwd.ParseFromString(payload)
+            kind = fwd.WhichOneof('type')
+            if kind == 'delta' and fwd.delta.WhichOneof('type') == 'new_element':
+                self.read_element(fwd.delta.new_element)
+            elif kind == 'script_finished' and fwd.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                return
+
+    def read_element(self, element):
+        kind = element.WhichOneof('type')
+        if kind == 'button':
+            self.buttons[element.button.id.split('-', 2)[2]] = element.button.id
+        elif kind == 'exception':
+            self.errors.append(f"{element.exception.type}: {element.exception.message}")
+        elif kind == 'alert' and element.alert.format == Alert.ERROR:
+            # Pages report their failures with st.error
+            self.errors.append(element.alert.body)
+
+    def close(self):
+        if self.ws is not None:
+            self.ws.close()
+
+async def simulate_session(url, session_id, actions, latencies, errors, timeout):
+    """One user: open the app, then click through views and theme buttons."""
+    rng = random.Random(session_id)
+    session = Session(url, timeout)
+    try:
+        await session.connect()
+        start = time.perf_counter()
+        await session.rerun()
+        latencies.append(('open', time.perf_counter() - start))
+        for _ in range(actions):
+            key = rng.choice(THEME_BUTTONS) if rng.random() < 0.2 else rng.choice(VIEWS)
+            action = 'theme' if key in THEME_BUTTONS else 'view'
+            start = time.perf_counter()
+            await session.rerun(key)
+            latencies.append((action, time.perf_counter() - start))
+    except Exception as e:  # A timed-out or dropped session counts as an error, not a latency
+        errors.append(f"session {session_id}: {type(e).__name__}: {e}")
+    finally:
+        errors.extend(f"session {session_id}: {error}" for error in session.errors)
+        session.close()
+
+def run_load_test(url, sessions, actions, timeout):
+    """
+    Run all sessions at once against the server at url. The sessions share one
+    event loop here; the reruns themselves run concurrently in the server.
+    """
+    latencies, errors = [], []
+
+    async def run_all():
+        await asyncio.gather(*[
+            simulate_session(url, i, actions, latencies, errors, timeout) for i in range(sessions)
+        ])
+
+    start = time.perf_counter()
+    asyncio.run(run_all())
+    return latencies, errors, time.perf_counter() - start
+
+def report(latencies, errors, elapsed, memory, sessions):
+    df = pd.DataFrame(latencies, columns=['action', 'seconds'])
+    df['ms'] = df['seconds'] * 1000
+    groups = [('all', df)] + list(df.groupby('action'))
+    rows = []
+    for name, group in groups:
+        rows.append({
+            'action': name,
+            'reruns': len(group),
+            'p50_ms': group['ms'].quantile(0.50),
+            'p95_ms': group['ms'].quantile(0.95),
+            'p99_ms': group['ms'].quantile(0.99),
+            'max_ms': group['ms'].max(),
+        })
+
+    pd.set_option('display.float_format', lambda x: '%.1f' % x)
+    print(pd.DataFrame(rows).to_string(index=False))
+    print(f"\nThroughput: {len(df) / elapsed:.1f} reruns/s over {elapsed:.1f} s")
+    if memory is not None:
+        baseline_mb, peak_mb = memory
+        print(f"Server memory: {baseline_mb:.1f} MB before the sessions, peak {peak_mb:.1f} MB "
+              f"({(peak_mb - baseline_mb) / sessions:.2f} MB per session)")
+    print(f"Errors: {len(errors)}")
+    for error in errors[:10]:
+        print(f"  {error}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Drive concurrent headless dashboard sessions and report rerun latency')
+    parser.add_argument('--sessions', type=int, default=10, help='Concurrent sessions (default: 10)')
+    parser.add_argument('--actions', type=int, default=20, help='Clicks per session after the first load (default: 20)')
+    parser.add_argument('--years', type=int, default=35, help='Years of daily/monthly history in the synthetic database (default: 35)')
+    parser.add_argument('--btc-days', type=int, default=7, help='Days of BTC minute bars in the synthetic database (default: 7)')
+    parser.add_argument('--db', help='Use this database instead of generating a synthetic one')
+    parser.add_argument('--timeout', type=float, default=120, help='Seconds before a rerun counts as failed (default: 120)')
+    parser.add_argument('--port', type=int, default=8599, help='Port of the Streamlit server started for the test (default: 8599)')
+    parser.add_argument('--url', help='Load an already running dashboard (e.g. http://localhost:8501) instead of starting one')
+    args = parser.parse_args()
+
+    if args.url:
+        url, server = args.url, None
+    else:
+        if args.db:
+            os.environ['DASHBOARD_DB_PATH'] = os.path.abspath(args.db)
+        else:
+            db_path = os.path.join(tempfile.mkdtemp(prefix='dashboard_load_'), 'economics_data.db')
+            os.environ['DASHBOARD_DB_PATH'] = db_path
+            # The ingestion scripts, and backtest.py for the sweep
+            sys.path[:0] = [os.path.join(ROOT_DIR, 'scripts'), ROOT_DIR]
+            print(f"Building synthetic database at {db_path} ({args.years} years, {args.btc_days} BTC days)...")
+            build_synthetic_db(args.years, args.btc_days)
+        print(f"Starting the dashboard on port {args.port}...")
+        url, server = f'http://127.0.0.1:{args.port}', start_server(args.port)
+
+    try:
+        baseline = server_memory_mb(server.pid)[0] if server else None
+        print(f"Running {args.sessions} sessions x {args.actions} actions against {url}...")
+        latencies, errors, elapsed = run_load_test(url, args.sessions, args.actions, args.timeout)
+        memory = (baseline, server_memory_mb(server.pid)[1]) if server else None
+        report(latencies, errors, elapsed, memory, args.sessions)
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+if __name__ == '__main__':
+    main()
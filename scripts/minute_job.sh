@@ -6,4 +6,7 @@ echo "Starting minute data collection at $(date)" >> /var/log/cron.log 2>&1
 echo "Running BTC minute data retrieval..." >> /var/log/cron.log 2>&1
 python scripts/btc_minute_data.py >> /var/log/cron.log 2>&1
 
+echo "Exporting crypto chart snapshot..." >> /var/log/cron.log 2>&1
+python scripts/export_snapshot.py --views crypto_markets >> /var/log/cron.log 2>&1
+
 echo "Minute data collection completed at $(date)" >> /var/log/cron.log 2>&1
@@ -0,0 +1,237 @@
+import json
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from derived_metrics import engine
+
+# Rolling columns kept up to date per table: table -> (input column, {output column: (kind, window)}).
+# 'mean' is a moving average of the input, 'vol' the annualized standard deviation
+# of its daily returns over the window.
+ROLLING_SPECS = {
+    'sp500': ('SP500', {
+        'sp500_ma20': ('mean', 20),
+        'sp500_ma50': ('mean', 50),
+        'sp500_ma200': ('mean', 200),
+        'sp500_vol20': ('vol', 20),
+    }),
+    'vixcls': ('VIXCLS', {'vix_ma20': ('mean', 20), 'vix_ma50': ('mean', 50)}),
+    'dtwexbgs': ('DTWEXBGS', {'dollar_index_ma20': ('mean', 20), 'dollar_index_ma50': ('mean', 50)}),
+    'dexuseu': ('DEXUSEU', {'eurusd_ma20': ('mean', 20), 'eurusd_ma50': ('mean', 50)}),
+    'unrate': ('UNRATE', {'unrate_ma3': ('mean', 3), 'unrate_ma12': ('mean', 12)}),
+    'psavert': ('PSAVERT', {'saving_rate_ma3': ('mean', 3), 'saving_rate_ma12': ('mean', 12)}),
+}
+
+# Trading days per year, to annualize daily return volatility
+TRADING_DAYS = 252
+
+class RollingWindow:
+    """
+    Mean and standard deviation over the last `window` observations, updated in
+    O(1) per observation: a deque of the values in the window plus Welford's
+    running mean and sum of squared deviations of the non-missing ones. Like
+    pandas' rolling(), the result is NaN until min_periods values are present.
+    """
+    def __init__(self, window, min_periods=None, values=(), count=0, mean=0.0, m2=0.0):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.values = deque(values, maxlen=window)
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def _add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    def _remove(self, x):
+        self.count -= 1
+        if self.count == 0:
+            self.mean, self.m2 = 0.0, 0.0
+            return
+        delta = x - self.mean
+        self.mean -= delta / self.count
+        self.m2 = max(self.m2 - delta * (x - self.mean), 0.0)
+
+    def push(self, x):
+        """Add one observation (NaN for missing) and return (mean, std)."""
+        if len(self.values) == self.window:
+            dropped = self.values[0]
+            if not math.isnan(dropped):
+                self._remove(dropped)
+        self.values.append(x)
+        if not math.isnan(x):
+            self._add(x)
+
+        if self.count < self.min_periods:
+            return np.nan, np.nan
+        std = math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+        return self.mean, std
+
+    def to_dict(self):
+        return {'window': self.window, 'min_periods': self.min_periods, 'values': list(self.values),
+                'count': self.count, 'mean': self.mean, 'm2': self.m2}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(**state)
+
+class RollingColumn:
+    """One output column: a RollingWindow over the input ('mean') or its returns ('vol')."""
+    def __init__(self, kind, window, min_periods=None, rolling=None, previous=np.nan):
+        self.kind = kind
+        self.rolling = rolling or RollingWindow(window, min_periods)
+        self.previous = previous
+
+    def push(self, x):
+        if self.kind == 'mean':
+            return self.rolling.push(x)[0]
+        daily_return = x / self.previous - 1 if not math.isnan(x) else np.nan
+        if not math.isnan(x):
+            self.previous = x
+        return self.rolling.push(daily_return)[1] * math.sqrt(TRADING_DAYS)
+
+    def to_dict(self):
+        return {'kind': self.kind, 'rolling': self.rolling.to_dict(), 'previous': self.previous}
+
+    @classmethod
+    def from_dict(cls, state):
+        rolling = RollingWindow.from_dict(state['rolling'])
+        return cls(state['kind'], rolling.window, rolling=rolling, previous=state['previous'])
+
+def ensure_state_table(conn):
+    conn.execute(text("""
+    CREATE TABLE IF NOT EXISTS rolling_state (
+        table_name TEXT NOT NULL,
+        column_name TEXT NOT NULL,
+        last_date TIMESTAMP,
+        state TEXT,
+        PRIMARY KEY (table_name, column_name)
+    )
+    """))
+
+def load_state(table):
+    """Persisted RollingColumns of table and the date they were last updated to."""
+    with engine.connect() as conn:
+        ensure_state_table(conn)
+        rows = conn.execute(
+            text("SELECT column_name, last_date, state FROM rolling_state WHERE table_name = :table"),
+            dict(table=table)
+        ).fetchall()
+    if not rows:
+        return {}, None
+    states = {column: RollingColumn.from_dict(json.loads(state)) for column, _, state in rows}
+    return states, pd.Timestamp(rows[0][1])
+
+def save_state(table, states, last_date):
+    last_date = pd.Timestamp(last_date).strftime('%Y-%m-%d %H:%M:%S.%f')
+    with engine.connect() as conn:
+        ensure_state_table(conn)
+        conn.execute(text("DELETE FROM rolling_state WHERE table_name = :table"), dict(table=table))
+        conn.execute(
+            text("""
+            INSERT INTO rolling_state (table_name, column_name, last_date, state)
+            VALUES (:table, :column, :last_date, :state)
+            """),
+            [dict(table=table, column=column, last_date=last_date, state=json.dumps(state.to_dict()))
+             for column, state in states.items()]
+        )
+        conn.commit()
+
+def stored_columns(table, columns, last_date, rows):
+    """
+    Previously written output columns of table, as one array per column, if the
+    table still holds exactly the `rows` rows up to last_date; else None. Only
+    the two aggregates are compared, and the values are read without their dates.
+    """
+    params = dict(last_date=last_date.strftime('%Y-%m-%d %H:%M:%S.%f'))
+    try:
+        with engine.connect() as conn:
+            count, stored_last = conn.execute(
+                text(f"SELECT COUNT(*), MAX(date) FROM {table} WHERE date <= :last_date"), params
+            ).fetchone()
+            if count != rows or stored_last is None or pd.Timestamp(stored_last) != last_date:
+                return None
+            stored = conn.execute(
+                text(f"SELECT {', '.join(columns)} FROM {table} WHERE date <= :last_date ORDER BY date"), params
+            ).fetchall()
+    except Exception:
+        return None
+    stored = np.array(stored, dtype='float64').reshape(len(stored), len(columns))
+    return {column: stored[:, i] for i, column in enumerate(columns)}
+
+def last_valid_before(values, position):
+    """Last non-missing value in values[:position], scanning back from position; NaN if none."""
+    for x in values[position - 1::-1] if position > 0 else []:
+        if not math.isnan(x):
+            return x
+    return np.nan
+
+def resume_point(values, states, last_date):
+    """
+    Position in values right after last_date if the persisted windows still match
+    the observations they were built from, else None. Only the last window of
+    observations before that position is compared. A revision inside a window
+    (or a changed window size) means the columns are rebuilt from the start.
+    """
+    if last_date is None or last_date not in values.index:
+        return None
+    position = values.index.get_loc(last_date) + 1
+    array = values.to_numpy()
+    for state in states.values():
+        window = list(state.rolling.values)
+        start = max(position - len(window), 0)
+        observed = array[start:position]
+        if state.kind == 'vol':
+            # Returns over the window, each against the last observation before it
+            previous = last_valid_before(array, start)
+            returns = []
+            for x in observed:
+                returns.append(x / previous - 1 if not math.isnan(x) else np.nan)
+                if not math.isnan(x):
+                    previous = x
+            observed = np.array(returns)
+            if not math.isnan(previous) and not np.isclose(previous, state.previous):
+                return None
+        if len(observed) != len(window) or not np.allclose(observed, window, equal_nan=True):
+            return None
+    return position
+
+def apply_rolling(table, df, column=None, outputs=None, min_periods=None):
+    """
+    Fill the rolling output columns of df (indexed by date) and persist the window
+    state. Rows up to the last update are taken from the stored table, so each run
+    only pushes the observations added since, in O(1) per row and column, after
+    checking the last window before them; the first run, or one after a revision
+    inside a window, replays the full history.
+    """
+    if column is None:
+        column, outputs = ROLLING_SPECS[table]
+    values = df[column].astype('float64')
+    states, last_date = load_state(table)
+
+    position = None
+    if set(states) == set(outputs) and all(
+            (states[name].kind, states[name].rolling.window, states[name].rolling.min_periods)
+            == (kind, window, window if min_periods is None else min_periods)
+            for name, (kind, window) in outputs.items()):
+        position = resume_point(values, states, last_date)
+    stored = stored_columns(table, list(outputs), last_date, position) if position is not None else None
+
+    if stored is None:
+        position = 0
+        states = {name: RollingColumn(kind, window, min_periods) for name, (kind, window) in outputs.items()}
+        stored = {name: np.array([]) for name in outputs}
+
+    new_values = values.iloc[position:].tolist()
+    for name, state in states.items():
+        df[name] = np.concatenate([stored[name], np.array([state.push(x) for x in new_values], dtype='float64')])
+    if len(values):
+        save_state(table, states, values.index[-1])
+    print(f"Rolling columns of {table}: {len(new_values)} of {len(values)} rows updated")
+    return df
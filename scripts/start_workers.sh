@@ -0,0 +1,27 @@
+#!/bin/bash
+# Start DASHBOARD_WORKERS Streamlit processes on local ports and put nginx in
+# front of them on port 8501, with sticky sessions per client address. nginx
+# also serves the chart snapshots, so this runs even for a single worker.
+cd /app
+
+WORKERS=${DASHBOARD_WORKERS:-1}
+BASE_PORT=${DASHBOARD_WORKER_BASE_PORT:-8601}
+
+# Several workers build each figure once and share it through this directory
+if [ "$WORKERS" -gt 1 ]; then
+    export DASHBOARD_FIGURE_CACHE_DIR=${DASHBOARD_FIGURE_CACHE_DIR:-/tmp/dashboard_figures}
+fi
+
+UPSTREAMS=""
+for i in $(seq 0 $((WORKERS - 1))); do
+    PORT=$((BASE_PORT + i))
+    echo "$(date): Starting Streamlit worker on port $PORT..." >> /var/log/cron.log
+    streamlit run app.py --server.port=$PORT --server.address=127.0.0.1 --server.headless=true \
+        >> /var/log/streamlit_$PORT.log 2>&1 &
+    UPSTREAMS="$UPSTREAMS    server 127.0.0.1:$PORT;\n"
+done
+
+sed "s|{{UPSTREAMS}}|$UPSTREAMS|" scripts/nginx.conf.template > /etc/nginx/conf.d/dashboard.conf
+
+echo "$(date): Starting nginx with $WORKERS workers..." >> /var/log/cron.log
+exec nginx -g 'daemon off;'
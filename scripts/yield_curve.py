@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+# Treasury yield columns and their maturity in years
+MATURITIES = {
+    'DGS1': 1,
+    'DGS5': 5,
+    'DGS10': 10,
+}
+
+# Maturities of the interpolated curve, in years
+CURVE_GRID = np.arange(1, 11)
+
+def aligned_yields(series):
+    '''
+    Treasury yields on the days all maturities were quoted, one column per
+    maturity ordered by maturity. series maps a column in MATURITIES to a Series.
+    '''
+    yields = pd.concat([series[column] for column in MATURITIES], axis=1, join='inner')
+    yields.columns = list(MATURITIES)
+    return yields.dropna()
+
+def curve_metrics(yields):
+    '''
+    Spreads, slope and curvature of each day's curve, computed over the whole
+    history at once:
+    - spread_10y1y, spread_10y5y: long minus short yield
+    - slope: least-squares slope of yield against maturity, per year of maturity
+    - curvature: 2 * 5Y - 1Y - 10Y (butterfly); positive when the belly sits above the wings
+    '''
+    values = yields.to_numpy()
+    maturities = np.array(list(MATURITIES.values()), dtype=float)
+    centered = maturities - maturities.mean()
+    slope = (values - values.mean(axis=1, keepdims=True)) @ centered / (centered @ centered)
+
+    return pd.DataFrame({
+        'spread_10y1y': yields['DGS10'] - yields['DGS1'],
+        'spread_10y5y': yields['DGS10'] - yields['DGS5'],
+        'slope': slope,
+        'curvature': 2 * yields['DGS5'] - yields['DGS1'] - yields['DGS10'],
+    }, index=yields.index)
+
+def interpolation_weights(maturities, grid):
+    '''Matrix W with curve = yields @ W.T: linear interpolation between the quoted maturities'''
+    weights = np.zeros((len(grid), len(maturities)))
+    for row, target in enumerate(grid):
+        upper = min(np.searchsorted(maturities, target), len(maturities) - 1)
+        lower = max(upper - 1, 0)
+        if maturities[upper] == target or upper == lower:
+            weights[row, upper] = 1.0
+            continue
+        share = (target - maturities[lower]) / (maturities[upper] - maturities[lower])
+        weights[row, lower] = 1 - share
+        weights[row, upper] = share
+    return weights
+
+def interpolated_curves(yields, grid=CURVE_GRID):
+    '''Each day's curve on the maturity grid, one column per maturity (y1 ... y10)'''
+    maturities = np.array(list(MATURITIES.values()), dtype=float)
+    weights = interpolation_weights(maturities, grid)
+    curves = yields.to_numpy() @ weights.T
+    return pd.DataFrame(curves, index=yields.index, columns=[f'y{m:g}' for m in grid])
+
+def inversion_episodes(spread):
+    '''
+    Runs of consecutive quoted days with a negative spread, with their first and
+    last day, length in calendar and trading days, and the deepest spread.
+    '''
+    inverted = (spread < 0).to_numpy()
+    # +1 where an episode starts, -1 on the day after it ends
+    edges = np.diff(np.concatenate([[0], inverted.astype(int), [0]]))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1) - 1
+
+    dates = spread.index
+    # Minimum of each episode: non-inverted days can never be the minimum
+    masked = np.where(inverted, spread.to_numpy(), np.inf)
+    min_spread = np.minimum.reduceat(masked, starts) if len(starts) else np.array([])
+    episodes = pd.DataFrame({
+        'end': dates[ends],
+        'calendar_days': (dates[ends] - dates[starts]).days + 1,
+        'trading_days': ends - starts + 1,
+        'min_spread': min_spread,
+    }, index=dates[starts])
+    episodes.index.name = 'date'
+    return episodes
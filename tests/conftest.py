@@ -0,0 +1,41 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# econdata and derived_metrics read these at import, so they are set before any test imports them
+TEST_DIR = tempfile.mkdtemp(prefix='dashboard_tests_')
+os.environ['DASHBOARD_DB_PATH'] = os.path.join(TEST_DIR, 'economics_data.db')
+os.environ['DASHBOARD_PROFILE_LOG'] = os.path.join(TEST_DIR, 'profile_log.jsonl')
+os.environ.pop('DASHBOARD_FIGURE_CACHE_DIR', None)
+# Tests write with the ingestion scripts in the same process that reads. The adbc
+# driver bundles its own SQLite, and two SQLite copies in one process break each
+# other's WAL locks, so reads go through Python's sqlite3 here.
+os.environ['DASHBOARD_SQL_BACKEND'] = 'pandas'
+sys.path[:0] = [os.path.join(ROOT_DIR, 'scripts'), ROOT_DIR]
+
+@pytest.fixture(scope='session')
+def synthetic_db():
+    """A small database with every table the pages read, built as load_test.py does."""
+    from load_test import build_synthetic_db
+
+    build_synthetic_db(years=3, btc_days=2)
+    return os.environ['DASHBOARD_DB_PATH']
+
+@pytest.fixture
+def caches(monkeypatch):
+    """
+    One frame cache and one figure cache for the test, as a server process has;
+    outside `streamlit run` the cache_resource functions build a new one per call.
+    """
+    import econdata
+    import utils
+
+    frames = econdata.FrameCache(utils.CACHE_BUDGET_MB * 1024 * 1024, utils.CACHE_TTL)
+    figures = utils.FigureCache(utils.FIGURE_CACHE_SIZE)
+    monkeypatch.setattr(econdata.cache, '_cache_provider', lambda: frames)
+    monkeypatch.setattr(utils, 'get_figure_cache', lambda: figures)
+    return frames, figures
@@ -0,0 +1,51 @@
+import pandas as pd
+
+from alerts import AlertRule
+
+DATES = pd.date_range('2024-01-01', periods=100, freq='D')
+
+def fired(rule, observations):
+    """Indices of the observations on which rule fires."""
+    return [i for i, values in enumerate(observations) if rule.push(DATES[i], values) is not None]
+
+def test_threshold_fires_once_until_back_past_the_band():
+    rule = AlertRule(dict(kind='threshold', column='x', direction='above', level=30, band=5, message='{value}'))
+    # Dips to 27 stay inside the band; only falling below 25 re-arms the rule
+    values = [20, 31, 27, 32, 29, 24, 26, 33, 35]
+
+    assert fired(rule, [(v,) for v in values]) == [1, 7]
+
+def test_first_observation_never_fires():
+    rule = AlertRule(dict(kind='threshold', column='x', direction='above', level=30, band=5, message='{value}'))
+    assert fired(rule, [(40,), (41,)]) == []
+
+def test_crossover_band_is_a_fraction_of_the_reference():
+    rule = AlertRule(dict(kind='crossover', column='x', reference='ma', direction='below', band=0.02,
+                          message='{value}'))
+    # 101 is 1% above the average, inside the band; 103 is 3% above and re-arms
+    observations = [(105, 100), (99, 100), (101, 100), (98, 100), (103, 100), (97, 100)]
+
+    assert fired(rule, observations) == [1, 5]
+
+def test_sign_change_fires_both_ways_with_its_direction():
+    rule = AlertRule(dict(kind='sign_change', column='x', band=0.001, message='{direction}'))
+    values = [0.01, -0.002, 0.0005, -0.0005, 0.003, -0.004]
+    messages = [rule.push(DATES[i], (v,)) for i, v in enumerate(values)]
+
+    assert messages == [None, 'negative', None, None, 'positive', 'negative']
+
+def test_rise_compares_with_the_low_of_the_previous_window():
+    rule = AlertRule(dict(kind='rise', column='x', window=3, rise=0.5, message='{change:.1f}'))
+    values = [4.0, 3.8, 3.9, 4.1, 4.4, 4.5, 4.6, 4.0, 3.9, 3.8, 4.5]
+
+    assert fired(rule, [(v,) for v in values]) == [4, 10]
+
+def test_state_round_trip_keeps_the_hysteresis():
+    spec = dict(kind='threshold', column='x', direction='above', level=30, band=5, message='{value}')
+    rule = AlertRule(spec)
+    fired(rule, [(20,), (31,)])
+
+    resumed = AlertRule.from_dict(rule.to_dict(), rule.last_date)
+
+    assert resumed.push(DATES[2], (27,)) is None
+    assert resumed.push(DATES[3], (32,)) is None
@@ -0,0 +1,18 @@
+import pytest
+
+def test_equity_curve_follows_new_data_version(synthetic_db, caches, monkeypatch):
+    from sqlalchemy import text
+    from derived_metrics import engine, bump_data_versions
+    from pages import backtest as backtest_page
+
+    frames, _ = caches
+    monkeypatch.setattr(backtest_page, 'get_frame_cache', lambda: frames)
+    before = backtest_page.equity_curve('Buy and hold')
+
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE sp500 SET SP500 = 2 * SP500 WHERE date = (SELECT MAX(date) FROM sp500)"))
+    bump_data_versions(['sp500'])
+
+    after = backtest_page.equity_curve('Buy and hold')
+    assert after['equity'].iloc[-1] == pytest.approx(2 * before['equity'].iloc[-1])
+    assert after['equity'].iloc[:-1].equals(before['equity'].iloc[:-1])
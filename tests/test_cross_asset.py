@@ -0,0 +1,20 @@
+import numpy as np
+
+def test_full_correlation_is_computed_once_for_every_window(synthetic_db, caches, monkeypatch):
+    from pages import cross_asset
+
+    frames, _ = caches
+    monkeypatch.setattr(cross_asset, 'get_frame_cache', lambda: frames)
+    calls = []
+    comoments = cross_asset.comoments
+    monkeypatch.setattr(cross_asset, 'comoments', lambda values, *args, **kwargs: calls.append(args) or comoments(values, *args, **kwargs))
+
+    for window in cross_asset.WINDOWS:
+        cross_asset.cross_asset_stats(window)
+        full = cross_asset.full_correlation()
+
+    assert calls.count(()) == 1
+    assert len(calls) == 1 + len(cross_asset.WINDOWS)
+    returns = cross_asset.daily_returns(cross_asset.get_data_version(*cross_asset.SOURCES))
+    expected = returns.corr(min_periods=cross_asset.MIN_OBSERVATIONS).to_numpy()
+    assert np.allclose(full.to_numpy(), expected, equal_nan=True)
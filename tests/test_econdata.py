@@ -0,0 +1,66 @@
+import econdata
+import econdata.series
+
+VIX_QUERY = "SELECT date, VIXCLS FROM vixcls ORDER BY date"
+FORECAST_QUERY = "SELECT date, forecast FROM forecasts WHERE series = ? ORDER BY date"
+
+def count_reads(monkeypatch):
+    reads = []
+    read_frame = econdata.series.read_frame
+    monkeypatch.setattr(econdata.series, 'read_frame', lambda *args: reads.append(args) or read_frame(*args))
+    return reads
+
+def test_repeated_query_is_read_once(synthetic_db, caches, monkeypatch):
+    frames, _ = caches
+    reads = count_reads(monkeypatch)
+
+    first = econdata.load(VIX_QUERY)
+    second = econdata.load(VIX_QUERY)
+
+    assert len(reads) == 1
+    assert list(frames.entries) == [(VIX_QUERY, (), econdata.SQL_BACKEND)]
+    assert first.equals(second)
+
+def test_params_are_part_of_the_key(synthetic_db, caches, monkeypatch):
+    frames, _ = caches
+    reads = count_reads(monkeypatch)
+
+    sp500 = econdata.load(FORECAST_QUERY, params=('sp500',))
+    vix = econdata.load(FORECAST_QUERY, params=['vix'])
+    econdata.load(FORECAST_QUERY, params=('vix',))
+
+    assert len(reads) == 2
+    assert {key[1] for key in frames.entries} == {('sp500',), ('vix',)}
+    assert not sp500.equals(vix)
+
+def test_sources_reload_on_a_new_data_version(synthetic_db, caches, monkeypatch):
+    from derived_metrics import bump_data_versions
+
+    frames, _ = caches
+    reads = count_reads(monkeypatch)
+
+    econdata.load(VIX_QUERY, sources=['vixcls'])
+    econdata.load(VIX_QUERY, sources=['vixcls'])
+    bump_data_versions(['vixcls'])
+    econdata.load(VIX_QUERY, sources=['vixcls'])
+
+    assert len(reads) == 2
+    versions = [key[3] for key in frames.entries]
+    assert len(set(versions)) == 2
+    assert versions[-1] == econdata.data_version('vixcls')
+
+def test_callers_cannot_change_the_cached_frame(synthetic_db, caches):
+    frame = econdata.load(VIX_QUERY)
+    frame['VIXCLS'] = 0.0
+    frame.iloc[0, 0] = -1.0
+
+    assert (econdata.load(VIX_QUERY)['VIXCLS'] != 0.0).any()
+
+def test_lazy_table_is_not_read_until_used(synthetic_db, caches, monkeypatch):
+    reads = count_reads(monkeypatch)
+
+    vix = econdata.table('vixcls', ['VIXCLS'])
+    assert reads == []
+
+    assert len(vix) == len(vix['VIXCLS'])
+    assert len(reads) == 1
@@ -0,0 +1,45 @@
+import os
+
+from utils import FigureCache
+
+def spec(name):
+    return f'[{{"name": "{name}"}}]', {'title': name}
+
+def test_least_recently_used_entry_is_evicted():
+    cache = FigureCache(2)
+    cache.put(('a', None), 1, spec('a'))
+    cache.put(('b', None), 1, spec('b'))
+    assert cache.get(('a', None), 1) == spec('a')
+
+    cache.put(('c', None), 1, spec('c'))
+
+    assert cache.get(('b', None), 1) is None
+    assert cache.get(('a', None), 1) == spec('a')
+    assert cache.get(('c', None), 1) == spec('c')
+
+def test_new_version_drops_every_range_of_that_chart():
+    cache = FigureCache(10)
+    cache.put(('a', '1Y'), 1, spec('a 1Y'))
+    cache.put(('a', '5Y'), 1, spec('a 5Y'))
+    cache.put(('b', None), 1, spec('b'))
+
+    cache.put(('a', '1Y'), 2, spec('a 1Y v2'))
+
+    assert cache.get(('a', '1Y'), 1) is None
+    assert cache.get(('a', '5Y'), 1) is None
+    assert cache.get(('a', '1Y'), 2) == spec('a 1Y v2')
+    assert cache.get(('b', None), 1) == spec('b')
+    assert len(cache.entries) == 2
+
+def test_workers_share_specs_through_the_disk_directory(tmp_path):
+    first, second = FigureCache(4, str(tmp_path)), FigureCache(4, str(tmp_path))
+    first.put(('a', None), 1, spec('a'))
+
+    assert second.get(('a', None), 1) == spec('a')
+    assert second.get(('a', None), 2) is None
+
+    second.put(('a', None), 2, spec('a v2'))
+
+    # Files of the older version are removed, so the directory does not grow
+    assert len(os.listdir(tmp_path)) == 2
+    assert first.get(('a', None), 2) == spec('a v2')
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+import forecasts
+
+def test_holt_variance_matches_closed_form(monkeypatch):
+    alpha, beta = 0.4, 0.2
+    monkeypatch.setattr(forecasts, 'HOLT_ALPHAS', np.array([alpha]))
+    monkeypatch.setattr(forecasts, 'HOLT_BETAS', np.array([beta]))
+    rng = np.random.default_rng(1)
+    values = 100 + np.cumsum(rng.normal(0.1, 1, 200))
+
+    _, stderr = forecasts.holt_forecast(values, 12)
+
+    # Var(h) = sigma2 * (1 + sum_{j<h} (alpha + j * alpha * beta)^2), sigma2 being the one-step variance
+    sigma2 = stderr[0] ** 2
+    expected = [sigma2 * (1 + sum((alpha + j * alpha * beta) ** 2 for j in range(1, h))) for h in range(1, 13)]
+    assert stderr ** 2 == pytest.approx(expected)
+
+def test_holt_forecast_extends_a_line():
+    values = 3 + 0.5 * np.arange(50, dtype='float64')
+
+    forecast, stderr = forecasts.holt_forecast(values, 5)
+
+    assert forecast == pytest.approx(3 + 0.5 * np.arange(50, 55))
+    assert stderr == pytest.approx(0, abs=1e-9)
+
+def test_ar_forecast_reverts_to_the_mean():
+    rng = np.random.default_rng(2)
+    values = [0.0]
+    for _ in range(2000):
+        values.append(5 + 0.5 * (values[-1] - 5) + rng.normal(0, 1))
+    values = np.array(values[100:])
+
+    forecast, stderr = forecasts.ar_forecast(values, 50, 1)
+
+    assert forecast[-1] == pytest.approx(5, abs=0.2)
+    # AR(1) with phi = 0.5: Var(h) = sigma2 * (1 - phi^(2h)) / (1 - phi^2)
+    assert stderr[-1] ** 2 == pytest.approx(stderr[0] ** 2 / (1 - 0.25), rel=0.05)
+    assert np.all(np.diff(stderr) >= 0)
+
+def test_trend_forecast_interval_widens_away_from_the_window():
+    rng = np.random.default_rng(3)
+    values = 10 + 0.2 * np.arange(80) + rng.normal(0, 0.5, 80)
+
+    forecast, stderr = forecasts.trend_forecast(values, 8)
+
+    slope, intercept = np.polyfit(np.arange(80), values, 1)
+    assert forecast == pytest.approx(intercept + slope * np.arange(80, 88))
+    assert np.all(np.diff(stderr) > 0)
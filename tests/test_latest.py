@@ -0,0 +1,16 @@
+import math
+
+import pandas as pd
+
+def test_missing_series_and_metrics_read_as_nan(synthetic_db):
+    from utils import get_latest, format_date
+
+    latest = get_latest('sp500', 'no_such_series')
+
+    assert latest['sp500']['SP500'] > 0
+    assert isinstance(latest['sp500']['date'], pd.Timestamp)
+    assert math.isnan(latest['sp500']['no_such_metric'])
+    assert math.isnan(latest['no_such_series']['SP500'])
+    assert latest['no_such_series'].get('SP500') is None
+    assert format_date(latest['no_such_series']['date'], '%B %d, %Y') == 'n/a'
+    assert format_date(pd.Timestamp('2024-03-01'), '%B %d, %Y') == 'March 01, 2024'
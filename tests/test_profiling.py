@@ -0,0 +1,32 @@
+import json
+
+import profiling
+
+def read_log():
+    try:
+        with open(profiling.PROFILE_LOG) as f:
+            return [json.loads(line) for line in f]
+    except FileNotFoundError:
+        return []
+
+def test_startup_timings_are_not_logged_when_profiling_is_off(monkeypatch):
+    monkeypatch.setattr(profiling, 'PROFILE_PANEL', False)
+    monkeypatch.setattr(profiling, '_first_chart_recorded', False)
+    before = read_log()
+
+    profiling.record_startup('import pages.test', 0.5)
+    profiling.record_first_chart()
+
+    assert read_log() == before
+
+def test_startup_timings_are_logged_when_profiling_is_on(monkeypatch):
+    monkeypatch.setattr(profiling, 'PROFILE_PANEL', True)
+    monkeypatch.setattr(profiling, '_first_chart_recorded', False)
+    before = read_log()
+
+    profiling.record_startup('import pages.test', 0.5)
+    profiling.record_first_chart()
+    profiling.record_first_chart()
+
+    events = [record['event'] for record in read_log()[len(before):]]
+    assert events == ['import pages.test', 'time_to_first_chart']
@@ -0,0 +1,25 @@
+def chart_values(figures, chart_id, version, trace=0):
+    """y values of one trace of the figure render_chart cached for chart_id."""
+    from utils import themed_figure_json, decode_typed_arrays
+
+    spec = figures.get((chart_id, None), version)
+    assert spec is not None
+    return decode_typed_arrays(themed_figure_json(spec, 'dark'))['data'][trace]['y']
+
+def test_render_chart_rebuilds_from_new_rows(synthetic_db, caches):
+    _, figures = caches
+    from sqlalchemy import text
+    from derived_metrics import engine, bump_data_versions
+    from utils import render_chart, get_data_version
+    from pages import stock_market
+
+    build, sources = stock_market.CHARTS['vix']
+    render_chart('test.vix', build, sources)
+    assert 999.0 not in chart_values(figures, 'test.vix', get_data_version(*sources))
+
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE derived_vix SET VIXCLS = 999.0 WHERE date = (SELECT MAX(date) FROM derived_vix)"))
+    bump_data_versions(['derived_vix'])
+
+    render_chart('test.vix', build, sources)
+    assert chart_values(figures, 'test.vix', get_data_version(*sources))[-1] == 999.0
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from resampling import period_ends, resample_series, align, comoments
+
+def test_weekend_observations_count_towards_monday():
+    index = pd.to_datetime(['2024-01-05 16:00', '2024-01-06 12:00', '2024-01-07 12:00', '2024-01-08 09:00'])
+    series = pd.Series([1.0, 2.0, 3.0, 4.0], index=index, name='btc')
+    ends = period_ends(index[0], index[-1], 'B')
+
+    assert list(ends.normalize()) == list(pd.to_datetime(['2024-01-05', '2024-01-08']))
+    assert resample_series(series, ends, 'last').tolist() == [1.0, 4.0]
+    assert resample_series(series, ends, 'sum').tolist() == [1.0, 9.0]
+    assert resample_series(series, ends, 'mean').tolist() == [1.0, 3.0]
+
+def test_ffill_carries_the_last_observation_over_empty_periods():
+    series = pd.Series([1.0, np.nan, 3.0], index=pd.to_datetime(['2024-01-15', '2024-03-10', '2024-04-20']))
+    ends = period_ends(pd.Timestamp('2023-12-01'), pd.Timestamp('2024-04-30'), 'M')
+
+    result = resample_series(series, ends, 'ffill')
+
+    assert result.index.strftime('%Y-%m').tolist() == ['2023-12', '2024-01', '2024-02', '2024-03', '2024-04']
+    assert np.allclose(result, [np.nan, 1.0, 1.0, 1.0, 3.0], equal_nan=True)
+
+def test_unknown_aggregation_is_rejected():
+    series = pd.Series([1.0], index=pd.to_datetime(['2024-01-01']))
+    with pytest.raises(ValueError):
+        resample_series(series, period_ends(series.index[0], series.index[0], 'M'), 'median')
+
+def test_align_puts_daily_and_monthly_series_on_one_frequency(synthetic_db, caches, monkeypatch):
+    import resampling
+
+    frames, _ = caches
+    monkeypatch.setattr(resampling, 'get_frame_cache', lambda: frames)
+
+    panel = align(['sp500', 'fedfunds'], 'M')
+
+    sp500 = resampling.load_series('sp500').dropna()
+    expected = sp500.groupby(sp500.index.to_period('M')).last()
+    assert np.allclose(panel['sp500'].dropna().to_numpy(), expected.to_numpy())
+    fedfunds = resampling.load_series('fedfunds').dropna()
+    assert panel['fedfunds'].loc[fedfunds.index[-1]:].eq(fedfunds.iloc[-1]).all()
+    assert panel.equals(align(['sp500', 'fedfunds'], 'M'))
+    with pytest.raises(ValueError):
+        align(['sp500'], 'D')
+
+def returns_panel(length=300, seed=0):
+    rng = np.random.default_rng(seed)
+    common = rng.normal(0, 1, length)
+    values = np.column_stack([common + rng.normal(0, 1, length), 0.5 * common + rng.normal(0, 1, length),
+                              rng.normal(0, 1, length)])
+    values[rng.random(values.shape) < 0.1] = np.nan
+    return values
+
+def test_full_sample_comoments_match_pairwise_statistics():
+    values = returns_panel()
+    corr, beta = comoments(values, min_periods=20)
+
+    frame = pd.DataFrame(values)
+    assert np.allclose(corr, frame.corr(min_periods=20).to_numpy())
+    assert np.allclose(np.diagonal(beta), 1)
+    for i, j in [(0, 1), (1, 0), (0, 2)]:
+        both = frame[[i, j]].dropna()
+        assert beta[i, j] == pytest.approx(both[i].cov(both[j]) / both[j].var())
+
+def test_rolling_comoments_match_pandas_rolling_corr():
+    values = returns_panel()
+    corr, beta = comoments(values, 30, min_periods=15)
+
+    frame = pd.DataFrame(values)
+    expected = frame[0].rolling(30, min_periods=15).corr(frame[1])
+    assert np.allclose(corr[:, 0, 1], expected, equal_nan=True)
+    assert np.allclose(corr[:, 1, 0], expected, equal_nan=True)
+    # Window ending at the last row, from the jointly observed pairs only
+    last = frame.iloc[-30:][[0, 1]].dropna()
+    assert beta[-1, 0, 1] == pytest.approx(last[0].cov(last[1]) / last[1].var())
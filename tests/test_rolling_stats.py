@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from rolling_stats import RollingWindow, apply_rolling, TRADING_DAYS
+
+OUTPUTS = {'x_ma5': ('mean', 5), 'x_ma20': ('mean', 20), 'x_vol10': ('vol', 10)}
+
+def random_series(length, seed=0, missing=0.1):
+    rng = np.random.default_rng(seed)
+    values = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, length)))
+    values[rng.random(length) < missing] = np.nan
+    return pd.Series(values, index=pd.bdate_range('2020-01-01', periods=length), name='x')
+
+def expected_columns(values):
+    returns = values / values.ffill().shift(1) - 1
+    return {
+        'x_ma5': values.rolling(5).mean(),
+        'x_ma20': values.rolling(20).mean(),
+        'x_vol10': returns.rolling(10).std() * np.sqrt(TRADING_DAYS),
+    }
+
+@pytest.mark.parametrize('min_periods', [None, 1, 3])
+def test_rolling_window_matches_pandas(min_periods):
+    values = random_series(500, missing=0.2)
+    window = RollingWindow(10, min_periods)
+    means, stds = zip(*(window.push(x) for x in values))
+
+    rolling = values.rolling(10, min_periods=10 if min_periods is None else min_periods)
+    assert np.allclose(means, rolling.mean(), equal_nan=True)
+    # pandas gives a std of NaN for a single value, as RollingWindow does
+    assert np.allclose(stds, rolling.std(), equal_nan=True)
+
+def test_rolling_window_resumes_from_its_state():
+    values = random_series(300).tolist()
+    window = RollingWindow(20)
+    for x in values[:200]:
+        window.push(x)
+    resumed = RollingWindow.from_dict(window.to_dict())
+
+    assert [resumed.push(x) for x in values[200:]] == [window.push(x) for x in values[200:]]
+
+def write_table(df):
+    from derived_metrics import engine
+
+    df.index.name = 'date'
+    df.to_sql('test_rolling', engine, if_exists='replace', index=True)
+
+def test_apply_rolling_pushes_only_new_rows(synthetic_db, capsys):
+    values = random_series(400, seed=1)
+
+    write_table(apply_rolling('test_rolling', values.iloc[:300].to_frame(), 'x', OUTPUTS))
+    capsys.readouterr()
+    df = apply_rolling('test_rolling', values.to_frame(), 'x', OUTPUTS)
+
+    assert '100 of 400 rows updated' in capsys.readouterr().out
+    for name, expected in expected_columns(values).items():
+        assert np.allclose(df[name], expected, equal_nan=True)
+
+def test_apply_rolling_replays_after_a_revision_inside_a_window(synthetic_db, capsys):
+    values = random_series(400, seed=2)
+    write_table(apply_rolling('test_rolling', values.iloc[:300].to_frame(), 'x', OUTPUTS))
+
+    values.iloc[295] = 150.0
+    capsys.readouterr()
+    df = apply_rolling('test_rolling', values.to_frame(), 'x', OUTPUTS)
+
+    assert '400 of 400 rows updated' in capsys.readouterr().out
+    for name, expected in expected_columns(values).items():
+        assert np.allclose(df[name], expected, equal_nan=True)
@@ -1,68 +1,210 @@
-import sqlite3
 import pandas as pd
 import streamlit as st
-import plotly.graph_objects as go
+import streamlit.components.v1 as components
+import profiling
 from datetime import datetime, timedelta
 import os
+import threading
+import json
+import base64
+import hashlib
+import numpy as np
+from collections import OrderedDict
+
+try:
+    from streamlit.proto.PlotlyChart_pb2 import PlotlyChart as PlotlyChartProto
+except ImportError:  # Proto module moved or renamed; st.plotly_chart is used instead
+    PlotlyChartProto = None
+
+import econdata
+from econdata import DB_PATH, SQL_BACKENDS, SQL_BACKEND, adbc_sqlite
+from econdata.cache import CACHE_BUDGET_MB, CACHE_TTL
 
 def get_database_connection():
-    db_path = 'data/economics_data.db'
-    if not os.path.exists(db_path):
-        st.error(f"Database file not found at {db_path}")
-        raise FileNotFoundError(f"Database file not found at {db_path}")
-    return sqlite3.connect(db_path)
-
-@st.cache_data(ttl=24*3600)  # Cache for 24 hours
-def load_data(query):
     try:
-        conn = get_database_connection()
-        df = pd.read_sql_query(query, conn)
-        conn.close()
-        
-        if 'date' not in df.columns:
-            st.error(f"date column not found in query result. Available columns: {df.columns.tolist()}")
-            raise KeyError("date column not found in query result")
-            
-        df['date'] = pd.to_datetime(df['date'])
-        df.set_index('date', inplace=True)
-        return df
+        return econdata.connect()
+    except FileNotFoundError as e:
+        st.error(str(e))
+        raise e
+
+@st.cache_resource
+def get_frame_cache():
+    return econdata.FrameCache(CACHE_BUDGET_MB * 1024 * 1024, CACHE_TTL)
+
+# Share one frame cache per server process between all sessions and econdata loads
+econdata.set_cache(get_frame_cache)
+
+def read_data(query, backend=None, params=None):
+    return econdata.read_frame(query, backend, params)
+
+def load_data(query, backend=None, sources=None, params=None):
+    """
+    Load a query result through the shared frame cache (see econdata.load),
+    showing the error in the page if it fails. Pass the tables read as sources
+    to reload whenever their data version moves; chart builders must, or
+    render_chart caches a figure for the new version built from the old frame.
+    params are bound to the query's ? placeholders.
+    """
+    try:
+        return econdata.load(query, backend, sources, params)
     except Exception as e:
         st.error(f"Error loading data: {str(e)}")
         raise e
 
-def load_btc_data():
+class LatestValues(dict):
+    """Latest values of one series; a metric missing from the snapshot reads as NaN, its date as NaT."""
+    def __missing__(self, key):
+        return pd.NaT if key == 'date' else float('nan')
+
+def format_date(date, fmt):
+    """date.strftime(fmt), or 'n/a' for a missing (NaT) date."""
+    return 'n/a' if pd.isna(date) else date.strftime(fmt)
+
+def get_latest(*series):
     """
-    Load BTC/USD minute data for the past 7 days (maximum available from yfinance).
-    Data is sampled to reduce points for better visualization while maintaining
-    price movement patterns.
+    Latest values for the given series from the latest_values snapshot table,
+    as {series: {'date': Timestamp, metric: value, ...}} where date is the most
+    recent date among the series' metrics. Series or metrics without a row
+    (e.g. before derived_metrics.py has run) read as NaN, with a NaT date.
     """
     try:
-        conn = get_database_connection()
-        # Get data from the last 7 days
-        seven_days_ago = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d %H:%M:%S')
-        query = f"""
-        SELECT Datetime, Open, High, Low, Close, Volume
-        FROM btc_minute
-        WHERE Datetime >= '{seven_days_ago}'
-        ORDER BY Datetime DESC
-        """
-        df = pd.read_sql_query(query, conn)
-        conn.close()
+        with profiling.stage('latest_values', series=', '.join(series)):
+            conn = get_database_connection()
+            placeholders = ', '.join('?' * len(series))
+            rows = conn.execute(
+                f"SELECT series, metric, date, value FROM latest_values WHERE series IN ({placeholders})",
+                series
+            ).fetchall()
+            conn.close()
         
+        latest = {name: LatestValues() for name in series}
+        for name, metric, date, value in rows:
+            date = pd.Timestamp(date)
+            latest[name][metric] = value
+            if 'date' not in latest[name] or date > latest[name]['date']:
+                latest[name]['date'] = date
+        return latest
+    except Exception as e:
+        st.error(f"Error loading latest values: {str(e)}")
+        raise e
+
+class BtcMinuteCache:
+    """
+    Process-wide window of BTC/USD minute bars shared by all sessions.
+    Each refresh only queries rows newer than the last cached timestamp,
+    appends them and drops rows that fell out of the window.
+    """
+    def __init__(self, window=timedelta(days=7)):
+        self.window = window
+        self.lock = threading.Lock()
+        self.df = None  # Ascending by Datetime
+
+    def refresh(self):
+        with self.lock:
+            window_start = datetime.now() - self.window
+            conn = get_database_connection()
+            if self.df is None or self.df.empty:
+                query = """
+                SELECT Datetime, Open, High, Low, Close, Volume
+                FROM btc_minute
+                WHERE Datetime >= ?
+                ORDER BY Datetime
+                """
+                params = (window_start.strftime('%Y-%m-%d %H:%M:%S'),)
+            else:
+                # Match the stored microsecond format so the last cached bar is not re-read
+                query = """
+                SELECT Datetime, Open, High, Low, Close, Volume
+                FROM btc_minute
+                WHERE Datetime > ?
+                ORDER BY Datetime
+                """
+                params = (self.df['Datetime'].iloc[-1].strftime('%Y-%m-%d %H:%M:%S.%f'),)
+            new_rows = pd.read_sql_query(query, conn, params=params)
+            conn.close()
+
+            if not new_rows.empty:
+                new_rows['Datetime'] = pd.to_datetime(new_rows['Datetime'])
+                if self.df is None or self.df.empty:
+                    df = new_rows
+                else:
+                    df = pd.concat([self.df, new_rows], ignore_index=True)
+                    df = df.drop_duplicates(subset='Datetime', keep='last')
+            else:
+                df = self.df if self.df is not None else new_rows
+
+            # Evict bars older than the window
+            if not df.empty and df['Datetime'].iloc[0] < window_start:
+                df = df[df['Datetime'] >= window_start].reset_index(drop=True)
+            self.df = df
+            return df
+
+@st.cache_resource
+def get_btc_cache():
+    return BtcMinuteCache()
+
+def load_btc_tail(rows=5):
+    """The most recent BTC/USD minute bars from the shared cache, newest first."""
+    try:
+        return get_btc_cache().refresh().tail(rows).iloc[::-1].reset_index(drop=True)
+    except Exception as e:
+        st.error(f"Error loading BTC data: {str(e)}")
+        raise e
+
+# Rows a range-selected chart aims for, whatever the visible window
+CHART_POINTS = int(os.environ.get('DASHBOARD_CHART_POINTS', 1000))
+
+# Candidate bar sizes, finest first; None keeps the data's own resolution
+BTC_BAR_SIZES = [None, '2min', '5min', '10min', '15min', '30min', '1h', '2h', '4h']
+DAILY_BAR_SIZES = [None, 'W', 'M']
+BTC_BAR_AGG = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+def downsample(df, bar_sizes, agg, points=CHART_POINTS):
+    """
+    Roll a date-indexed frame up to the finest bar size that keeps it within
+    `points` rows. Bars are aggregated with `agg` (a resample aggregation or a
+    per-column dict), so e.g. volume is summed rather than thinned out.
+    """
+    with profiling.stage('resample', rows_in=len(df)) as record:
+        for bar_size in bar_sizes:
+            if bar_size is None:
+                bars = df
+            else:
+                resampler = df.resample(bar_size)
+                bars = resampler.agg(agg)[resampler.size() > 0]
+            if len(bars) <= points:
+                break
+        record.update(rows=len(bars), bar_size=bar_size or 'raw')
+    bars.attrs['bar_size'] = bar_size or 'raw'
+    return bars
+
+def load_data_window(query, span=None, agg='last', sources=None):
+    """
+    load_data for the last `span` of a daily series (all of it if None),
+    rolled up to weekly or monthly bars when it has more than CHART_POINTS rows.
+    """
+    df = load_data(query, sources=sources)
+    if span is not None and not df.empty:
+        df = df[df.index >= df.index[-1] - span]
+    return downsample(df, DAILY_BAR_SIZES, agg)
+
+def load_btc_window(span):
+    """
+    BTC/USD bars covering the last `span` of the cached minute window, as raw
+    minutes when they fit in CHART_POINTS rows and as OHLCV rollups otherwise.
+    """
+    try:
+        with profiling.stage('btc_refresh') as record:
+            df = get_btc_cache().refresh()
+            record['rows'] = len(df)
+
         if df.empty:
             st.error("No BTC data available")
             raise ValueError("No BTC data available")
-            
-        df['Datetime'] = pd.to_datetime(df['Datetime'])
-        
-        # If we have more than 1000 points, sample the data to reduce points
-        # while maintaining the overall price movement pattern
-        if len(df) > 1000:
-            # Keep every Nth row to reduce to ~1000 points
-            n = len(df) // 1000
-            df = df.iloc[::n].copy()
-        
-        return df
+
+        df = df.set_index('Datetime')
+        df = df[df.index >= df.index[-1] - span]
+        return downsample(df, BTC_BAR_SIZES, BTC_BAR_AGG).reset_index()
     except Exception as e:
         st.error(f"Error loading BTC data: {str(e)}")
         raise e
@@ -82,34 +224,376 @@ def get_recent_logs():
     except:
         return ["Log file not accessible"]
 
-def get_chart_layout(title):
+# Chart colors per dashboard theme, matching the CSS themes in app.py
+CHART_THEMES = {
+    'dark': dict(
+        template='plotly_dark',
+        title_color='#00FFF0',
+        text_color='#ffffff',
+        legend_bgcolor='rgba(26,28,36,0.8)',
+        hover_bgcolor='#1a1c24',
+        grid_color='#2d3139'
+    ),
+    'light': dict(
+        template='plotly_white',
+        title_color='#00857c',
+        text_color='#0e1117',
+        legend_bgcolor='rgba(240,242,246,0.8)',
+        hover_bgcolor='#ffffff',
+        grid_color='#e6e9ef'
+    )
+}
+
+def get_chart_layout(title, theme='dark'):
+    colors = CHART_THEMES[theme]
     return dict(
-        template="plotly_dark",
+        template=colors['template'],
         paper_bgcolor='rgba(0,0,0,0)',
         plot_bgcolor='rgba(0,0,0,0)',
         title=dict(
             text=title,
-            font=dict(color='#00FFF0', size=20)
+            font=dict(color=colors['title_color'], size=20)
         ),
         showlegend=True,
         legend=dict(
-            font=dict(color='#ffffff'),
-            bgcolor='rgba(26,28,36,0.8)'
+            font=dict(color=colors['text_color']),
+            bgcolor=colors['legend_bgcolor']
         ),
         hovermode='x unified',
         hoverlabel=dict(
-            bgcolor='#1a1c24',
+            bgcolor=colors['hover_bgcolor'],
             font_size=14,
             font_family="monospace"
         ),
         xaxis=dict(
-            gridcolor='#2d3139',
+            gridcolor=colors['grid_color'],
             showgrid=True,
             gridwidth=1
         ),
         yaxis=dict(
-            gridcolor='#2d3139',
+            gridcolor=colors['grid_color'],
             showgrid=True,
             gridwidth=1
         )
     )
+
+# Line traces with at least this many points are drawn with WebGL
+WEBGL_POINT_THRESHOLD = int(os.environ.get('DASHBOARD_WEBGL_THRESHOLD', 1000))
+
+def compact_dates(dates):
+    """Dates as the shortest strings that keep their resolution, e.g. '2024-01-31'."""
+    dates = pd.DatetimeIndex(dates)
+    if (dates == dates.normalize()).all():
+        return dates.strftime('%Y-%m-%d')
+    if (dates.second == 0).all():
+        return dates.strftime('%Y-%m-%d %H:%M')
+    return dates.strftime('%Y-%m-%d %H:%M:%S')
+
+def line_trace(x, y, **kwargs):
+    """
+    Line trace for a date-indexed series: go.Scatter below WEBGL_POINT_THRESHOLD
+    points and go.Scattergl above it. Dates are sent as short strings, and
+    split_figure encodes the y values of WebGL traces as float32.
+    """
+    import plotly.graph_objects as go
+
+    trace = go.Scattergl if len(x) >= WEBGL_POINT_THRESHOLD else go.Scatter
+    return trace(x=compact_dates(x), y=y, **kwargs)
+
+def forecast_traces(series, name, color, hoverformat):
+    """
+    Dashed forecast line and shaded 80% interval of a series from the forecasts
+    table (written by scripts/forecasts.py), to extend a chart's line for it.
+    Empty if there are no forecasts yet.
+    """
+    import plotly.graph_objects as go
+
+    if get_data_version('forecasts')[0] is None:
+        return []
+    forecast_query = """
+    SELECT date, forecast, lower, upper
+    FROM forecasts
+    WHERE series = ?
+    ORDER BY date
+    """
+    forecast = load_data(forecast_query, sources=['forecasts'], params=(series,))
+    if forecast.empty:
+        return []
+
+    dates = compact_dates(forecast.index)
+    band = 'rgba({}, {}, {}, 0.15)'.format(*(int(color[i:i + 2], 16) for i in (1, 3, 5)))
+    return [
+        go.Scatter(x=dates, y=forecast['upper'], line=dict(width=0), showlegend=False, hoverinfo='skip'),
+        go.Scatter(x=dates, y=forecast['lower'], line=dict(width=0), showlegend=False, hoverinfo='skip',
+                   fill='tonexty', fillcolor=band),
+        go.Scatter(x=dates, y=forecast['forecast'], name=f'{name} forecast', showlegend=False,
+                   line=dict(color=color, width=2, dash='dash'),
+                   hovertemplate=f'Date: %{{x}}<br>{name} forecast: %{{y:{hoverformat}}}<extra></extra>'),
+    ]
+
+def typed_array(values):
+    """Plotly.js typed-array spec: little-endian float32 as base64, ~5.3 bytes per point."""
+    values = np.asarray(values, dtype='<f4')
+    return {'dtype': 'f4', 'bdata': base64.b64encode(values.tobytes()).decode('ascii')}
+
+def get_data_version(*tables):
+    """Version stamps of the given tables, bumped by the ingestion jobs (see econdata.data_version)."""
+    return econdata.data_version(*tables)
+
+@st.cache_resource
+def get_theme_layout(theme):
+    """
+    Layout properties that change with the theme. render_chart applies them over
+    cached figure specs, so switching themes only swaps the template and colors.
+    """
+    import plotly.io as pio
+
+    colors = CHART_THEMES[theme]
+    return dict(
+        template=pio.templates[colors['template']].to_plotly_json(),
+        title=dict(font=dict(color=colors['title_color'])),
+        legend=dict(font=dict(color=colors['text_color']), bgcolor=colors['legend_bgcolor']),
+        hoverlabel=dict(bgcolor=colors['hover_bgcolor']),
+        xaxis=dict(gridcolor=colors['grid_color']),
+        yaxis=dict(gridcolor=colors['grid_color'])
+    )
+
+def merge_layout(layout, overrides):
+    """Copy of layout with overrides applied recursively, leaving both inputs untouched."""
+    merged = dict(layout)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict) and key != 'template':
+            merged[key] = merge_layout(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+FIGURE_CACHE_SIZE = int(os.environ.get('DASHBOARD_FIGURE_CACHE_SIZE', 64))
+
+# Directory for serialized figures shared by all workers of a multi-worker
+# deployment; unset keeps the figure cache in process memory only
+FIGURE_CACHE_DIR = os.environ.get('DASHBOARD_FIGURE_CACHE_DIR')
+
+def short_hash(value):
+    return hashlib.sha1(repr(value).encode('utf-8')).hexdigest()[:16]
+
+class FigureCache:
+    """
+    Process-wide LRU of theme-neutral figure specs keyed by (chart id, date range).
+    Each entry remembers the data version it was built from; storing a figure
+    for a newer version drops every entry of that chart built from older data.
+    With disk_dir set, specs are also written there so other worker processes
+    can reuse them instead of building the same figure again.
+    """
+    def __init__(self, max_entries, disk_dir=None):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> (version, (data JSON, layout dict))
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get(self, key, version):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] == version:
+                self.entries.move_to_end(key)
+                return entry[1]
+        spec = self.read_disk(key, version)
+        if spec is not None:
+            self.remember(key, version, spec)
+        return spec
+
+    def put(self, key, version, spec):
+        self.remember(key, version, spec)
+        self.write_disk(key, version, spec)
+
+    def remember(self, key, version, spec):
+        chart_id = key[0]
+        with self.lock:
+            stale = [k for k, (v, _) in self.entries.items() if k[0] == chart_id and v != version]
+            for k in stale:
+                del self.entries[k]
+            self.entries[key] = (version, spec)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def disk_path(self, key, version):
+        # <chart>.<date range>.<version>, so older versions of a chart can be found by prefix
+        return os.path.join(self.disk_dir, f'{short_hash(key[0])}.{short_hash(key[1:])}.{short_hash(version)}')
+
+    def read_disk(self, key, version):
+        if not self.disk_dir:
+            return None
+        path = self.disk_path(key, version)
+        try:
+            # The layout file is written last, so its presence marks a complete entry
+            with open(path + '.layout.json') as f:
+                layout = json.load(f)
+            with open(path + '.data.json') as f:
+                return f.read(), layout
+        except (OSError, ValueError):
+            return None
+
+    def write_disk(self, key, version, spec):
+        if not self.disk_dir:
+            return
+        path = self.disk_path(key, version)
+        data_json, layout = spec
+        try:
+            for suffix, content in [('.data.json', data_json), ('.layout.json', json.dumps(layout))]:
+                tmp_path = f'{path}{suffix}.{os.getpid()}.tmp'
+                with open(tmp_path, 'w') as f:
+                    f.write(content)
+                os.replace(tmp_path, path + suffix)
+            # Drop this chart's entries built from older data
+            chart_prefix = os.path.basename(path).split('.')[0] + '.'
+            version_part = '.' + os.path.basename(path).split('.')[2] + '.'
+            for name in os.listdir(self.disk_dir):
+                if name.startswith(chart_prefix) and version_part not in name and not name.endswith('.tmp'):
+                    os.remove(os.path.join(self.disk_dir, name))
+        except OSError:
+            pass  # The shared copy is an optimization; the in-memory entry is enough
+
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache(FIGURE_CACHE_SIZE, FIGURE_CACHE_DIR)
+
+def split_figure(fig, typed_arrays=True):
+    """
+    Serialize a figure's traces once and keep its layout as a dict, so the
+    theme can be applied without touching the (large) data part again.
+    With typed_arrays the y values of WebGL traces are sent as float32 typed
+    arrays, which needs plotly.js >= 2.28 on the client.
+    """
+    from plotly.io.json import to_json_plotly
+
+    fig_dict = fig.to_plotly_json()
+    if typed_arrays:
+        for trace in fig_dict['data']:
+            if trace['type'] == 'scattergl' and trace.get('y') is not None:
+                trace['y'] = typed_array(trace['y'])
+    layout = json.loads(to_json_plotly(fig_dict['layout']))
+    return to_json_plotly(fig_dict['data']), layout
+
+def themed_figure_json(spec, theme):
+    """Figure JSON for a (data JSON, layout) spec from split_figure, styled for theme."""
+    data_json, layout = spec
+    layout_json = json.dumps(merge_layout(layout, get_theme_layout(theme)))
+    return f'{{"data": {data_json}, "layout": {layout_json}}}'
+
+# Streamlit releases whose PlotlyChart proto fields and element ids
+# plotly_chart_json fills in by hand; other releases use st.plotly_chart
+PROTO_CHART_VERSIONS = ('1.37',)
+
+def decode_typed_arrays(fig_json):
+    """Figure dict from figure JSON with typed arrays (see typed_array) turned back into lists."""
+    fig_dict = json.loads(fig_json)
+    for trace in fig_dict['data']:
+        values = trace.get('y')
+        if isinstance(values, dict) and 'bdata' in values:
+            trace['y'] = np.frombuffer(base64.b64decode(values['bdata']), dtype='<' + values['dtype']).tolist()
+    return fig_dict
+
+def plotly_chart_json(fig_json, element_id):
+    """
+    Equivalent of st.plotly_chart(fig, use_container_width=True) for a figure that
+    is already serialized, so a cached chart is sent without Plotly validating and
+    re-encoding it. This writes Streamlit's chart message directly, which is only
+    done on the releases in PROTO_CHART_VERSIONS; on any other release the figure
+    goes through the public st.plotly_chart.
+    """
+    streamlit_version = '.'.join(st.__version__.split('.')[:2])
+    if PlotlyChartProto is None or streamlit_version not in PROTO_CHART_VERSIONS:
+        st.plotly_chart(decode_typed_arrays(fig_json), use_container_width=True)
+        return
+
+    proto = PlotlyChartProto()
+    proto.use_container_width = True
+    proto.spec = fig_json
+    proto.config = json.dumps({'showLink': False, 'linkText': False})
+    proto.theme = 'streamlit'
+    proto.id = element_id
+    # Same call st.plotly_chart ends with
+    st._main._enqueue('plotly_chart', proto)
+
+def render_chart(chart_id, build, sources, date_range=None):
+    """
+    Show the figure returned by build(), or build(date_range) for range-selected
+    charts, reusing its serialized traces while the chart id, date range and
+    data version of the source tables are unchanged.
+    On a hit no data is loaded and no figure is built; the current theme is
+    applied to the cached layout.
+    """
+    theme = st.session_state.get('theme', 'dark')
+    with profiling.chart(chart_id):
+        with profiling.stage('data_version'):
+            version = get_data_version(*sources)
+        key = (chart_id, date_range)
+        cache = get_figure_cache()
+        spec = cache.get(key, version)
+        hit = spec is not None
+        if not hit:
+            with profiling.stage('build'):
+                fig = build() if date_range is None else build(date_range)
+            with profiling.stage('serialize') as record:
+                spec = split_figure(fig)
+                record['bytes'] = len(spec[0])
+            cache.put(key, version, spec)
+        with profiling.stage('send', cache='hit' if hit else 'miss') as record:
+            fig_json = themed_figure_json(spec, theme)
+            element_id = f'plotly_chart-{chart_id}-{date_range}-{theme}'
+            plotly_chart_json(fig_json, element_id)
+            record['bytes'] = len(fig_json)
+    profiling.record_first_chart()
+
+# Plotly chart that appends new points in the browser (see render_live_chart)
+live_chart_component = components.declare_component(
+    'live_chart', path=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'components', 'live_chart')
+)
+
+def render_live_chart(chart_id, build, points, date_range):
+    """
+    Live counterpart of render_chart for charts that only grow at the end.
+    points(date_range) returns the traces' data, one column per trace indexed
+    by the x values as drawn. The browser keeps the figure from build(date_range);
+    later reruns send only the points from the last one sent onwards, which
+    the live_chart component appends with Plotly.extendTraces. The full figure
+    is sent again when the range, theme or bar size changes, or when the
+    component asks for it (e.g. after it was remounted).
+    """
+    theme = st.session_state.get('theme', 'dark')
+    state = st.session_state.setdefault(f'{chart_id}.live', {'seq': 0})
+    with profiling.chart(chart_id):
+        with profiling.stage('points') as record:
+            data = points(date_range)
+            record['rows'] = len(data)
+        base = f"{date_range}:{theme}:{data.attrs.get('bar_size')}"
+        # Set by the component when it has no figure to extend
+        request = st.session_state.get(chart_id)
+
+        if state.get('base') != base or request != state.get('request'):
+            with profiling.stage('build'):
+                fig = build(date_range)
+            with profiling.stage('serialize'):
+                # Plain arrays, so the browser can splice and extend them
+                fig_json = themed_figure_json(split_figure(fig, typed_arrays=False), theme)
+            state.update(seq=state['seq'] + 1, base=base, request=request)
+            args = dict(figure=fig_json)
+        else:
+            tail = data[data.index >= state['last_x']]
+            args = {}
+            if not tail.equals(state['tail']):
+                state['seq'] += 1
+                args = dict(
+                    start=state['last_x'],
+                    traces=[dict(x=list(tail.index), y=tail[column].tolist()) for column in tail.columns],
+                    max_points=len(data)
+                )
+        state.update(last_x=data.index[-1], tail=data.iloc[-1:])
+
+        with profiling.stage('send') as record:
+            live_chart_component(base=base, seq=state['seq'], key=chart_id, default=None, **args)
+            record['bytes'] = len(json.dumps(args))
+    profiling.record_first_chart()